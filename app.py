@@ -1,1399 +1,2303 @@
-from flask import Flask, render_template, request, jsonify, session, send_file, flash, redirect, url_for, make_response
-import json
-import os
-import secrets
-import string
-import time
-from datetime import datetime, timedelta
-from werkzeug.utils import secure_filename
-import io
-import zipfile
-from utils import parse_txt_to_vcf, split_txt_file, parse_vcf_to_txt, analyze_vcf_file, parse_admin_navy_to_vcf, parse_admin_navy_to_vcf_with_start, merge_vcf_files
-
-app = Flask(__name__)
-app.secret_key = 'your-secret-key-here-change-this'  # Ganti dengan secret key yang aman
-
-# Storage untuk file temporary (in-memory)
-temp_file_storage = {}
-
-# Storage untuk active sessions (in-memory) - 1 API key = 1 user
-active_sessions = {}
-
-# Template helper functions
-@app.template_global()
-def moment():
-    return datetime.now()
-
-@app.context_processor
-def inject_user_info():
-    """Inject user information (including API key expiry) to all templates"""
-    if 'api_key_valid' in session and session['api_key_valid']:
-        api_key = session.get('api_key')
-        if api_key:
-            api_keys = load_api_keys()
-            if api_key in api_keys:
-                expiry_date_str = api_keys[api_key]['expiry_date']
-                expiry_date = datetime.fromisoformat(expiry_date_str)
-                
-                # Format tanggal lebih compact
-                expiry_formatted = expiry_date.strftime('%d/%m/%y %H:%M')
-                
-                # Hitung sisa hari
-                remaining_days = (expiry_date - datetime.now()).days
-                
-                return {
-                    'api_key_expiry': expiry_formatted,
-                    'api_key_remaining_days': remaining_days
-                }
-    
-    return {}
-
-# Konfigurasi
-UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'txt', 'vcf'}
-API_KEYS_FILE = os.path.join(os.path.dirname(__file__), 'api_keys.json')  # Fix path to website directory
-ADMIN_PASSWORD = 'admin123'  # Ganti dengan password yang aman
-
-# Pastikan folder upload ada
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
-def load_api_keys():
-    """Load API keys dari file JSON"""
-    if os.path.exists(API_KEYS_FILE):
-        try:
-            with open(API_KEYS_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
-
-def save_api_keys(api_keys):
-    """Simpan API keys ke file JSON"""
-    with open(API_KEYS_FILE, 'w') as f:
-        json.dump(api_keys, f, indent=4, default=str)
-
-def generate_api_key():
-    """Generate API key 12 karakter dengan huruf besar semua"""
-    chars = string.ascii_uppercase + string.digits  # Hanya huruf besar dan angka
-    return ''.join(secrets.choice(chars) for _ in range(12))
-
-def check_api_key(api_key):
-    """Cek apakah API key valid dan belum expired"""
-    print(f"DEBUG: Checking API key: {api_key}")
-    api_keys = load_api_keys()
-    print(f"DEBUG: Loaded API keys: {api_keys}")
-    
-    # Case-insensitive lookup
-    api_key_lower = api_key.lower()
-    found_key = None
-    
-    for key in api_keys:
-        if key.lower() == api_key_lower:
-            found_key = key
-            break
-    
-    if not found_key:
-        print(f"DEBUG: API key {api_key} not found in keys")
-        return False, "API key tidak valid", None
-    
-    key_data = api_keys[found_key]
-    expiry_date = datetime.fromisoformat(key_data['expiry_date'])
-    current_time = datetime.now()
-    
-    print(f"DEBUG: Current time: {current_time}")
-    print(f"DEBUG: Expiry time: {expiry_date}")
-    
-    if current_time > expiry_date:
-        print(f"DEBUG: API key expired")
-        return False, "API key sudah expired", None
-    
-    print(f"DEBUG: API key valid")
-    return True, "API key valid", found_key
-
-def create_session_id():
-    """Generate unique session ID"""
-    return secrets.token_urlsafe(32)
-
-def register_session(api_key, session_id, user_info=None):
-    """Register new session and force logout previous session"""
-    current_time = datetime.now()
-    
-    # Jika API key sudah ada session aktif, tandai sebagai invalid
-    if api_key in active_sessions:
-        old_session = active_sessions[api_key]
-        print(f"DEBUG: Force logout previous session {old_session['session_id']} for API key {api_key}")
-    
-    # Register session baru
-    active_sessions[api_key] = {
-        'session_id': session_id,
-        'login_time': current_time,
-        'last_activity': current_time,
-        'user_info': user_info or {},
-        'is_active': True
-    }
-    
-    print(f"DEBUG: Registered new session {session_id} for API key {api_key}")
-    return True
-
-def is_session_valid(api_key, session_id):
-    """Check if session is still valid (not replaced by newer session) AND API key still exists in database"""
-    # PERTAMA: Cek apakah API key masih ada dan valid di database
-    api_valid, api_message, actual_api_key = check_api_key(api_key)
-    if not api_valid:
-        # API key sudah dihapus atau expired, invalidate session
-        if api_key in active_sessions:
-            del active_sessions[api_key]
-        return False, f"API key tidak valid: {api_message}"
-    
-    # KEDUA: Cek session di memori
-    if api_key not in active_sessions:
-        return False, "Session tidak ditemukan"
-    
-    session_data = active_sessions[api_key]
-    
-    if not session_data.get('is_active', False):
-        return False, "Session sudah dinonaktifkan"
-    
-    if session_data['session_id'] != session_id:
-        return False, "Session digantikan oleh login baru"
-    
-    # Update last activity
-    session_data['last_activity'] = datetime.now()
-    
-    return True, "Session valid"
-
-def invalidate_session(api_key):
-    """Invalidate session for API key"""
-    if api_key in active_sessions:
-        active_sessions[api_key]['is_active'] = False
-        print(f"DEBUG: Invalidated session for API key {api_key}")
-
-def require_valid_session(return_json=False):
-    """Check if current session is valid, redirect if not"""
-    # Basic session check
-    if 'api_key_valid' not in session or not session['api_key_valid']:
-        if return_json:
-            return jsonify({'error': 'Silakan masukkan API key terlebih dahulu'}), 401
-        flash('Silakan masukkan API key terlebih dahulu.', 'error')
-        return redirect(url_for('index'))
-    
-    # Advanced session tracking check
-    api_key = session.get('api_key')
-    session_id = session.get('session_id')
-    
-    if not api_key or not session_id:
-        if return_json:
-            return jsonify({'error': 'Session tidak valid. Silakan login ulang'}), 401
-        flash('Session tidak valid. Silakan login ulang.', 'error')
-        session.clear()
-        return redirect(url_for('index'))
-    
-    # Check if session masih aktif
-    is_valid, message = is_session_valid(api_key, session_id)
-    
-    if not is_valid:
-        if return_json:
-            return jsonify({'error': f'Session berakhir: {message}. Silakan login ulang'}), 401
-        flash(f'Session berakhir: {message}. Silakan login ulang.', 'error')
-        session.clear()
-        return redirect(url_for('index'))
-    
-    return None  # Session valid
-
-@app.route('/')
-def index():
-    """Halaman utama untuk input API key"""
-    if 'api_key_valid' in session and session['api_key_valid']:
-        return redirect(url_for('dashboard'))
-    return render_template('index.html')
-
-@app.route('/verify_api', methods=['POST'])
-def verify_api():
-    """Verifikasi API key dengan session tracking"""
-    api_key = request.form.get('api_key', '').strip()
-    
-    if not api_key:
-        flash('Masukkan API key!', 'error')
-        return redirect(url_for('index'))
-    
-    is_valid, message, actual_api_key = check_api_key(api_key)
-    
-    if is_valid:
-        # Generate unique session ID
-        session_id = create_session_id()
-        
-        # Get user info (IP address, user agent)
-        user_info = {
-            'ip_address': request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR')),
-            'user_agent': request.environ.get('HTTP_USER_AGENT', ''),
-            'login_time': datetime.now().isoformat()
-        }
-        
-        # Register session (akan force logout session lama)
-        register_session(actual_api_key, session_id, user_info)
-        
-        # Set session data - GUNAKAN ACTUAL API KEY YANG BENAR
-        session['api_key'] = actual_api_key
-        session['session_id'] = session_id
-        session['api_key_valid'] = True
-        
-        print(f"DEBUG: New session created - API: {actual_api_key}, Session: {session_id}")
-        flash('API key valid! Selamat datang.', 'success')
-        return redirect(url_for('dashboard'))
-    else:
-        flash(f'Error: {message}', 'error')
-        return redirect(url_for('index'))
-
-@app.route('/dashboard')
-def dashboard():
-    """Dashboard utama dengan pilihan fitur"""
-    print(f"DEBUG: Dashboard accessed. Session: {dict(session)}")
-    
-    # Check session validity with tracking
-    redirect_response = require_valid_session()
-    if redirect_response:
-        return redirect_response
-    
-    print(f"DEBUG: Session valid, showing dashboard")
-    return render_template('dashboard.html')
-
-@app.route('/txt-to-vcf')
-def txt_to_vcf():
-    """Halaman converter TXT to VCF"""
-    print("DEBUG: Accessing /txt-to-vcf route")
-    
-    # Check session validity with tracking
-    redirect_response = require_valid_session()
-    if redirect_response:
-        return redirect_response
-    
-    print("DEBUG: Rendering txt_to_vcf.html template")
-    return render_template('txt_to_vcf.html')
-
-@app.route('/convert_single', methods=['POST'])
-def convert_single():
-    """Proses single convert - 1 file TXT dibagi menjadi beberapa file VCF"""
-    print(f"DEBUG: convert_single called")
-    print(f"DEBUG: request.files keys: {list(request.files.keys())}")
-    print(f"DEBUG: request.form keys: {list(request.form.keys())}")
-    print(f"DEBUG: session api_key_valid: {session.get('api_key_valid', 'NOT_SET')}")
-    
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        print(f"DEBUG: Session validation failed")
-        return error_response
-    
-    if 'txt_file' not in request.files:
-        print(f"DEBUG: txt_file not in request.files")
-        return jsonify({'error': 'File tidak ditemukan'}), 400
-    
-    file = request.files['txt_file']
-    if file.filename == '':
-        print(f"DEBUG: file.filename is empty")
-        return jsonify({'error': 'File tidak dipilih'}), 400
-    
-    if file and allowed_file(file.filename):
-        try:
-            # Baca isi file
-            content = file.read().decode('utf-8')
-            
-            # Ambil parameter
-            contacts_per_file = int(request.form.get('contacts_per_file', 1000))
-            name_prefix = request.form.get('contact_name_prefix', '').strip()
-            output_prefix = request.form.get('output_prefix', '').strip()
-            file_start_number = int(request.form.get('file_start_number', 1))
-            
-            # Validasi contacts per file
-            if contacts_per_file < 1 or contacts_per_file > 10000:
-                return jsonify({'error': 'Jumlah kontak per file harus antara 1-10000'}), 400
-            
-            # Parse kontak
-            all_contacts = parse_txt_to_vcf(content, name_prefix)
-            
-            if not all_contacts:
-                return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file'}), 400
-            
-            # Bagi kontak ke beberapa file berdasarkan contacts_per_file
-            total_contacts = len(all_contacts)
-            file_count = (total_contacts + contacts_per_file - 1) // contacts_per_file  # Ceiling division
-            split_vcf_files = []
-            
-            print(f"DEBUG: total_contacts={total_contacts}, contacts_per_file={contacts_per_file}, file_count={file_count}")
-            print(f"DEBUG: name_prefix='{name_prefix}', output_prefix='{output_prefix}', file_start_number={file_start_number}")
-            
-            for i in range(file_count):
-                start_idx = i * contacts_per_file
-                if i == file_count - 1:  # File terakhir dapat berisi sisa kontak
-                    end_idx = len(all_contacts)
-                else:
-                    end_idx = start_idx + contacts_per_file
-                
-                file_contacts = all_contacts[start_idx:end_idx]
-                if file_contacts:  # Hanya tambahkan jika ada kontak
-                    vcf_content = '\n'.join(file_contacts)
-                    split_vcf_files.append(vcf_content)
-            
-            # Jika total kontak <= kontak per file, return sebagai .vcf langsung
-            print(f"DEBUG: Checking condition - total_contacts ({total_contacts}) <= contacts_per_file ({contacts_per_file})")
-            if total_contacts <= contacts_per_file:
-                print("DEBUG: Single file condition - returning VCF directly")
-                vcf_content = '\n'.join(all_contacts)
-                filename = secure_filename(file.filename)
-                base_name = filename.rsplit('.', 1)[0]
-                
-                if output_prefix:
-                    vcf_filename = f"{output_prefix} {file_start_number}.vcf"
-                else:
-                    vcf_filename = f"{base_name} {file_start_number}.vcf"
-                
-                response = make_response(vcf_content)
-                response.headers['Content-Type'] = 'text/vcard'
-                response.headers['Content-Disposition'] = f'attachment; filename="{vcf_filename}"'
-                return response
-            
-            # Jika perlu dibagi ke multiple files, return JSON dengan file info
-            print(f"DEBUG: Multiple files condition - returning {len(split_vcf_files)} files info")
-            
-            filename = secure_filename(file.filename)
-            base_name = filename.rsplit('.', 1)[0]
-            
-            files_info = []
-            for i, vcf_content in enumerate(split_vcf_files):
-                file_number = file_start_number + i
-                if output_prefix:
-                    vcf_filename = f"{output_prefix} {file_number}.vcf"
-                else:
-                    vcf_filename = f"{base_name} {file_number}.vcf"
-                
-                # Store file content in temp storage
-                file_id = f"single_{int(time.time())}_{i}"
-                temp_file_storage[file_id] = {
-                    'content': vcf_content,
-                    'filename': vcf_filename,
-                    'mimetype': 'text/vcard'
-                }
-                
-                files_info.append({
-                    'file_id': file_id,
-                    'filename': vcf_filename,
-                    'size': len(vcf_content.encode('utf-8'))
-                })
-            
-            return jsonify({
-                'success': True,
-                'multiple_files': True,
-                'total_files': len(files_info),
-                'total_contacts': total_contacts,  # TAMBAH TOTAL CONTACTS ASLI
-                'files': files_info
-            })
-            
-        except Exception as e:
-            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
-    
-    return jsonify({'error': 'Format file tidak didukung. Gunakan file .txt'}), 400
-
-@app.route('/download_file/<file_id>')
-def download_file(file_id):
-    """Download individual file by ID"""
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        return error_response
-    
-    if file_id not in temp_file_storage:
-        return jsonify({'error': 'File tidak ditemukan'}), 404
-    
-    file_data = temp_file_storage[file_id]
-    
-    response = make_response(file_data['content'])
-    response.headers['Content-Type'] = file_data['mimetype']
-    response.headers['Content-Disposition'] = f'attachment; filename="{file_data["filename"]}"'
-    
-    # Clean up temp storage after download
-    del temp_file_storage[file_id]
-    
-    return response
-
-@app.route('/download')
-def download():
-    """Download file from temporary storage"""
-    # Check session validity
-    error_response = require_valid_session(return_json=False)
-    if error_response:
-        return error_response
-    
-    if 'download_file_id' not in session:
-        flash('File download tidak tersedia. Silakan proses ulang.', 'error')
-        return redirect(url_for('dashboard'))
-    
-    file_id = session['download_file_id']
-    
-    if file_id not in temp_file_storage:
-        flash('File sudah tidak tersedia. Silakan proses ulang.', 'error')
-        return redirect(url_for('dashboard'))
-    
-    # Get data from temp storage
-    file_data = temp_file_storage[file_id]
-    
-    # Create response
-    response = make_response(file_data['content'])
-    response.headers['Content-Type'] = f"{file_data['mimetype']}; charset=utf-8"
-    response.headers['Content-Disposition'] = f'attachment; filename="{file_data["filename"]}"'
-    
-    # Clear session and temp storage after download
-    session.pop('download_file_id', None)
-    del temp_file_storage[file_id]
-    
-    return response
-
-@app.route('/convert_multi', methods=['POST'])
-def convert_multi():
-    """Proses multi convert - beberapa file TXT masing-masing jadi 1 file VCF"""
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        return error_response
-    
-    files = request.files.getlist('txt_files')
-    if not files or len(files) == 0:
-        return jsonify({'error': 'Tidak ada file yang ditemukan'}), 400
-    
-    try:
-        # Ambil parameter
-        name_prefix = request.form.get('contact_name_prefix', '').strip()
-        filename_option = request.form.get('filename_option', 'original')
-        output_prefix = request.form.get('output_prefix', '').strip()
-        start_number = int(request.form.get('start_number', 1))
-        
-        print(f"DEBUG MULTI: files_count={len(files)}, name_prefix='{name_prefix}', filename_option='{filename_option}', output_prefix='{output_prefix}', start_number={start_number}")
-        
-        # Process files and store in temp storage
-        files_info = []
-        processed_files = 0
-        
-        for i, file in enumerate(files):
-            if file.filename == '' or not allowed_file(file.filename):
-                continue
-            
-            # Baca isi file
-            content = file.read().decode('utf-8')
-            
-            # Parse ke VCF
-            vcf_contacts = parse_txt_to_vcf(content, name_prefix)
-            
-            if vcf_contacts:
-                vcf_content = '\n'.join(vcf_contacts)
-                
-                # Tentukan nama file output
-                if filename_option == 'custom' and output_prefix:
-                    file_number = start_number + i
-                    # Tambahkan spasi antara prefix dan angka
-                    vcf_filename = f"{output_prefix} {file_number}.vcf"
-                else:
-                    original_name = secure_filename(file.filename)
-                    base_name = original_name.rsplit('.', 1)[0]
-                    vcf_filename = f"{base_name}.vcf"
-                
-                # Store file content in temp storage
-                file_id = f"multi_{int(time.time())}_{i}"
-                temp_file_storage[file_id] = {
-                    'content': vcf_content,
-                    'filename': vcf_filename,
-                    'mimetype': 'text/vcard'
-                }
-                
-                files_info.append({
-                    'file_id': file_id,
-                    'filename': vcf_filename,
-                    'size': len(vcf_content.encode('utf-8')),
-                    'contacts': len(vcf_contacts)
-                })
-                
-                processed_files += 1
-        
-        if processed_files == 0:
-            return jsonify({'error': 'Tidak ada file yang berhasil diproses'}), 400
-        
-        return jsonify({
-            'success': True,
-            'multiple_files': True,
-            'total_files': len(files_info),
-            'files': files_info
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
-
-@app.route('/convert', methods=['POST'])
-def convert():
-    """Proses konversi TXT to VCF - ROUTE LAMA"""
-    print("DEBUG: User menggunakan route /convert LAMA!")
-    
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        return error_response
-    
-    if 'file' not in request.files:
-        return jsonify({'error': 'File tidak ditemukan'}), 400
-    
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': 'File tidak dipilih'}), 400
-    
-    if file and allowed_file(file.filename):
-        try:
-            # Baca isi file
-            content = file.read().decode('utf-8')
-            
-            # Ambil parameter tambahan
-            name_prefix = request.form.get('name_prefix', '').strip()
-            output_filename = request.form.get('output_filename', '').strip()
-            
-            # Parse ke VCF dengan prefix nama jika ada
-            vcf_contacts = parse_txt_to_vcf(content, name_prefix)
-            
-            if not vcf_contacts:
-                return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file'}), 400
-            
-            # Buat file VCF
-            vcf_content = '\n'.join(vcf_contacts)
-            
-            # Buat file untuk download
-            output = io.StringIO()
-            output.write(vcf_content)
-            output.seek(0)
-            
-            # Convert ke bytes
-            vcf_bytes = io.BytesIO()
-            vcf_bytes.write(vcf_content.encode('utf-8'))
-            vcf_bytes.seek(0)
-            
-            # Tentukan nama file output
-            if output_filename:
-                if not output_filename.lower().endswith('.vcf'):
-                    output_filename += '.vcf'
-                vcf_filename = secure_filename(output_filename)
-            else:
-                filename = secure_filename(file.filename)
-                vcf_filename = f"{filename.rsplit('.', 1)[0]}_contacts.vcf"
-            
-            return send_file(
-                vcf_bytes,
-                as_attachment=True,
-                download_name=vcf_filename,
-                mimetype='text/vcard'
-            )
-            
-        except Exception as e:
-            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
-    
-    return jsonify({'error': 'Format file tidak didukung. Gunakan file .txt'}), 400
-
-@app.route('/split-txt')
-def split_txt():
-    """Halaman split TXT file"""
-    # Check session validity with tracking
-    redirect_response = require_valid_session()
-    if redirect_response:
-        return redirect_response
-    
-    return render_template('split_txt.html')
-
-@app.route('/split_txt', methods=['POST'])
-def split_txt_route():
-    """Split TXT file - individual downloads with simple naming"""
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        return error_response
-    
-    if 'file' not in request.files:
-        return jsonify({'error': 'File tidak ditemukan'}), 400
-    
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': 'File tidak dipilih'}), 400
-    
-    if file and allowed_file(file.filename):
-        try:
-            # Baca isi file
-            content = file.read().decode('utf-8', errors='ignore')
-            
-            # Ambil parameter tambahan
-            split_count = int(request.form.get('split_count', 2))
-            output_prefix = request.form.get('output_prefix', '').strip()
-            
-            # Validasi split count
-            if split_count < 2 or split_count > 100:
-                return jsonify({'error': 'Jumlah split harus antara 2-100'}), 400
-            
-            # Jika tidak ada prefix, gunakan nama file tanpa ekstensi
-            if not output_prefix:
-                base_name = secure_filename(file.filename).rsplit('.', 1)[0]
-                output_prefix = base_name
-            
-            # Split file dengan split count
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-            
-            if not lines:
-                return jsonify({'error': 'File kosong atau tidak ada baris yang valid'}), 400
-            
-            # Hitung baris per file
-            lines_per_file = max(1, len(lines) // split_count)
-            split_files = []
-            
-            for i in range(split_count):
-                start_idx = i * lines_per_file
-                if i == split_count - 1:  # File terakhir dapat berisi sisa baris
-                    end_idx = len(lines)
-                else:
-                    end_idx = start_idx + lines_per_file
-                
-                chunk_lines = lines[start_idx:end_idx]
-                if chunk_lines:  # Hanya tambahkan jika ada konten
-                    split_files.append('\n'.join(chunk_lines))
-            
-            if not split_files:
-                return jsonify({'error': 'Tidak ada data untuk di-split'}), 400
-            
-            # Store files in temp storage untuk download individual
-            file_ids = []
-            timestamp = int(time.time())
-            
-            for i, chunk_content in enumerate(split_files, 1):
-                # Format nama sederhana: "kintil 1.txt", "kintil 2.txt", dll
-                chunk_filename = f"{output_prefix} {i}.txt"
-                file_id = f"split_{timestamp}_{i}"
-                
-                temp_file_storage[file_id] = {
-                    'content': chunk_content,
-                    'filename': chunk_filename,
-                    'mimetype': 'text/plain',
-                    'timestamp': time.time()
-                }
-                
-                file_ids.append({
-                    'id': file_id,
-                    'filename': chunk_filename,
-                    'size': len(chunk_content.encode('utf-8')),
-                    'lines': len(chunk_content.split('\n'))
-                })
-            
-            # Calculate statistics
-            original_lines = len(lines)
-            total_size = len(content.encode('utf-8'))
-            
-            return jsonify({
-                'success': True,
-                'message': f'File berhasil di-split menjadi {len(split_files)} bagian',
-                'original_filename': file.filename,
-                'original_lines': original_lines,
-                'total_size': total_size,
-                'split_count': len(split_files),
-                'prefix_name': output_prefix,
-                'files': file_ids
-            })
-            
-        except Exception as e:
-            print(f"Error in split_txt_route: {e}")
-            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
-    
-    return jsonify({'error': 'Format file tidak didukung. Gunakan file .txt'}), 400
-
-@app.route('/split', methods=['POST'])
-def split():
-    """Proses split TXT file"""
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        return error_response
-    
-    if 'file' not in request.files:
-        return jsonify({'error': 'File tidak ditemukan'}), 400
-    
-    file = request.files['file']
-    chunk_size = request.form.get('chunk_size', '1000')
-    
-    try:
-        chunk_size = int(chunk_size)
-        if chunk_size <= 0:
-            return jsonify({'error': 'Ukuran chunk harus lebih dari 0'}), 400
-    except ValueError:
-        return jsonify({'error': 'Ukuran chunk harus berupa angka'}), 400
-    
-    if file.filename == '':
-        return jsonify({'error': 'File tidak dipilih'}), 400
-    
-    if file and allowed_file(file.filename):
-        try:
-            # Baca isi file
-            content = file.read().decode('utf-8')
-            
-            # Split file menggunakan fungsi dari utils.py
-            split_files = split_txt_file(content, chunk_size)
-            
-            if not split_files:
-                return jsonify({'error': 'File kosong atau tidak bisa di-split'}), 400
-            
-            # Buat ZIP file
-            zip_buffer = io.BytesIO()
-            
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                filename = secure_filename(file.filename)
-                base_name = filename.rsplit('.', 1)[0]
-                
-                for i, chunk_content in enumerate(split_files, 1):
-                    chunk_filename = f"{base_name}_part_{i}.txt"
-                    zip_file.writestr(chunk_filename, chunk_content)
-            
-            zip_buffer.seek(0)
-            
-            zip_filename = f"{filename.rsplit('.', 1)[0]}_split.zip"
-            
-            return send_file(
-                zip_buffer,
-                as_attachment=True,
-                download_name=zip_filename,
-                mimetype='application/zip'
-            )
-            
-        except Exception as e:
-            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
-    
-    return jsonify({'error': 'Format file tidak didukung. Gunakan file .txt'}), 400
-
-# ========================
-# VCF TO TXT ROUTES
-# ========================
-
-@app.route('/vcf-to-txt')
-def vcf_to_txt():
-    """Halaman converter VCF to TXT"""
-    print("DEBUG: Accessing /vcf-to-txt route")
-    
-    # Check session validity with tracking
-    redirect_response = require_valid_session()
-    if redirect_response:
-        return redirect_response
-    
-    print("DEBUG: Rendering vcf_to_txt.html template")
-    return render_template('vcf_to_txt.html')
-
-@app.route('/convert_vcf_single', methods=['POST'])
-def convert_vcf_single():
-    """Proses single VCF convert - 1 file VCF diextract ke 1 file TXT"""
-    print(f"DEBUG: convert_vcf_single called")
-    print(f"DEBUG: request.files keys: {list(request.files.keys())}")
-    print(f"DEBUG: request.form keys: {list(request.form.keys())}")
-    
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        print(f"DEBUG: Session validation failed")
-        return error_response
-    
-    if 'vcf_file' not in request.files:
-        print(f"DEBUG: vcf_file not in request.files")
-        return jsonify({'error': 'File tidak ditemukan'}), 400
-    
-    file = request.files['vcf_file']
-    if file.filename == '':
-        print(f"DEBUG: file.filename is empty")
-        return jsonify({'error': 'File tidak dipilih'}), 400
-    
-    if file and file.filename.lower().endswith('.vcf'):
-        try:
-            # Baca isi file
-            content = file.read().decode('utf-8')
-            
-            # Ambil parameter
-            output_format = request.form.get('output_format', 'comma')
-            output_prefix = request.form.get('output_prefix', '').strip()
-            
-            # Parse VCF ke TXT
-            txt_contacts = parse_vcf_to_txt(content, output_format)
-            
-            if not txt_contacts:
-                return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file VCF'}), 400
-            
-            # Generate TXT content
-            txt_content = '\n'.join(txt_contacts)
-            
-            # Generate filename
-            filename = secure_filename(file.filename)
-            base_name = filename.rsplit('.', 1)[0]
-            
-            if output_prefix:
-                txt_filename = f"{output_prefix}.txt"
-            else:
-                txt_filename = f"{base_name}.txt"
-            
-            response = make_response(txt_content)
-            response.headers['Content-Type'] = 'text/plain; charset=utf-8'
-            response.headers['Content-Disposition'] = f'attachment; filename="{txt_filename}"'
-            return response
-            
-        except Exception as e:
-            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
-    
-    return jsonify({'error': 'Format file tidak didukung. Gunakan file .vcf'}), 400
-
-@app.route('/convert_vcf_multi', methods=['POST'])
-def convert_vcf_multi():
-    """Proses multi VCF convert - multiple file VCF diextract ke multiple TXT"""
-    print(f"DEBUG: convert_vcf_multi called")
-    print(f"DEBUG: request.files keys: {list(request.files.keys())}")
-    print(f"DEBUG: request.form keys: {list(request.form.keys())}")
-    
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        print(f"DEBUG: Session validation failed")
-        return error_response
-    
-    if 'vcf_files' not in request.files:
-        print(f"DEBUG: vcf_files not in request.files")
-        return jsonify({'error': 'File tidak ditemukan'}), 400
-    
-    files = request.files.getlist('vcf_files')
-    if not files or len(files) == 0:
-        print(f"DEBUG: files is empty")
-        return jsonify({'error': 'File tidak dipilih'}), 400
-    
-    try:
-        # Ambil parameter
-        output_format = request.form.get('output_format', 'comma')
-        output_prefix = request.form.get('output_prefix', '').strip()
-        merge_files = request.form.get('merge_files') == 'true'
-        
-        all_contacts = []
-        files_info = []
-        
-        for i, file in enumerate(files):
-            if file.filename == '':
-                continue
-                
-            if not file.filename.lower().endswith('.vcf'):
-                continue
-            
-            # Baca isi file
-            content = file.read().decode('utf-8')
-            
-            # Parse VCF ke TXT
-            txt_contacts = parse_vcf_to_txt(content, output_format)
-            
-            if txt_contacts:
-                if merge_files:
-                    # Tambahkan ke list gabungan
-                    all_contacts.extend(txt_contacts)
-                else:
-                    # Buat file terpisah
-                    txt_content = '\n'.join(txt_contacts)
-                    
-                    # Generate filename
-                    filename = secure_filename(file.filename)
-                    base_name = filename.rsplit('.', 1)[0]
-                    
-                    if output_prefix:
-                        txt_filename = f"{output_prefix}_{base_name}.txt"
-                    else:
-                        txt_filename = f"{base_name}.txt"
-                    
-                    # Store file content in temp storage
-                    file_id = f"vcf_multi_{int(time.time())}_{i}"
-                    temp_file_storage[file_id] = {
-                        'content': txt_content,
-                        'filename': txt_filename,
-                        'mimetype': 'text/plain'
-                    }
-                    
-                    files_info.append({
-                        'file_id': file_id,
-                        'filename': txt_filename,
-                        'size': len(txt_content.encode('utf-8')),
-                        'contacts': len(txt_contacts)
-                    })
-        
-        if merge_files and all_contacts:
-            # Gabungkan semua kontak ke 1 file
-            txt_content = '\n'.join(all_contacts)
-            
-            if output_prefix:
-                txt_filename = f"{output_prefix}.txt"
-            else:
-                txt_filename = "merged_contacts.txt"
-            
-            response = make_response(txt_content)
-            response.headers['Content-Type'] = 'text/plain; charset=utf-8'
-            response.headers['Content-Disposition'] = f'attachment; filename="{txt_filename}"'
-            return response
-        
-        elif files_info:
-            # Return multiple files info
-            return jsonify({
-                'success': True,
-                'multiple_files': True,
-                'total_files': len(files_info),
-                'total_contacts': sum(f['contacts'] for f in files_info),
-                'files': files_info
-            })
-        
-        else:
-            return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file VCF'}), 400
-            
-    except Exception as e:
-        return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
-
-# ========================
-# ADMIN & NAVY ROUTES
-# ========================
-
-@app.route('/gabung-vcf')
-def gabung_vcf():
-    return render_template('gabung_vcf.html')
-
-@app.route('/gabung_vcf_files', methods=['POST'])
-def gabung_vcf_files():
-    try:
-        if 'vcf_files' not in request.files:
-            return jsonify({'error': 'No files uploaded'}), 400
-        
-        uploaded_files = request.files.getlist('vcf_files')
-        
-        if not uploaded_files or len(uploaded_files) < 2:
-            return jsonify({'error': 'Please upload at least 2 VCF files'}), 400
-        
-        # Quick validation - check file extensions only
-        for file in uploaded_files:
-            if not file.filename.lower().endswith('.vcf'):
-                return jsonify({'error': f'File {file.filename} is not a VCF file'}), 400
-        
-        # Get form data
-        contact_name_prefix = request.form.get('contact_name', 'Gabung').strip()
-        output_filename = request.form.get('output_filename', 'merged_contacts').strip()
-        
-        if not contact_name_prefix:
-            contact_name_prefix = 'Gabung'
-        
-        if not output_filename:
-            output_filename = 'merged_contacts'
-        
-        # Read and process all VCF files - Optimized
-        vcf_contents = []
-        original_stats = []
-        
-        for file in uploaded_files:
-            try:
-                content = file.read().decode('utf-8', errors='ignore')  # Ignore encoding errors
-                vcf_contents.append(content)
-                
-                # Quick count for stats
-                import re
-                tel_count = len(re.findall(r'TEL[^:]*:', content))
-                original_stats.append({
-                    'filename': file.filename,
-                    'contacts': tel_count
-                })
-            except Exception as e:
-                print(f"Error reading file {file.filename}: {e}")
-                continue
-        
-        if not vcf_contents:
-            return jsonify({'error': 'No valid VCF content found'}), 400
-        
-        # Merge VCF files - Optimized function
-        merged_contacts = merge_vcf_files(vcf_contents, contact_name_prefix)
-        
-        if not merged_contacts:
-            return jsonify({'error': 'No valid contacts found in uploaded files'}), 400
-        
-        # Create final VCF content
-        final_vcf_content = '\n\n'.join(merged_contacts)  # Add spacing between contacts
-        
-        # Store in temp storage instead of session (to avoid cookie size limit)
-        import uuid
-        file_id = f"gabung_vcf_{int(time.time())}_{str(uuid.uuid4())[:8]}"
-        
-        temp_file_storage[file_id] = {
-            'content': final_vcf_content,
-            'filename': f"{output_filename}.vcf",
-            'mimetype': 'text/vcard',
-            'timestamp': time.time()
-        }
-        
-        # Store only file ID in session
-        session['download_file_id'] = file_id
-        
-        # Create summary
-        total_original_contacts = sum(stat['contacts'] for stat in original_stats)
-        
-        return jsonify({
-            'success': True,
-            'message': f'Successfully merged {len(uploaded_files)} VCF files',
-            'original_files': original_stats,
-            'total_original_contacts': total_original_contacts,
-            'merged_contacts': len(merged_contacts),
-            'contact_name_prefix': contact_name_prefix,
-            'output_filename': f"{output_filename}.vcf",
-            'download_url': '/download'
-        })
-        
-    except Exception as e:
-        print(f"Error in gabung_vcf_files: {e}")
-        return jsonify({'error': f'Error processing files: {str(e)}'}), 500
-
-@app.route('/admin-navy')
-def admin_navy():
-    """Halaman converter Admin & Navy"""
-    print("DEBUG: Accessing /admin-navy route")
-    
-    # Check session validity with tracking
-    redirect_response = require_valid_session()
-    if redirect_response:
-        return redirect_response
-    
-    print("DEBUG: Rendering admin_navy.html template")
-    return render_template('admin_navy.html')
-
-@app.route('/convert_admin_navy', methods=['POST'])
-def convert_admin_navy():
-    """Proses konversi Admin & Navy numbers ke VCF"""
-    print(f"DEBUG: convert_admin_navy called")
-    print(f"DEBUG: request.form keys: {list(request.form.keys())}")
-    
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        print(f"DEBUG: Session validation failed")
-        return error_response
-    
-    try:
-        # Ambil parameter dari form - sesuai dengan template baru
-        admin_numbers = request.form.get('admin_numbers', '').strip()
-        navy_numbers = request.form.get('navy_numbers', '').strip()
-        admin_name_prefix = request.form.get('admin_name_prefix', 'Admin').strip()
-        navy_name_prefix = request.form.get('navy_name_prefix', 'Navy').strip()
-        admin_start_number = int(request.form.get('admin_start_number', 1))
-        navy_start_number = int(request.form.get('navy_start_number', 1))
-        output_filename = request.form.get('output_filename', '').strip()
-        
-        print(f"DEBUG: admin_numbers length: {len(admin_numbers.split()) if admin_numbers else 0}")
-        print(f"DEBUG: navy_numbers length: {len(navy_numbers.split()) if navy_numbers else 0}")
-        print(f"DEBUG: admin_name_prefix: '{admin_name_prefix}'")
-        print(f"DEBUG: navy_name_prefix: '{navy_name_prefix}'")
-        print(f"DEBUG: admin_start_number: {admin_start_number}")
-        print(f"DEBUG: navy_start_number: {navy_start_number}")
-        print(f"DEBUG: output_filename: '{output_filename}'")
-        
-        # Validasi input
-        if not admin_numbers and not navy_numbers:
-            return jsonify({'error': 'Minimal salah satu nomor (admin atau navy) harus diisi'}), 400
-        
-        # Validasi nama kontak
-        if admin_numbers and not admin_name_prefix:
-            admin_name_prefix = 'Admin'
-        if navy_numbers and not navy_name_prefix:
-            navy_name_prefix = 'Navy'
-        
-        # Parse ke VCF dengan fungsi yang mendukung start number
-        vcf_contacts = parse_admin_navy_to_vcf_with_start(
-            admin_numbers, 
-            navy_numbers, 
-            admin_name_prefix, 
-            navy_name_prefix,
-            admin_start_number,
-            navy_start_number
-        )
-        
-        if not vcf_contacts:
-            return jsonify({'error': 'Tidak ada nomor valid ditemukan'}), 400
-        
-        # Generate VCF content
-        vcf_content = '\n'.join(vcf_contacts)
-        
-        # Generate filename
-        if output_filename:
-            if not output_filename.lower().endswith('.vcf'):
-                output_filename += '.vcf'
-            vcf_filename = secure_filename(output_filename)
-        else:
-            vcf_filename = "admin_navy_contacts.vcf"
-        
-        print(f"DEBUG: Generated {len(vcf_contacts)} contacts, filename: {vcf_filename}")
-        
-        response = make_response(vcf_content)
-        response.headers['Content-Type'] = 'text/vcard'
-        response.headers['Content-Disposition'] = f'attachment; filename="{vcf_filename}"'
-        return response
-        
-    except Exception as e:
-        print(f"DEBUG: Error in convert_admin_navy: {str(e)}")
-        return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
-
-# ========================
-# GABUNG TXT ROUTES
-# ========================
-
-@app.route('/gabung-txt')
-def gabung_txt():
-    """Halaman gabung multiple TXT files"""
-    print("DEBUG: Accessing /gabung-txt route")
-    
-    # Check session validity with tracking
-    redirect_response = require_valid_session()
-    if redirect_response:
-        return redirect_response
-    
-    print("DEBUG: Rendering gabung_txt.html template")
-    return render_template('gabung_txt.html')
-
-@app.route('/gabung_txt_files', methods=['POST'])
-def gabung_txt_files():
-    """Proses gabung multiple TXT files menjadi 1 file TXT"""
-    print(f"DEBUG: gabung_txt_files called")
-    print(f"DEBUG: request.files keys: {list(request.files.keys())}")
-    print(f"DEBUG: request.form keys: {list(request.form.keys())}")
-    
-    # Check session validity with tracking
-    error_response = require_valid_session(return_json=True)
-    if error_response:
-        print(f"DEBUG: Session validation failed")
-        return error_response
-    
-    if 'txt_files' not in request.files:
-        print(f"DEBUG: txt_files not in request.files")
-        return jsonify({'error': 'File tidak ditemukan'}), 400
-    
-    files = request.files.getlist('txt_files')
-    if not files or len(files) < 2:
-        print(f"DEBUG: Not enough files: {len(files) if files else 0}")
-        return jsonify({'error': 'Minimal 2 file TXT diperlukan untuk digabung'}), 400
-    
-    try:
-        # Ambil parameter
-        output_filename = request.form.get('output_filename', '').strip()
-        separator_option = request.form.get('separator_option', 'none')
-        custom_separator = request.form.get('custom_separator', '').strip()
-        add_filename_headers = request.form.get('add_filename_headers') == 'true'
-        
-        print(f"DEBUG: output_filename: '{output_filename}'")
-        print(f"DEBUG: separator_option: '{separator_option}'")
-        print(f"DEBUG: custom_separator: '{custom_separator}'")
-        print(f"DEBUG: add_filename_headers: {add_filename_headers}")
-        print(f"DEBUG: files_count: {len(files)}")
-        
-        # Validasi nama file output
-        if not output_filename:
-            output_filename = "merged_files"
-        
-        # Process files and merge content
-        merged_content = []
-        processed_files = 0
-        valid_files = [f for f in files if f.filename != '' and allowed_file(f.filename)]
-        
-        for i, file in enumerate(valid_files):
-            try:
-                # Baca isi file
-                content = file.read().decode('utf-8').strip()
-                
-                if content:  # Hanya proses jika ada content
-                    # Tambah header nama file jika diperlukan
-                    if add_filename_headers:
-                        header = f"=== {file.filename} ==="
-                        merged_content.append(header)
-                    
-                    # Tambah content file
-                    merged_content.append(content)
-                    processed_files += 1
-                    
-                    # Tambah separator jika bukan file terakhir dan separator diperlukan
-                    if processed_files < len(valid_files) and separator_option != 'none':
-                        if separator_option == 'newline':
-                            merged_content.append('')  # Baris kosong
-                        elif separator_option == 'double_newline':
-                            merged_content.append('')
-                            merged_content.append('')  # 2 baris kosong
-                        elif separator_option == 'dash':
-                            merged_content.append('---')
-                        elif separator_option == 'custom' and custom_separator:
-                            merged_content.append(custom_separator)
-                
-            except UnicodeDecodeError:
-                # Coba dengan encoding lain
-                try:
-                    file.seek(0)
-                    content = file.read().decode('latin-1').strip()
-                    if content:
-                        if add_filename_headers:
-                            header = f"=== {file.filename} ==="
-                            merged_content.append(header)
-                        merged_content.append(content)
-                        processed_files += 1
-                        
-                        # Tambah separator untuk encoding latin-1 juga
-                        if processed_files < len(valid_files) and separator_option != 'none':
-                            if separator_option == 'newline':
-                                merged_content.append('')
-                            elif separator_option == 'double_newline':
-                                merged_content.append('')
-                                merged_content.append('')
-                            elif separator_option == 'dash':
-                                merged_content.append('---')
-                            elif separator_option == 'custom' and custom_separator:
-                                merged_content.append(custom_separator)
-                except Exception as e:
-                    print(f"DEBUG: Error reading file {file.filename}: {e}")
-                    continue
-            except Exception as e:
-                print(f"DEBUG: Error processing file {file.filename}: {e}")
-                continue
-        
-        if processed_files < 2:
-            return jsonify({'error': 'Minimal 2 file berhasil diproses diperlukan untuk digabung'}), 400
-        
-        # Generate final merged content
-        final_content = '\n'.join(merged_content)
-        
-        # Generate filename
-        if not output_filename.lower().endswith('.txt'):
-            output_filename += '.txt'
-        final_filename = secure_filename(output_filename)
-        
-        print(f"DEBUG: Generated merged file - {processed_files} files processed, filename: {final_filename}")
-        print(f"DEBUG: Content length: {len(final_content)} characters")
-        
-        response = make_response(final_content)
-        response.headers['Content-Type'] = 'text/plain; charset=utf-8'
-        response.headers['Content-Disposition'] = f'attachment; filename="{final_filename}"'
-        return response
-        
-    except Exception as e:
-        print(f"DEBUG: Error in gabung_txt_files: {str(e)}")
-        return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
-
-@app.route('/logout')
-def logout():
-    """Logout user dan clear session"""
-    api_key = session.get('api_key')
-    
-    # Invalidate session tracking
-    if api_key:
-        invalidate_session(api_key)
-        print(f"DEBUG: User logged out, invalidated session for API key {api_key}")
-    
-    # Clear session
-    session.clear()
-    flash('Berhasil logout. Terima kasih!', 'success')
-    return redirect(url_for('index'))
-
-@app.route('/admin')
-def admin_login():
-    """Halaman login admin"""
-    return render_template('admin_login.html')
-
-@app.route('/admin/verify', methods=['POST'])
-def admin_verify():
-    """Verifikasi login admin"""
-    password = request.form.get('password', '')
-    
-    if password == ADMIN_PASSWORD:
-        session['admin_logged_in'] = True
-        flash('Login admin berhasil!', 'success')
-        return redirect(url_for('admin_panel'))
-    else:
-        flash('Password admin salah!', 'error')
-        return redirect(url_for('admin_login'))
-
-@app.route('/admin/panel')
-def admin_panel():
-    """Panel admin untuk manage API keys"""
-    if 'admin_logged_in' not in session or not session['admin_logged_in']:
-        flash('Silakan login sebagai admin terlebih dahulu.', 'error')
-        return redirect(url_for('admin_login'))
-    
-    api_keys = load_api_keys()
-    return render_template('admin_panel.html', api_keys=api_keys)
-
-@app.route('/admin/generate_key', methods=['POST'])
-def generate_key():
-    """Generate API key baru"""
-    if 'admin_logged_in' not in session or not session['admin_logged_in']:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
-    duration_months = request.form.get('duration', '1')
-    description = request.form.get('description', '')
-    
-    try:
-        duration_months = int(duration_months)
-        if duration_months <= 0:
-            return jsonify({'error': 'Durasi harus lebih dari 0'}), 400
-    except ValueError:
-        return jsonify({'error': 'Durasi harus berupa angka'}), 400
-    
-    # Generate API key
-    new_api_key = generate_api_key()
-    
-    # Hitung tanggal expired
-    expiry_date = datetime.now() + timedelta(days=duration_months * 30)
-    
-    # Load existing keys
-    api_keys = load_api_keys()
-    
-    # Tambah key baru
-    api_keys[new_api_key] = {
-        'created_date': datetime.now().isoformat(),
-        'expiry_date': expiry_date.isoformat(),
-        'description': description,
-        'duration_months': duration_months
-    }
-    
-    # Save
-    save_api_keys(api_keys)
-    
-    flash(f'API key berhasil dibuat: {new_api_key}', 'success')
-    return redirect(url_for('admin_panel'))
-
-@app.route('/admin/delete_key/<api_key>', methods=['POST'])
-def delete_key(api_key):
-    """Hapus API key"""
-    if 'admin_logged_in' not in session or not session['admin_logged_in']:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
-    api_keys = load_api_keys()
-    
-    if api_key in api_keys:
-        # Hapus API key dari database
-        del api_keys[api_key]
-        save_api_keys(api_keys)
-        
-        # PENTING: Hapus session aktif yang menggunakan API key ini
-        if api_key in active_sessions:
-            del active_sessions[api_key]
-            print(f"DEBUG: Deleted active session for API key {api_key}")
-        
-        flash('API key berhasil dihapus!', 'success')
-    else:
-        flash('API key tidak ditemukan!', 'error')
-    
-    return redirect(url_for('admin_panel'))
-
-@app.route('/admin/logout')
-def admin_logout():
-    """Logout admin"""
-    session.pop('admin_logged_in', None)
-    flash('Admin logout berhasil.', 'info')
-    return redirect(url_for('admin_login'))
-
-if __name__ == '__main__':
-    # Development
-    app.run(debug=True, host='0.0.0.0', port=5000)
-else:
-    # Production - untuk deployment
-    import os
-    port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
+from flask import Flask, render_template, request, jsonify, session, send_file, flash, redirect, url_for, make_response, Response, stream_with_context
+import json
+import logging
+import os
+import secrets
+import string
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from werkzeug.utils import secure_filename
+import io
+import click
+import itertools
+from utils import vcf_to_contacts, analyze_vcf_file, admin_navy_contacts, merge_vcf_contacts, create_dedupe, dedupe_txt_content
+from utils import ContactList, contact_padding, count_upload_lines, iter_upload_lines, iter_txt_to_vcf, parallel_workers, write_vcf_segments
+from utils import clean_txt_end, count_buffer_lines, normalize_txt_lines, txt_line_segments, validate_utf8
+from utils import cached_txt_contacts, content_digest, parse_txt_upload, txt_stats, upload_digest, validate_txt_upload
+from utils import parse_txt_uploads, parse_vcf_uploads
+from utils import phone_cache, phone_fast_path, txt_parse_cache, output_settings
+from utils import MERGE_SORT_KEYS, MERGE_PHONE_MODE, MERGE_PHONE_MODES, external_merge_txt, external_merge_vcf
+from jobs import create_job_queue, JOB_DONE, JOB_FAILED
+from storage import RangeReader, map_file, create_temp_store, create_session_store, create_result_cache
+from zipstream import iter_zip, iter_groups, iter_joined, iter_file, parse_compress_level
+from keystore import create_key_store
+from logconfig import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+app = Flask(__name__)
+app.secret_key = 'your-secret-key-here-change-this'  # Ganti dengan secret key yang aman
+
+# Template helper functions
+@app.template_global()
+def moment():
+    return datetime.now()
+
+@app.context_processor
+def inject_user_info():
+    """Inject user information (including API key expiry) to all templates"""
+    if 'api_key_valid' in session and session['api_key_valid']:
+        api_key = session.get('api_key')
+        if api_key:
+            key_entry = api_key_store.lookup(api_key)
+            if key_entry is not None:
+                expiry_date = key_entry[2]
+                
+                # Format tanggal lebih compact
+                expiry_formatted = expiry_date.strftime('%d/%m/%y %H:%M')
+                
+                # Hitung sisa hari
+                remaining_days = (expiry_date - datetime.now()).days
+                
+                return {
+                    'api_key_expiry': expiry_formatted,
+                    'api_key_remaining_days': remaining_days
+                }
+    
+    return {}
+
+# Konfigurasi
+UPLOAD_FOLDER = 'uploads'
+ALLOWED_EXTENSIONS = {'txt', 'vcf'}
+API_KEYS_FILE = os.path.join(os.path.dirname(__file__), 'api_keys.json')  # Fix path to website directory
+ADMIN_PASSWORD = 'admin123'  # Ganti dengan password yang aman
+
+# Pastikan folder upload ada
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+UPLOAD_FOLDER_PATH = os.path.abspath(UPLOAD_FOLDER)
+JOB_UPLOAD_FOLDER = os.path.join(UPLOAD_FOLDER_PATH, 'jobs')
+# Database SQLite untuk API key dan session aktif
+DATABASE_FILE = os.environ.get('DATABASE_FILE', os.path.join(UPLOAD_FOLDER_PATH, 'websitecv.db'))
+
+# API key (SQLite, api_keys.json di-import sekali; KEY_STORE=json untuk tetap pakai file JSON)
+api_key_store = create_key_store(DATABASE_FILE, API_KEYS_FILE)
+
+# Storage untuk file hasil sementara (shared antar worker gunicorn, lihat RESULT_STORE)
+temp_file_storage = create_temp_store(os.path.join(UPLOAD_FOLDER_PATH, 'results'))
+
+# Cache hasil konversi per isi upload + opsi, dipakai ulang lintas user/request (lihat RESULT_CACHE_DISK_LIMIT)
+result_cache = create_result_cache(os.path.join(UPLOAD_FOLDER_PATH, 'result_cache'))
+# Setting environment yang memengaruhi hasil ikut key cache: setelah config / deploy berubah hasil lama tidak dipakai
+RESULT_CACHE_SETTINGS = output_settings()
+
+# Storage untuk active sessions - 1 API key = 1 user (shared antar worker, lihat SESSION_STORE)
+active_sessions = create_session_store(DATABASE_FILE)
+
+# Antrian job background untuk konversi file besar
+job_queue = create_job_queue(UPLOAD_FOLDER_PATH)
+
+# Gabung file dengan total upload minimal sebesar ini otomatis lewat external sort (file dibaca satu per satu)
+EXTERNAL_MERGE_MIN_BYTES = int(os.environ.get('EXTERNAL_MERGE_MIN_BYTES', 256 * 1024 * 1024))
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+def send_temp_file(path, filename, mimetype):
+    """Kirim file hasil dari disk lalu hapus (file tetap terbaca lewat handle yang sudah dibuka)"""
+    file_handle = open(path, 'rb')
+    os.remove(path)
+    return send_file(file_handle, mimetype=mimetype, as_attachment=True, download_name=filename)
+
+def open_stored_file(file_data):
+    """Buka isi file hasil dari temp storage sebagai file object biner
+
+    File di disk langsung dihapus, isinya tetap terbaca lewat handle yang sudah dibuka.
+    """
+    if file_data['path'] is None:
+        return io.BytesIO(file_data['content'])
+    if file_data['offset'] is not None:
+        reader = RangeReader(file_data['path'], file_data['offset'], file_data['size'])
+    else:
+        reader = open(file_data['path'], 'rb')
+    os.remove(file_data['path'])
+    return reader
+
+def send_stored_file(file_data):
+    """Kirim file hasil dari temp storage (dari disk, potongan file di disk, atau dari RAM)"""
+    response = send_file(open_stored_file(file_data), mimetype=file_data['mimetype'],
+                         as_attachment=True, download_name=file_data['filename'])
+    response.content_length = file_data['size']
+    return response
+
+def wants_zip():
+    """Cek apakah client minta semua file hasil dikirim sebagai 1 ZIP"""
+    return request.form.get('zip_output') == 'true'
+
+def zip_response(entries, zip_filename, empty_error):
+    """Stream ZIP dari entries (nama file, potongan isi); error 400 kalau tidak ada entry sama sekali
+
+    Entry pertama disiapkan sebelum response dikirim, entry berikutnya dibuat sambil di-stream.
+    """
+    entries = iter(entries)
+    first_entry = next(entries, None)
+    if first_entry is None:
+        return jsonify({'error': empty_error}), 400
+    
+    compress_level = parse_compress_level(request.values.get('zip_level'))
+    response = Response(stream_with_context(iter_zip(itertools.chain((first_entry,), entries), compress_level)),
+                        mimetype='application/zip')
+    response.headers.set('Content-Disposition', 'attachment', filename=secure_filename(zip_filename) or 'hasil.zip')
+    return response
+
+def iter_file_segments(path, filenames, segments):
+    """Entry ZIP (nama file, isi) dari potongan (offset, size, ...) file di path; file dihapus setelah selesai"""
+    try:
+        for filename, (offset, size, _) in zip(filenames, segments):
+            yield filename, iter_file(RangeReader(path, offset, size)) if size else ()
+    finally:
+        os.remove(path)
+
+def new_batch_id(prefix):
+    """ID unik untuk sekumpulan file hasil"""
+    return f"{prefix}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+
+def lookup_result(route, digests, **options):
+    """Cari output konversi di result cache, return (key, entry atau None); key None kalau cache dimatikan"""
+    if result_cache is None:
+        return None, None
+    key = result_cache.key(route, digests, dict(options, settings=RESULT_CACHE_SETTINGS))
+    return key, result_cache.get(key)
+
+def save_result(key, mimetype, content=None, path=None, **extra):
+    """Simpan output konversi di result cache (file di path di-hard link, tidak dipindah), return entry atau None"""
+    if key is None:
+        return None
+    entry = result_cache.put(key, mimetype, content=content, path=path, extra=extra)
+    if entry is None:
+        logger.warning("Gagal menyimpan hasil konversi %s di result cache", key)
+    return entry
+
+def link_result(file_id, filename, entry, offset=0, size=None):
+    """Daftarkan output dari result cache (atau potongannya) di temp storage tanpa copy isi, return ukuran"""
+    return temp_file_storage.put_range(file_id, filename, entry['mimetype'], entry['path'],
+                                       (entry['offset'] or 0) + offset, entry['size'] if size is None else size)
+
+def send_result(entry, filename, content_type):
+    """Kirim output dari result cache langsung sebagai download (file cache tidak dihapus)"""
+    reader = RangeReader(entry['path'], entry['offset'] or 0, entry['size'])
+    response = Response(iter_file(reader))
+    response.headers['Content-Type'] = content_type
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.content_length = entry['size']
+    return response
+
+def cached_file_info(file_id, filename, entry):
+    """Info file hasil dari output di result cache (di-link ke temp storage), None kalau tidak ada di cache"""
+    if entry is None:
+        return None
+    try:
+        size = link_result(file_id, filename, entry)
+    except OSError:
+        # File cache baru saja dibuang (TTL / batas disk), hitung ulang
+        return None
+    return dict({'file_id': file_id, 'filename': filename, 'size': size}, **entry['extra'])
+
+def store_result_path(file_id, filename, mimetype, path, cache_key, **extra):
+    """Simpan output yang sudah ditulis ke path di temp storage (file dipindah), di-link juga ke result cache"""
+    save_result(cache_key, mimetype, path=path, **extra)
+    return temp_file_storage.put(file_id, filename, mimetype, path=path)
+
+def store_result_file(file_id, filename, mimetype, content, cache_key, **extra):
+    """Simpan output di temp storage; dengan result cache isi ditulis sekali ke cache lalu di-link"""
+    entry = save_result(cache_key, mimetype, content=content, **extra)
+    if entry is not None:
+        try:
+            return link_result(file_id, filename, entry)
+        except OSError:
+            pass
+    return temp_file_storage.put(file_id, filename, mimetype, content=content)
+
+def merge_sort_by():
+    """Urutan hasil gabung dari input user ('number', 'name'), '' = urutan file upload"""
+    sort_by = request.form.get('sort_by', '')
+    return sort_by if sort_by in MERGE_SORT_KEYS else ''
+
+def merge_phone_mode():
+    """Mode normalisasi nomor gabung VCF dari input user (lihat MERGE_PHONE_MODES), default MERGE_PHONE_MODE"""
+    phone_mode = request.form.get('phone_mode', '')
+    return phone_mode if phone_mode in MERGE_PHONE_MODES else MERGE_PHONE_MODE
+
+def wants_external_merge(sort_by):
+    """Cek apakah gabung lewat external sort: diminta client, hasil perlu diurutkan, atau upload besar"""
+    return (request.form.get('merge_mode') == 'external' or bool(sort_by)
+            or (request.content_length or 0) >= EXTERNAL_MERGE_MIN_BYTES)
+
+def wants_background():
+    """Cek apakah client minta proses dijalankan sebagai background job"""
+    return request.form.get('background') == 'true'
+
+def save_job_uploads(files):
+    """Simpan file upload ke disk supaya bisa diproses setelah request selesai"""
+    os.makedirs(JOB_UPLOAD_FOLDER, exist_ok=True)
+    uploads = []
+    for file in files:
+        path = os.path.join(JOB_UPLOAD_FOLDER, f"{uuid.uuid4().hex}.upload")
+        file.save(path)
+        uploads.append((path, file.filename))
+    return uploads
+
+def read_job_upload(path):
+    """Isi 1 file upload job (bytes)"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def remove_job_uploads(uploads):
+    """Hapus file upload milik job yang sudah selesai diproses"""
+    for path, _ in uploads:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def submit_job(kind, func, *args):
+    """Jalankan func di background, return response 202 dengan job id"""
+    job_id = job_queue.submit(kind, func, *args, owner=session.get('api_key'))
+    return jsonify({
+        'success': True,
+        'background': True,
+        'job_id': job_id,
+        'status_url': url_for('job_status', job_id=job_id)
+    }), 202
+
+def load_api_keys():
+    """Load semua API keys"""
+    return api_key_store.load()
+
+def save_api_keys(api_keys):
+    """Simpan semua API keys (ganti isi store)"""
+    api_key_store.save(api_keys)
+
+def generate_api_key():
+    """Generate API key 12 karakter dengan huruf besar semua"""
+    chars = string.ascii_uppercase + string.digits  # Hanya huruf besar dan angka
+    return ''.join(secrets.choice(chars) for _ in range(12))
+
+def check_api_key(api_key):
+    """Cek apakah API key valid dan belum expired"""
+    logger.debug("Checking API key: %s", api_key)
+    
+    # Case-insensitive lookup
+    key_entry = api_key_store.lookup(api_key)
+    
+    if key_entry is None:
+        logger.debug("API key %s not found in keys", api_key)
+        return False, "API key tidak valid", None
+    
+    found_key, key_data, expiry_date = key_entry
+    current_time = datetime.now()
+    
+    logger.debug("Current time: %s", current_time)
+    logger.debug("Expiry time: %s", expiry_date)
+    
+    if current_time > expiry_date:
+        logger.debug("API key expired")
+        return False, "API key sudah expired", None
+    
+    logger.debug("API key valid")
+    return True, "API key valid", found_key
+
+def create_session_id():
+    """Generate unique session ID"""
+    return secrets.token_urlsafe(32)
+
+def register_session(api_key, session_id, user_info=None):
+    """Register new session and force logout previous session"""
+    current_time = datetime.now()
+    
+    # Jika API key sudah ada session aktif, tandai sebagai invalid
+    old_session = active_sessions.get(api_key)
+    if old_session is not None:
+        logger.debug("Force logout previous session %s for API key %s", old_session['session_id'], api_key)
+    
+    # Register session baru
+    active_sessions.put(api_key, {
+        'session_id': session_id,
+        'login_time': current_time,
+        'last_activity': current_time,
+        'user_info': user_info or {},
+        'is_active': True
+    })
+    
+    logger.debug("Registered new session %s for API key %s", session_id, api_key)
+    return True
+
+def is_session_valid(api_key, session_id):
+    """Check if session is still valid (not replaced by newer session) AND API key still exists in database"""
+    # PERTAMA: Cek apakah API key masih ada dan valid di database
+    api_valid, api_message, actual_api_key = check_api_key(api_key)
+    if not api_valid:
+        # API key sudah dihapus atau expired, invalidate session
+        active_sessions.delete(api_key)
+        return False, f"API key tidak valid: {api_message}"
+    
+    # KEDUA: Cek session di session store
+    session_data = active_sessions.get(api_key)
+    if session_data is None:
+        return False, "Session tidak ditemukan"
+    
+    if not session_data.get('is_active', False):
+        return False, "Session sudah dinonaktifkan"
+    
+    if session_data['session_id'] != session_id:
+        return False, "Session digantikan oleh login baru"
+    
+    # Update last activity
+    active_sessions.update(api_key, last_activity=datetime.now())
+    
+    return True, "Session valid"
+
+def invalidate_session(api_key):
+    """Invalidate session for API key"""
+    if active_sessions.get(api_key) is not None:
+        active_sessions.update(api_key, is_active=False)
+        logger.debug("Invalidated session for API key %s", api_key)
+
+def require_valid_session(return_json=False):
+    """Check if current session is valid, redirect if not"""
+    # Basic session check
+    if 'api_key_valid' not in session or not session['api_key_valid']:
+        if return_json:
+            return jsonify({'error': 'Silakan masukkan API key terlebih dahulu'}), 401
+        flash('Silakan masukkan API key terlebih dahulu.', 'error')
+        return redirect(url_for('index'))
+    
+    # Advanced session tracking check
+    api_key = session.get('api_key')
+    session_id = session.get('session_id')
+    
+    if not api_key or not session_id:
+        if return_json:
+            return jsonify({'error': 'Session tidak valid. Silakan login ulang'}), 401
+        flash('Session tidak valid. Silakan login ulang.', 'error')
+        session.clear()
+        return redirect(url_for('index'))
+    
+    # Check if session masih aktif
+    is_valid, message = is_session_valid(api_key, session_id)
+    
+    if not is_valid:
+        if return_json:
+            return jsonify({'error': f'Session berakhir: {message}. Silakan login ulang'}), 401
+        flash(f'Session berakhir: {message}. Silakan login ulang.', 'error')
+        session.clear()
+        return redirect(url_for('index'))
+    
+    return None  # Session valid
+
+@app.route('/')
+def index():
+    """Halaman utama untuk input API key"""
+    if 'api_key_valid' in session and session['api_key_valid']:
+        return redirect(url_for('dashboard'))
+    return render_template('index.html')
+
+@app.route('/verify_api', methods=['POST'])
+def verify_api():
+    """Verifikasi API key dengan session tracking"""
+    api_key = request.form.get('api_key', '').strip()
+    
+    if not api_key:
+        flash('Masukkan API key!', 'error')
+        return redirect(url_for('index'))
+    
+    is_valid, message, actual_api_key = check_api_key(api_key)
+    
+    if is_valid:
+        # Generate unique session ID
+        session_id = create_session_id()
+        
+        # Get user info (IP address, user agent)
+        user_info = {
+            'ip_address': request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR')),
+            'user_agent': request.environ.get('HTTP_USER_AGENT', ''),
+            'login_time': datetime.now().isoformat()
+        }
+        
+        # Register session (akan force logout session lama)
+        register_session(actual_api_key, session_id, user_info)
+        
+        # Set session data - GUNAKAN ACTUAL API KEY YANG BENAR
+        session['api_key'] = actual_api_key
+        session['session_id'] = session_id
+        session['api_key_valid'] = True
+        
+        logger.debug("New session created - API: %s, Session: %s", actual_api_key, session_id)
+        flash('API key valid! Selamat datang.', 'success')
+        return redirect(url_for('dashboard'))
+    else:
+        flash(f'Error: {message}', 'error')
+        return redirect(url_for('index'))
+
+@app.route('/dashboard')
+def dashboard():
+    """Dashboard utama dengan pilihan fitur"""
+    logger.debug("Dashboard accessed. Session: %s", session)
+    
+    # Check session validity with tracking
+    redirect_response = require_valid_session()
+    if redirect_response:
+        return redirect_response
+    
+    logger.debug("Session valid, showing dashboard")
+    return render_template('dashboard.html')
+
+@app.route('/txt-to-vcf')
+def txt_to_vcf():
+    """Halaman converter TXT to VCF"""
+    logger.debug("Accessing /txt-to-vcf route")
+    
+    # Check session validity with tracking
+    redirect_response = require_valid_session()
+    if redirect_response:
+        return redirect_response
+    
+    logger.debug("Rendering txt_to_vcf.html template")
+    return render_template('txt_to_vcf.html')
+
+# Statistik /validate_txt dihitung dengan aturan parser convert (bukan aturan validate_txt_format lama)
+VALIDATE_TXT_STATS_RULES = ('valid_contacts = jumlah kontak yang dihasilkan convert (nomor hasil normalisasi minimal '
+                            '8 digit termasuk kode negara); baris "nama - nomor" terdeteksi sebagai format dash; '
+                            'detected_formats hanya dari baris yang valid')
+
+@app.route('/validate_txt', methods=['POST'])
+def validate_txt():
+    """Validasi 1 file TXT dan return statistik; hasil parse dipakai ulang saat file yang sama di-convert"""
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        return error_response
+    
+    file = request.files.get('txt_file')
+    if file is None or file.filename == '':
+        return jsonify({'error': 'File tidak ditemukan'}), 400
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Format file tidak didukung. Gunakan file .txt'}), 400
+    
+    valid, message, stats = validate_txt_upload(file.read())
+    return jsonify({
+        'success': True,
+        'valid': valid,
+        'message': message,
+        'stats': stats,
+        'stats_rules': VALIDATE_TXT_STATS_RULES
+    })
+
+def with_stats_header(response, stats):
+    """Sertakan statistik konversi di header response file (X-Contact-Stats, JSON)"""
+    response.headers['X-Contact-Stats'] = json.dumps(stats)
+    return response
+
+@app.route('/convert_single', methods=['POST'])
+def convert_single():
+    """Proses single convert - 1 file TXT dibagi menjadi beberapa file VCF"""
+    logger.debug("convert_single called")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("request.files keys: %s", list(request.files.keys()))
+        logger.debug("request.form keys: %s", list(request.form.keys()))
+    logger.debug("session api_key_valid: %s", session.get('api_key_valid', 'NOT_SET'))
+    
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        logger.debug("Session validation failed")
+        return error_response
+    
+    if 'txt_file' not in request.files:
+        logger.debug("txt_file not in request.files")
+        return jsonify({'error': 'File tidak ditemukan'}), 400
+    
+    file = request.files['txt_file']
+    if file.filename == '':
+        logger.debug("file.filename is empty")
+        return jsonify({'error': 'File tidak dipilih'}), 400
+    
+    if file and allowed_file(file.filename):
+        try:
+            # Ambil parameter
+            contacts_per_file = int(request.form.get('contacts_per_file', 1000))
+            name_prefix = request.form.get('contact_name_prefix', '').strip()
+            output_prefix = request.form.get('output_prefix', '').strip()
+            file_start_number = int(request.form.get('file_start_number', 1))
+            
+            # Validasi contacts per file
+            if contacts_per_file < 1 or contacts_per_file > 10000:
+                return jsonify({'error': 'Jumlah kontak per file harus antara 1-10000'}), 400
+            
+            if wants_background():
+                uploads = save_job_uploads([file])
+                return submit_job('convert_single', run_convert_single_job, uploads[0],
+                                  name_prefix, contacts_per_file, output_prefix, file_start_number)
+            
+            filename = secure_filename(file.filename)
+            base_name = filename.rsplit('.', 1)[0]
+            digest = upload_digest(file.stream)
+            
+            # Isi file + opsi yang sama sudah pernah di-convert (user / request mana pun): pakai hasil cache
+            cache_key = None
+            if not wants_zip():
+                cache_key, cached_result = lookup_result('convert_single', [digest], name_prefix=name_prefix,
+                                                         contacts_per_file=contacts_per_file)
+                if cached_result is not None:
+                    response = cached_convert_single_response(cached_result, base_name, output_prefix, file_start_number)
+                    if response is not None:
+                        return response
+            
+            # File yang sudah divalidasi (/validate_txt) tidak perlu di-parse ulang
+            cached = cached_txt_contacts(digest, name_prefix)
+            if cached is not None:
+                vcf_contacts, stats = cached
+                total_lines = stats['total_lines']
+                vcf_entries = vcf_contacts.iter_vcf()
+            else:
+                # Pass pertama: hitung baris untuk padding nomor kontak (file dibaca streaming, tidak di-load semua)
+                stats = None
+                total_lines = count_upload_lines(file.stream)
+                vcf_entries = iter_txt_to_vcf(
+                    iter_upload_lines(file.stream),
+                    name_prefix,
+                    contact_padding(total_lines),
+                    workers=parallel_workers(total_lines)
+                )
+            
+            logger.debug("total_lines=%s, contacts_per_file=%s", total_lines, contacts_per_file)
+            logger.debug("name_prefix=%r, output_prefix=%r, file_start_number=%s", name_prefix, output_prefix, file_start_number)
+            
+            if output_prefix:
+                first_filename = f"{output_prefix} {file_start_number}.vcf"
+            else:
+                first_filename = f"{base_name} {file_start_number}.vcf"
+            
+            if wants_zip():
+                # Semua file hasil dalam 1 ZIP, tiap file ditulis sambil kontak di-parse
+                entries = (
+                    (vcf_chunk_filename(base_name, output_prefix, file_start_number + i), iter_joined(chunk))
+                    for i, chunk in enumerate(iter_groups(vcf_entries, contacts_per_file))
+                )
+                return zip_response(entries, f"{output_prefix or base_name}.zip",
+                                    'Tidak ada kontak valid ditemukan dalam file')
+            
+            # Jumlah baris <= kontak per file: pasti 1 file. Kalau statistik sudah ada (hasil /validate_txt),
+            # stream vCard langsung ke response; kalau belum, lewat file di disk di bawah supaya jumlah kontak
+            # (header X-Contact-Stats) sudah dihitung sebelum response dikirim (maksimal contacts_per_file kontak)
+            if total_lines <= contacts_per_file and stats is not None:
+                logger.debug("Single file condition - streaming VCF directly")
+                if cache_key is not None:
+                    vcf_entries = iter_saving_vcf(vcf_entries, cache_key, total_lines, stats)
+                first_entry = next(vcf_entries, None)
+                if first_entry is None:
+                    return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file'}), 400
+                
+                def generate():
+                    yield first_entry
+                    for vcf_entry in vcf_entries:
+                        yield '\n'
+                        yield vcf_entry
+                
+                response = Response(stream_with_context(generate()), mimetype='text/vcard')
+                response.headers['Content-Type'] = 'text/vcard'
+                response.headers['Content-Disposition'] = f'attachment; filename="{first_filename}"'
+                return with_stats_header(response, stats)
+            
+            # Render semua kontak sekali ke 1 file di disk, dibagi per offset byte
+            batch_id = new_batch_id('single')
+            output_path = temp_file_storage.new_path('.vcf')
+            try:
+                segments = write_vcf_segments(vcf_entries, contacts_per_file, output_path)
+            except Exception:
+                os.remove(output_path)
+                raise
+            total_contacts = sum(count for _, _, count in segments)
+            if stats is None:
+                stats = txt_stats(total_lines, total_contacts)
+            
+            if not segments:
+                os.remove(output_path)
+                return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file'}), 400
+            
+            save_result(cache_key, 'text/vcard', path=output_path, segments=segments, stats=stats)
+            
+            # Jika total kontak <= kontak per file, return sebagai .vcf langsung
+            if len(segments) == 1:
+                logger.debug("Single file condition - returning VCF directly")
+                response = send_temp_file(output_path, first_filename, 'text/vcard')
+                # Sama dengan response streaming / dari result cache
+                response.headers['Content-Type'] = 'text/vcard'
+                return with_stats_header(response, stats)
+            
+            # Jika perlu dibagi ke multiple files, return JSON dengan file info
+            logger.debug("Multiple files condition - returning %s files info", len(segments))
+            
+            files_info = register_vcf_segments(output_path, segments, batch_id, base_name, output_prefix,
+                                               file_start_number)
+            
+            return jsonify({
+                'success': True,
+                'multiple_files': True,
+                'total_files': len(files_info),
+                'total_contacts': total_contacts,  # TAMBAH TOTAL CONTACTS ASLI
+                'stats': stats,
+                'files': files_info
+            })
+            
+        except Exception as e:
+            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
+    
+    return jsonify({'error': 'Format file tidak didukung. Gunakan file .txt'}), 400
+
+def vcf_chunk_filename(base_name, output_prefix, file_number):
+    """Nama file VCF ke-file_number hasil convert_single"""
+    if output_prefix:
+        return f"{output_prefix} {file_number}.vcf"
+    return f"{base_name} {file_number}.vcf"
+
+def register_vcf_segments(path, segments, batch_id, base_name, output_prefix, file_start_number, remove_path=True):
+    """Daftarkan tiap bagian file VCF hasil write_vcf_segments di temp storage, return info file untuk response JSON
+
+    File di path dihapus setelahnya (kecuali remove_path False); isi tiap bagian tetap di disk (di-share, tanpa copy).
+    """
+    files_info = []
+    try:
+        for i, (offset, size, count) in enumerate(segments):
+            vcf_filename = vcf_chunk_filename(base_name, output_prefix, file_start_number + i)
+            
+            # Ukuran langsung dari offset, isi file tidak dibaca ulang
+            file_id = f"{batch_id}_{i}"
+            temp_file_storage.put_range(file_id, vcf_filename, 'text/vcard', path, offset, size)
+            
+            files_info.append({
+                'file_id': file_id,
+                'filename': vcf_filename,
+                'size': size,
+                'contacts': count
+            })
+    finally:
+        if remove_path:
+            os.remove(path)
+    return files_info
+
+def iter_saving_vcf(vcf_entries, cache_key, total_lines, stats):
+    """Teruskan vCard sambil ditulis ke file; kalau semua sudah terkirim, file disimpan di result cache"""
+    path = temp_file_storage.new_path('.vcf')
+    count = 0
+    try:
+        with open(path, 'wb') as output:
+            for vcf_entry in vcf_entries:
+                if count:
+                    output.write(b'\n')
+                output.write(vcf_entry.encode('utf-8'))
+                count += 1
+                yield vcf_entry
+        if count:
+            save_result(cache_key, 'text/vcard', path=path, segments=[(0, os.path.getsize(path), count)],
+                        stats=stats or txt_stats(total_lines, count))
+    finally:
+        os.remove(path)
+
+def cached_vcf_segments(entry, batch_id, base_name, output_prefix, file_start_number):
+    """(info file, statistik) convert_single dari output di result cache, None kalau file cache sudah tidak ada"""
+    try:
+        files_info = register_vcf_segments(entry['path'], entry['extra']['segments'], batch_id, base_name,
+                                           output_prefix, file_start_number, remove_path=False)
+    except OSError:
+        return None
+    return files_info, entry['extra']['stats']
+
+def cached_convert_single_response(entry, base_name, output_prefix, file_start_number):
+    """Response convert_single dari output di result cache, None kalau file cache sudah tidak ada"""
+    stats = entry['extra']['stats']
+    if len(entry['extra']['segments']) == 1:
+        try:
+            response = send_result(entry, vcf_chunk_filename(base_name, output_prefix, file_start_number), 'text/vcard')
+        except OSError:
+            return None
+        return with_stats_header(response, stats)
+    
+    cached_files = cached_vcf_segments(entry, new_batch_id('single'), base_name, output_prefix, file_start_number)
+    if cached_files is None:
+        return None
+    files_info, stats = cached_files
+    return jsonify({
+        'success': True,
+        'multiple_files': True,
+        'total_files': len(files_info),
+        'total_contacts': sum(f['contacts'] for f in files_info),
+        'stats': stats,
+        'files': files_info
+    })
+
+def run_convert_single_job(progress, upload, name_prefix, contacts_per_file, output_prefix, file_start_number):
+    """Background job convert_single: hasil selalu disimpan sebagai file di temp storage"""
+    path, original_filename = upload
+    base_name = secure_filename(original_filename).rsplit('.', 1)[0]
+    batch_id = new_batch_id('single')
+    
+    try:
+        with open(path, 'rb') as stream:
+            digest = upload_digest(stream)
+        
+        cache_key, cached_result = lookup_result('convert_single', [digest], name_prefix=name_prefix,
+                                                 contacts_per_file=contacts_per_file)
+        cached_files = None
+        if cached_result is not None:
+            cached_files = cached_vcf_segments(cached_result, batch_id, base_name, output_prefix, file_start_number)
+        if cached_files is not None:
+            files_info, stats = cached_files
+            progress.add(lines=stats['total_lines'], contacts=stats['valid_contacts'])
+            return {
+                'total_files': len(files_info),
+                'total_contacts': sum(f['contacts'] for f in files_info),
+                'stats': stats,
+                'files': files_info
+            }
+        
+        output_path = temp_file_storage.new_path('.vcf')
+        try:
+            with open(path, 'rb') as stream:
+                cached = cached_txt_contacts(digest, name_prefix)
+                if cached is not None:
+                    vcf_contacts, stats = cached
+                    total_lines = stats['total_lines']
+                    progress.add(lines=total_lines)
+                    vcf_entries = vcf_contacts.iter_vcf()
+                else:
+                    stats = None
+                    total_lines = count_upload_lines(stream)
+                    vcf_entries = iter_txt_to_vcf(
+                        progress.track_lines(iter_upload_lines(stream)),
+                        name_prefix,
+                        contact_padding(total_lines),
+                        workers=parallel_workers(total_lines)
+                    )
+                segments = write_vcf_segments(progress.track_contacts(vcf_entries), contacts_per_file, output_path)
+        except Exception:
+            os.remove(output_path)
+            raise
+    finally:
+        remove_job_uploads([upload])
+    
+    if not segments:
+        os.remove(output_path)
+        raise ValueError('Tidak ada kontak valid ditemukan dalam file')
+    
+    total_contacts = sum(count for _, _, count in segments)
+    stats = stats or txt_stats(total_lines, total_contacts)
+    save_result(cache_key, 'text/vcard', path=output_path, segments=segments, stats=stats)
+    files_info = register_vcf_segments(output_path, segments, batch_id, base_name, output_prefix,
+                                       file_start_number)
+    return {
+        'total_files': len(files_info),
+        'total_contacts': total_contacts,
+        'stats': stats,
+        'files': files_info
+    }
+
+@app.route('/download_file/<file_id>')
+def download_file(file_id):
+    """Download individual file by ID"""
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        return error_response
+    
+    # Ambil dan clean up temp storage sekaligus
+    file_data = temp_file_storage.pop(file_id)
+    if file_data is None:
+        return jsonify({'error': 'File tidak ditemukan'}), 404
+    
+    return send_stored_file(file_data)
+
+@app.route('/download_zip')
+def download_zip():
+    """Download beberapa file hasil (file_id dipisah koma di ?ids=) sebagai 1 ZIP yang di-stream"""
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        return error_response
+    
+    # Ambil dan clean up temp storage sekaligus; file di disk tetap terbaca lewat handle
+    stored_files = []
+    for file_id in request.args.get('ids', '').split(','):
+        file_data = temp_file_storage.pop(file_id.strip()) if file_id.strip() else None
+        if file_data is not None:
+            stored_files.append((file_data['filename'], open_stored_file(file_data)))
+    if not stored_files:
+        return jsonify({'error': 'File tidak ditemukan'}), 404
+    
+    zip_filename = request.args.get('name', 'hasil').strip()
+    if not zip_filename.lower().endswith('.zip'):
+        zip_filename += '.zip'
+    entries = ((filename, iter_file(reader)) for filename, reader in stored_files)
+    return zip_response(entries, zip_filename, 'File tidak ditemukan')
+
+@app.route('/download')
+def download():
+    """Download file from temporary storage"""
+    # Check session validity
+    error_response = require_valid_session(return_json=False)
+    if error_response:
+        return error_response
+    
+    if 'download_file_id' not in session:
+        flash('File download tidak tersedia. Silakan proses ulang.', 'error')
+        return redirect(url_for('dashboard'))
+    
+    file_id = session['download_file_id']
+    
+    # Get data from temp storage (sekaligus dihapus dari storage)
+    file_data = temp_file_storage.pop(file_id)
+    if file_data is None:
+        flash('File sudah tidak tersedia. Silakan proses ulang.', 'error')
+        return redirect(url_for('dashboard'))
+    
+    # Clear session after download
+    session.pop('download_file_id', None)
+    
+    return send_stored_file(file_data)
+
+@app.route('/convert_multi', methods=['POST'])
+def convert_multi():
+    """Proses multi convert - beberapa file TXT masing-masing jadi 1 file VCF"""
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        return error_response
+    
+    files = request.files.getlist('txt_files')
+    if not files or len(files) == 0:
+        return jsonify({'error': 'Tidak ada file yang ditemukan'}), 400
+    
+    try:
+        # Ambil parameter
+        name_prefix = request.form.get('contact_name_prefix', '').strip()
+        filename_option = request.form.get('filename_option', 'original')
+        output_prefix = request.form.get('output_prefix', '').strip()
+        start_number = int(request.form.get('start_number', 1))
+        
+        logger.debug("convert_multi: files_count=%s, name_prefix=%r, filename_option=%r, output_prefix=%r, start_number=%s", len(files), name_prefix, filename_option, output_prefix, start_number)
+        
+        if wants_background():
+            uploads = save_job_uploads(files)
+            return submit_job('convert_multi', run_convert_multi_job, uploads,
+                              name_prefix, filename_option, output_prefix, start_number)
+        
+        # File dibaca saat akan diproses, diparse paralel per file (hasil tetap sesuai urutan upload)
+        uploads = ((i, file.filename, file.read()) for i, file in enumerate(files)
+                   if file.filename != '' and allowed_file(file.filename))
+        
+        if wants_zip():
+            def entries():
+                keyed_uploads = (((i, filename), data) for i, filename, data in uploads)
+                for (i, original_filename), parsed in parse_txt_uploads(keyed_uploads, name_prefix):
+                    vcf_contacts, _ = parsed
+                    if vcf_contacts:
+                        vcf_filename = multi_vcf_filename(i, original_filename, filename_option, output_prefix, start_number)
+                        yield vcf_filename, iter_joined(vcf_contacts.iter_vcf())
+            
+            return zip_response(entries(), 'vcf_files.zip', 'Tidak ada file yang berhasil diproses')
+        
+        # Process files and store in temp storage
+        batch_id = new_batch_id('multi')
+        files_info = [file_info for _, _, file_info in
+                      convert_txt_to_vcf_files(batch_id, uploads, name_prefix, filename_option, output_prefix, start_number)
+                      if file_info]
+        
+        if not files_info:
+            return jsonify({'error': 'Tidak ada file yang berhasil diproses'}), 400
+        
+        return jsonify({
+            'success': True,
+            'multiple_files': True,
+            'total_files': len(files_info),
+            'files': files_info
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
+
+def multi_vcf_filename(index, original_filename, filename_option, output_prefix, start_number):
+    """Nama file VCF hasil multi convert untuk file upload ke-index"""
+    if filename_option == 'custom' and output_prefix:
+        file_number = start_number + index
+        # Tambahkan spasi antara prefix dan angka
+        return f"{output_prefix} {file_number}.vcf"
+    original_name = secure_filename(original_filename)
+    base_name = original_name.rsplit('.', 1)[0]
+    return f"{base_name}.vcf"
+
+def convert_txt_to_vcf_files(batch_id, uploads, name_prefix, filename_option, output_prefix, start_number):
+    """Convert file-file TXT multi convert (index, nama file, isi upload bytes) ke VCF di temp storage.
+
+    Yield (index, isi upload, info file atau None) sesuai urutan uploads begitu file tersebut selesai;
+    file yang tidak ada di result cache diparse paralel per file (lihat parse_txt_uploads).
+    """
+    def lookups():
+        for i, original_filename, data in uploads:
+            file_id = f"{batch_id}_{i}"
+            vcf_filename = multi_vcf_filename(i, original_filename, filename_option, output_prefix, start_number)
+            cache_key, cached_result = lookup_result('txt_to_vcf', [content_digest(data)], name_prefix=name_prefix)
+            file_info = cached_file_info(file_id, vcf_filename, cached_result)
+            yield (i, data, file_id, vcf_filename, cache_key, file_info), (data if file_info is None else None)
+    
+    for (i, data, file_id, vcf_filename, cache_key, file_info), parsed in parse_txt_uploads(lookups(), name_prefix):
+        if parsed is not None:
+            file_info = store_txt_vcf_file(file_id, vcf_filename, cache_key, *parsed)
+        yield i, data, file_info
+
+def store_txt_vcf_file(file_id, vcf_filename, cache_key, vcf_contacts, stats):
+    """Simpan VCF hasil multi convert 1 file TXT di temp storage, return info file atau None kalau tidak ada kontak"""
+    if not vcf_contacts:
+        return None
+    
+    vcf_content = '\n'.join(vcf_contacts.iter_vcf())
+    
+    # Store file content in temp storage
+    size = store_result_file(file_id, vcf_filename, 'text/vcard', vcf_content, cache_key,
+                             contacts=len(vcf_contacts), stats=stats)
+    
+    return {
+        'file_id': file_id,
+        'filename': vcf_filename,
+        'size': size,
+        'contacts': len(vcf_contacts),
+        'stats': stats
+    }
+
+def run_convert_multi_job(progress, uploads, name_prefix, filename_option, output_prefix, start_number):
+    """Background job convert_multi"""
+    files_info = []
+    batch_id = new_batch_id('multi')
+    
+    try:
+        datas = ((i, original_filename, read_job_upload(path)) for i, (path, original_filename) in enumerate(uploads)
+                 if original_filename != '' and allowed_file(original_filename))
+        for _, data, file_info in convert_txt_to_vcf_files(batch_id, datas, name_prefix, filename_option,
+                                                           output_prefix, start_number):
+            progress.add(lines=data.count(b'\n') + 1, contacts=file_info['contacts'] if file_info else 0)
+            if file_info:
+                files_info.append(file_info)
+    finally:
+        remove_job_uploads(uploads)
+    
+    if not files_info:
+        raise ValueError('Tidak ada file yang berhasil diproses')
+    
+    return {
+        'total_files': len(files_info),
+        'files': files_info
+    }
+
+@app.route('/convert', methods=['POST'])
+def convert():
+    """Proses konversi TXT to VCF - ROUTE LAMA"""
+    logger.debug("User menggunakan route /convert LAMA!")
+    
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        return error_response
+    
+    if 'file' not in request.files:
+        return jsonify({'error': 'File tidak ditemukan'}), 400
+    
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'File tidak dipilih'}), 400
+    
+    if file and allowed_file(file.filename):
+        try:
+            # Ambil parameter tambahan
+            name_prefix = request.form.get('name_prefix', '').strip()
+            output_filename = request.form.get('output_filename', '').strip()
+            
+            # Parse ke VCF dengan prefix nama jika ada
+            vcf_contacts, stats = parse_txt_upload(file.read(), name_prefix)
+            
+            if not vcf_contacts:
+                return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file'}), 400
+            
+            # Buat file VCF
+            vcf_content = '\n'.join(vcf_contacts.iter_vcf())
+            
+            # Buat file untuk download
+            output = io.StringIO()
+            output.write(vcf_content)
+            output.seek(0)
+            
+            # Convert ke bytes
+            vcf_bytes = io.BytesIO()
+            vcf_bytes.write(vcf_content.encode('utf-8'))
+            vcf_bytes.seek(0)
+            
+            # Tentukan nama file output
+            if output_filename:
+                if not output_filename.lower().endswith('.vcf'):
+                    output_filename += '.vcf'
+                vcf_filename = secure_filename(output_filename)
+            else:
+                filename = secure_filename(file.filename)
+                vcf_filename = f"{filename.rsplit('.', 1)[0]}_contacts.vcf"
+            
+            return with_stats_header(send_file(
+                vcf_bytes,
+                as_attachment=True,
+                download_name=vcf_filename,
+                mimetype='text/vcard'
+            ), stats)
+            
+        except Exception as e:
+            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
+    
+    return jsonify({'error': 'Format file tidak didukung. Gunakan file .txt'}), 400
+
+@app.route('/split-txt')
+def split_txt():
+    """Halaman split TXT file"""
+    # Check session validity with tracking
+    redirect_response = require_valid_session()
+    if redirect_response:
+        return redirect_response
+    
+    return render_template('split_txt.html')
+
+@app.route('/split_txt', methods=['POST'])
+def split_txt_route():
+    """Split TXT file - individual downloads with simple naming"""
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        return error_response
+    
+    if 'file' not in request.files:
+        return jsonify({'error': 'File tidak ditemukan'}), 400
+    
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'File tidak dipilih'}), 400
+    
+    if file and allowed_file(file.filename):
+        try:
+            # Ambil parameter tambahan
+            split_count = int(request.form.get('split_count', 2))
+            output_prefix = request.form.get('output_prefix', '').strip()
+            
+            # Validasi split count
+            if split_count < 2 or split_count > 100:
+                return jsonify({'error': 'Jumlah split harus antara 2-100'}), 400
+            
+            # Jika tidak ada prefix, gunakan nama file tanpa ekstensi
+            if not output_prefix:
+                base_name = secure_filename(file.filename).rsplit('.', 1)[0]
+                output_prefix = base_name
+            
+            # Upload disimpan ke disk lalu di-mmap: tiap bagian hasil split adalah potongan byte file ini
+            # (di-link ke temp storage tanpa copy), ukuran dan jumlah baris didapat dari offset newline
+            path = temp_file_storage.new_path('.txt')
+            file.save(path)
+            try:
+                total_size = os.path.getsize(path)
+                with map_file(path) as buf:
+                    end = clean_txt_end(buf)
+                if end is None:
+                    # Ada baris kosong / whitespace / CRLF / byte invalid: tulis ulang baris yang sudah di-strip dulu
+                    original_path, path = path, temp_file_storage.new_path('.txt')
+                    try:
+                        with open(original_path, 'rb') as source, open(path, 'wb') as output:
+                            _, total_size = normalize_txt_lines(source, output)
+                    finally:
+                        os.remove(original_path)
+                
+                with map_file(path) as buf:
+                    if end is None:
+                        end = len(buf)
+                    original_lines = count_buffer_lines(buf, 0, end) if end else 0
+                    
+                    if not original_lines:
+                        return jsonify({'error': 'File kosong atau tidak ada baris yang valid'}), 400
+                    
+                    # Hitung baris per file, file terakhir dapat berisi sisa baris
+                    lines_per_file = max(1, original_lines // split_count)
+                    segments = txt_line_segments(buf, lines_per_file, split_count, end)
+                
+                # Store files in temp storage untuk download individual
+                file_ids = []
+                batch_id = new_batch_id('split')
+                
+                for i, (offset, size, lines) in enumerate(segments, 1):
+                    # Format nama sederhana: "kintil 1.txt", "kintil 2.txt", dll
+                    chunk_filename = f"{output_prefix} {i}.txt"
+                    file_id = f"{batch_id}_{i}"
+                    
+                    temp_file_storage.put_range(file_id, chunk_filename, 'text/plain', path, offset, size)
+                    
+                    file_ids.append({
+                        'id': file_id,
+                        'filename': chunk_filename,
+                        'size': size,
+                        'lines': lines
+                    })
+            finally:
+                os.remove(path)
+            
+            return jsonify({
+                'success': True,
+                'message': f'File berhasil di-split menjadi {len(segments)} bagian',
+                'original_filename': file.filename,
+                'original_lines': original_lines,
+                'total_size': total_size,
+                'split_count': len(segments),
+                'prefix_name': output_prefix,
+                'files': file_ids
+            })
+            
+        except Exception as e:
+            logger.exception("Error in split_txt_route")
+            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
+    
+    return jsonify({'error': 'Format file tidak didukung. Gunakan file .txt'}), 400
+
+@app.route('/split', methods=['POST'])
+def split():
+    """Proses split TXT file"""
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        return error_response
+    
+    if 'file' not in request.files:
+        return jsonify({'error': 'File tidak ditemukan'}), 400
+    
+    file = request.files['file']
+    chunk_size = request.form.get('chunk_size', '1000')
+    
+    try:
+        chunk_size = int(chunk_size)
+        if chunk_size <= 0:
+            return jsonify({'error': 'Ukuran chunk harus lebih dari 0'}), 400
+    except ValueError:
+        return jsonify({'error': 'Ukuran chunk harus berupa angka'}), 400
+    
+    if file.filename == '':
+        return jsonify({'error': 'File tidak dipilih'}), 400
+    
+    if file and allowed_file(file.filename):
+        try:
+            # Upload disimpan ke disk lalu di-mmap: bagian = potongan byte per chunk_size baris, tanpa decode / join
+            path = temp_file_storage.new_path('.txt')
+            file.save(path)
+            try:
+                with map_file(path) as buf:
+                    validate_utf8(buf)
+                    segments = txt_line_segments(buf, chunk_size)
+            except Exception:
+                os.remove(path)
+                raise
+            
+            # Stream ZIP file, entry ditulis satu per satu
+            filename = secure_filename(file.filename)
+            base_name = filename.rsplit('.', 1)[0]
+            entries = iter_file_segments(path, (f"{base_name}_part_{i}.txt" for i in range(1, len(segments) + 1)),
+                                         segments)
+            
+            return zip_response(entries, f"{base_name}_split.zip", 'File kosong atau tidak bisa di-split')
+            
+        except Exception as e:
+            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
+    
+    return jsonify({'error': 'Format file tidak didukung. Gunakan file .txt'}), 400
+
+# ========================
+# VCF TO TXT ROUTES
+# ========================
+
+@app.route('/vcf-to-txt')
+def vcf_to_txt():
+    """Halaman converter VCF to TXT"""
+    logger.debug("Accessing /vcf-to-txt route")
+    
+    # Check session validity with tracking
+    redirect_response = require_valid_session()
+    if redirect_response:
+        return redirect_response
+    
+    logger.debug("Rendering vcf_to_txt.html template")
+    return render_template('vcf_to_txt.html')
+
+@app.route('/convert_vcf_single', methods=['POST'])
+def convert_vcf_single():
+    """Proses single VCF convert - 1 file VCF diextract ke 1 file TXT"""
+    logger.debug("convert_vcf_single called")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("request.files keys: %s", list(request.files.keys()))
+        logger.debug("request.form keys: %s", list(request.form.keys()))
+    
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        logger.debug("Session validation failed")
+        return error_response
+    
+    if 'vcf_file' not in request.files:
+        logger.debug("vcf_file not in request.files")
+        return jsonify({'error': 'File tidak ditemukan'}), 400
+    
+    file = request.files['vcf_file']
+    if file.filename == '':
+        logger.debug("file.filename is empty")
+        return jsonify({'error': 'File tidak dipilih'}), 400
+    
+    if file and file.filename.lower().endswith('.vcf'):
+        try:
+            # Baca isi file
+            data = file.read()
+            
+            # Ambil parameter
+            output_format = request.form.get('output_format', 'comma')
+            output_prefix = request.form.get('output_prefix', '').strip()
+            
+            # Generate filename
+            filename = secure_filename(file.filename)
+            base_name = filename.rsplit('.', 1)[0]
+            
+            if output_prefix:
+                txt_filename = f"{output_prefix}.txt"
+            else:
+                txt_filename = f"{base_name}.txt"
+            
+            cache_key, cached_result = lookup_result('vcf_to_txt', [content_digest(data)], output_format=output_format)
+            if cached_result is not None:
+                try:
+                    return send_result(cached_result, txt_filename, 'text/plain; charset=utf-8')
+                except OSError:
+                    pass
+            
+            # Parse VCF ke TXT
+            txt_contacts = vcf_to_contacts(data.decode('utf-8'))
+            
+            if not txt_contacts:
+                return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file VCF'}), 400
+            
+            # Generate TXT content
+            txt_content = '\n'.join(txt_contacts.iter_txt(output_format))
+            save_result(cache_key, 'text/plain', content=txt_content, contacts=len(txt_contacts))
+            
+            response = make_response(txt_content)
+            response.headers['Content-Type'] = 'text/plain; charset=utf-8'
+            response.headers['Content-Disposition'] = f'attachment; filename="{txt_filename}"'
+            return response
+            
+        except Exception as e:
+            return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
+    
+    return jsonify({'error': 'Format file tidak didukung. Gunakan file .vcf'}), 400
+
+@app.route('/convert_vcf_multi', methods=['POST'])
+def convert_vcf_multi():
+    """Proses multi VCF convert - multiple file VCF diextract ke multiple TXT"""
+    logger.debug("convert_vcf_multi called")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("request.files keys: %s", list(request.files.keys()))
+        logger.debug("request.form keys: %s", list(request.form.keys()))
+    
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        logger.debug("Session validation failed")
+        return error_response
+    
+    if 'vcf_files' not in request.files:
+        logger.debug("vcf_files not in request.files")
+        return jsonify({'error': 'File tidak ditemukan'}), 400
+    
+    files = request.files.getlist('vcf_files')
+    if not files or len(files) == 0:
+        logger.debug("files is empty")
+        return jsonify({'error': 'File tidak dipilih'}), 400
+    
+    try:
+        # Ambil parameter
+        output_format = request.form.get('output_format', 'comma')
+        output_prefix = request.form.get('output_prefix', '').strip()
+        merge_files = request.form.get('merge_files') == 'true'
+        
+        if wants_background():
+            uploads = save_job_uploads(files)
+            return submit_job('convert_vcf_multi', run_convert_vcf_multi_job, uploads,
+                              output_format, output_prefix, merge_files)
+        
+        # File dibaca saat akan diproses, diparse paralel per file (hasil tetap sesuai urutan upload)
+        uploads = ((i, file.filename, file.read()) for i, file in enumerate(files)
+                   if file.filename != '' and file.filename.lower().endswith('.vcf'))
+        
+        if wants_zip() and not merge_files:
+            def entries():
+                for original_filename, txt_contacts in parse_vcf_uploads((filename, data) for _, filename, data in uploads):
+                    if txt_contacts:
+                        yield vcf_txt_filename(original_filename, output_prefix), iter_joined(txt_contacts.iter_txt(output_format))
+            
+            return zip_response(entries(), 'txt_files.zip', 'Tidak ada kontak valid ditemukan dalam file VCF')
+        
+        if merge_files:
+            # Gabungkan semua kontak ke 1 file setelah semua file terbaca
+            merge_datas = [data for _, _, data in uploads]
+            response = merged_txt_response(merge_datas, output_format, output_prefix) if merge_datas else None
+            if response is not None:
+                return response
+            return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file VCF'}), 400
+        
+        # Buat file terpisah
+        batch_id = new_batch_id('vcf_multi')
+        files_info = [file_info for _, _, file_info in
+                      convert_vcf_to_txt_files(batch_id, uploads, output_format, output_prefix)
+                      if file_info]
+        
+        if files_info:
+            # Return multiple files info
+            return jsonify({
+                'success': True,
+                'multiple_files': True,
+                'total_files': len(files_info),
+                'total_contacts': sum(f['contacts'] for f in files_info),
+                'files': files_info
+            })
+        
+        return jsonify({'error': 'Tidak ada kontak valid ditemukan dalam file VCF'}), 400
+            
+    except Exception as e:
+        return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
+
+def merged_txt_filename(output_prefix):
+    """Nama file TXT hasil gabungan multi VCF"""
+    if output_prefix:
+        return f"{output_prefix}.txt"
+    return "merged_contacts.txt"
+
+def vcf_txt_filename(original_filename, output_prefix):
+    """Nama file TXT hasil VCF to TXT untuk 1 file upload"""
+    filename = secure_filename(original_filename)
+    base_name = filename.rsplit('.', 1)[0]
+    
+    if output_prefix:
+        return f"{output_prefix}_{base_name}.txt"
+    return f"{base_name}.txt"
+
+def convert_vcf_to_txt_files(batch_id, uploads, output_format, output_prefix):
+    """Convert file-file VCF multi convert (index, nama file, isi upload bytes) ke TXT di temp storage.
+
+    Yield (index, isi upload, info file atau None) sesuai urutan uploads begitu file tersebut selesai;
+    file yang tidak ada di result cache diparse paralel per file (lihat parse_vcf_uploads).
+    """
+    def lookups():
+        for i, original_filename, data in uploads:
+            file_id = f"{batch_id}_{i}"
+            txt_filename = vcf_txt_filename(original_filename, output_prefix)
+            cache_key, cached_result = lookup_result('vcf_to_txt', [content_digest(data)], output_format=output_format)
+            file_info = cached_file_info(file_id, txt_filename, cached_result)
+            yield (i, data, file_id, txt_filename, cache_key, file_info), (data if file_info is None else None)
+    
+    for (i, data, file_id, txt_filename, cache_key, file_info), txt_contacts in parse_vcf_uploads(lookups()):
+        if txt_contacts is not None:
+            file_info = store_vcf_txt_file(file_id, txt_filename, cache_key, txt_contacts, output_format)
+        yield i, data, file_info
+
+def store_vcf_txt_file(file_id, txt_filename, cache_key, txt_contacts, output_format):
+    """Simpan TXT hasil convert 1 file VCF di temp storage, return info file atau None kalau tidak ada kontak"""
+    if not txt_contacts:
+        return None
+    
+    txt_content = '\n'.join(txt_contacts.iter_txt(output_format))
+    
+    # Store file content in temp storage
+    size = store_result_file(file_id, txt_filename, 'text/plain', txt_content, cache_key, contacts=len(txt_contacts))
+    
+    return {
+        'file_id': file_id,
+        'filename': txt_filename,
+        'size': size,
+        'contacts': len(txt_contacts)
+    }
+
+def vcf_uploads_contacts(datas):
+    """Semua kontak dari beberapa isi upload VCF (bytes), digabung sesuai urutan file"""
+    all_contacts = ContactList()
+    for _, contacts in parse_vcf_uploads((None, data) for data in datas):
+        all_contacts.extend(contacts)
+    return all_contacts
+
+def merged_txt_response(datas, output_format, output_prefix):
+    """Response download TXT gabungan multi VCF (dari result cache kalau ada), None kalau tidak ada kontak"""
+    txt_filename = merged_txt_filename(output_prefix)
+    cache_key, cached_result = lookup_result('vcf_to_txt_merged', [content_digest(data) for data in datas],
+                                             output_format=output_format)
+    if cached_result is not None:
+        try:
+            return send_result(cached_result, txt_filename, 'text/plain; charset=utf-8')
+        except OSError:
+            pass
+    
+    all_contacts = vcf_uploads_contacts(datas)
+    if not all_contacts:
+        return None
+    
+    txt_content = '\n'.join(all_contacts.iter_txt(output_format))
+    save_result(cache_key, 'text/plain', content=txt_content, contacts=len(all_contacts))
+    
+    response = make_response(txt_content)
+    response.headers['Content-Type'] = 'text/plain; charset=utf-8'
+    response.headers['Content-Disposition'] = f'attachment; filename="{txt_filename}"'
+    return response
+
+def store_merged_txt_file(file_id, datas, output_format, output_prefix):
+    """Simpan TXT gabungan multi VCF di temp storage (dari result cache kalau ada), return info file atau None"""
+    txt_filename = merged_txt_filename(output_prefix)
+    cache_key, cached_result = lookup_result('vcf_to_txt_merged', [content_digest(data) for data in datas],
+                                             output_format=output_format)
+    file_info = cached_file_info(file_id, txt_filename, cached_result)
+    if file_info is not None:
+        return file_info
+    
+    all_contacts = vcf_uploads_contacts(datas)
+    if not all_contacts:
+        return None
+    
+    txt_content = '\n'.join(all_contacts.iter_txt(output_format))
+    size = store_result_file(file_id, txt_filename, 'text/plain', txt_content, cache_key, contacts=len(all_contacts))
+    return {
+        'file_id': file_id,
+        'filename': txt_filename,
+        'size': size,
+        'contacts': len(all_contacts)
+    }
+
+def run_convert_vcf_multi_job(progress, uploads, output_format, output_prefix, merge_files):
+    """Background job convert_vcf_multi (mode gabung menghasilkan 1 file)"""
+    merge_datas = []
+    files_info = []
+    batch_id = new_batch_id('vcf_multi')
+    
+    try:
+        datas = ((i, original_filename, read_job_upload(path)) for i, (path, original_filename) in enumerate(uploads)
+                 if original_filename != '' and original_filename.lower().endswith('.vcf'))
+        if merge_files:
+            for _, _, data in datas:
+                merge_datas.append(data)
+                progress.add(lines=data.count(b'\n') + 1)
+        else:
+            for _, data, file_info in convert_vcf_to_txt_files(batch_id, datas, output_format, output_prefix):
+                progress.add(lines=data.count(b'\n') + 1, contacts=file_info['contacts'] if file_info else 0)
+                if file_info:
+                    files_info.append(file_info)
+    finally:
+        remove_job_uploads(uploads)
+    
+    if merge_files and merge_datas:
+        file_info = store_merged_txt_file(f"{batch_id}_merged", merge_datas, output_format, output_prefix)
+        if file_info:
+            progress.add(contacts=file_info['contacts'])
+            files_info.append(file_info)
+    
+    if not files_info:
+        raise ValueError('Tidak ada kontak valid ditemukan dalam file VCF')
+    
+    return {
+        'total_files': len(files_info),
+        'total_contacts': sum(f['contacts'] for f in files_info),
+        'files': files_info
+    }
+
+# ========================
+# ADMIN & NAVY ROUTES
+# ========================
+
+@app.route('/gabung-vcf')
+def gabung_vcf():
+    return render_template('gabung_vcf.html')
+
+@app.route('/gabung_vcf_files', methods=['POST'])
+def gabung_vcf_files():
+    try:
+        if 'vcf_files' not in request.files:
+            return jsonify({'error': 'No files uploaded'}), 400
+        
+        uploaded_files = request.files.getlist('vcf_files')
+        
+        if not uploaded_files or len(uploaded_files) < 2:
+            return jsonify({'error': 'Please upload at least 2 VCF files'}), 400
+        
+        # Quick validation - check file extensions only
+        for file in uploaded_files:
+            if not file.filename.lower().endswith('.vcf'):
+                return jsonify({'error': f'File {file.filename} is not a VCF file'}), 400
+        
+        # Get form data
+        contact_name_prefix = request.form.get('contact_name', 'Gabung').strip()
+        output_filename = request.form.get('output_filename', 'merged_contacts').strip()
+        
+        if not contact_name_prefix:
+            contact_name_prefix = 'Gabung'
+        
+        if not output_filename:
+            output_filename = 'merged_contacts'
+        
+        # Buang nomor duplikat (E.164 sama) antar / dalam file
+        dedupe = request.form.get('dedupe') == 'true'
+        sort_by = merge_sort_by()
+        external = wants_external_merge(sort_by)
+        phone_mode = merge_phone_mode()
+        
+        if wants_background():
+            uploads = save_job_uploads(uploaded_files)
+            return submit_job('gabung_vcf_files', run_gabung_vcf_job, uploads, contact_name_prefix, output_filename,
+                              dedupe, sort_by, external, phone_mode)
+        
+        # Jumlah nomor per file dihitung sekalian saat merge (1x tokenize per file)
+        phone_counts = []
+        duplicates = [] if dedupe else None
+        
+        if external:
+            filenames = [file.filename for file in uploaded_files]
+            file_id, merged_count = store_merged_vcf_external(
+                [file.stream for file in uploaded_files], contact_name_prefix, output_filename, sort_by,
+                phone_counts, duplicates, phone_mode
+            )
+        else:
+            # Read and process all VCF files - Optimized
+            vcf_datas = []
+            filenames = []
+            
+            for file in uploaded_files:
+                try:
+                    vcf_datas.append(file.read())
+                    filenames.append(file.filename)
+                except Exception as e:
+                    logger.warning("Error reading file %s: %s", file.filename, e)
+                    continue
+            
+            if not vcf_datas:
+                return jsonify({'error': 'No valid VCF content found'}), 400
+            
+            file_id, merged_count = store_merged_vcf(vcf_datas, contact_name_prefix, output_filename, phone_counts,
+                                                     duplicates, phone_mode)
+        
+        if not file_id:
+            return jsonify({'error': 'No valid contacts found in uploaded files'}), 400
+        
+        # Store only file ID in session
+        session['download_file_id'] = file_id
+        
+        # Create summary
+        original_stats = vcf_file_stats(filenames, phone_counts, duplicates)
+        total_original_contacts = sum(stat['contacts'] for stat in original_stats)
+        
+        return jsonify({
+            'success': True,
+            'message': f'Successfully merged {len(uploaded_files)} VCF files',
+            'original_files': original_stats,
+            'total_original_contacts': total_original_contacts,
+            'merged_contacts': merged_count,
+            'duplicates_removed': sum(duplicates) if dedupe else 0,
+            'contact_name_prefix': contact_name_prefix,
+            'sort_by': sort_by,
+            'phone_mode': phone_mode,
+            'output_filename': f"{output_filename}.vcf",
+            'download_url': '/download'
+        })
+        
+    except Exception as e:
+        logger.exception("Error in gabung_vcf_files")
+        return jsonify({'error': f'Error processing files: {str(e)}'}), 500
+
+def vcf_file_stats(filenames, phone_counts, duplicates=None):
+    """Statistik per file VCF untuk summary gabung (plus jumlah duplikat yang dibuang kalau dedupe aktif)"""
+    stats = [{'filename': filename, 'contacts': count} for filename, count in zip(filenames, phone_counts)]
+    if duplicates is not None:
+        for stat, count in zip(stats, duplicates):
+            stat['duplicates'] = count
+    return stats
+
+def store_merged_vcf(vcf_datas, contact_name_prefix, output_filename, phone_counts=None, duplicates=None,
+                     phone_mode=MERGE_PHONE_MODE):
+    """Gabung isi VCF (bytes upload) dan simpan di temp storage, return (file_id, jumlah kontak) atau (None, 0)
+
+    Kalau duplicates diberikan, nomor duplikat dibuang dan jumlahnya per file ditambahkan ke list itu.
+    """
+    # Store in temp storage instead of session (to avoid cookie size limit)
+    file_id = f"gabung_vcf_{int(time.time())}_{str(uuid.uuid4())[:8]}"
+    filename = f"{output_filename}.vcf"
+    
+    # sort_by='' : hasil sama dengan gabung external tanpa sort, entry cache dipakai bersama
+    cache_key, cached_result = lookup_result('gabung_vcf', [content_digest(data) for data in vcf_datas],
+                                             contact_name_prefix=contact_name_prefix, dedupe=duplicates is not None,
+                                             sort_by='', phone_mode=phone_mode)
+    cached = cached_merged_vcf(file_id, filename, cached_result, phone_counts, duplicates)
+    if cached is not None:
+        return cached
+    
+    # Merge VCF files - Optimized function
+    vcf_contents = [data.decode('utf-8', errors='ignore') for data in vcf_datas]  # Ignore encoding errors
+    counts = []
+    dropped = [] if duplicates is not None else None
+    merged_contacts = merge_vcf_contacts(vcf_contents, contact_name_prefix, counts, dropped, phone_mode)
+    if phone_counts is not None:
+        phone_counts.extend(counts)
+    if duplicates is not None:
+        duplicates.extend(dropped)
+    
+    if not merged_contacts:
+        return None, 0
+    
+    # Create final VCF content
+    final_vcf_content = '\n\n'.join(merged_contacts.iter_vcf())  # Add spacing between contacts
+    
+    store_result_file(file_id, filename, 'text/vcard', final_vcf_content, cache_key,
+                      contacts=len(merged_contacts), phone_counts=counts, duplicates=dropped)
+    
+    return file_id, len(merged_contacts)
+
+def cached_merged_vcf(file_id, filename, entry, phone_counts=None, duplicates=None):
+    """(file_id, jumlah kontak) hasil gabung VCF dari result cache, None kalau tidak ada di cache"""
+    file_info = cached_file_info(file_id, filename, entry)
+    if file_info is None:
+        return None
+    if phone_counts is not None:
+        phone_counts.extend(file_info['phone_counts'])
+    if duplicates is not None:
+        duplicates.extend(file_info['duplicates'])
+    return file_id, file_info['contacts']
+
+def store_merged_vcf_external(streams, contact_name_prefix, output_filename, sort_by='', phone_counts=None,
+                              duplicates=None, phone_mode=MERGE_PHONE_MODE):
+    """Seperti store_merged_vcf, tapi upload (stream biner) dibaca satu per satu lewat external sort
+    dan hasilnya langsung ditulis ke disk, jadi memori tidak tergantung ukuran upload
+    """
+    file_id = f"gabung_vcf_{int(time.time())}_{str(uuid.uuid4())[:8]}"
+    filename = f"{output_filename}.vcf"
+    
+    cache_key, cached_result = lookup_result('gabung_vcf', [upload_digest(stream) for stream in streams],
+                                             contact_name_prefix=contact_name_prefix, dedupe=duplicates is not None,
+                                             sort_by=sort_by, phone_mode=phone_mode)
+    cached = cached_merged_vcf(file_id, filename, cached_result, phone_counts, duplicates)
+    if cached is not None:
+        return cached
+    
+    counts = []
+    dropped = [] if duplicates is not None else None
+    path = temp_file_storage.new_path('.vcf')
+    try:
+        with open(path, 'wb') as output:
+            merged_count = external_merge_vcf(streams, output, contact_name_prefix, sort_by, counts, dropped,
+                                              temp_file_storage.folder, phone_mode)
+        if phone_counts is not None:
+            phone_counts.extend(counts)
+        if duplicates is not None:
+            duplicates.extend(dropped)
+        if not merged_count:
+            os.remove(path)
+            return None, 0
+        store_result_path(file_id, filename, 'text/vcard', path, cache_key,
+                          contacts=merged_count, phone_counts=counts, duplicates=dropped)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    
+    return file_id, merged_count
+
+def run_gabung_vcf_job(progress, uploads, contact_name_prefix, output_filename, dedupe=False, sort_by='',
+                       external=False, phone_mode=MERGE_PHONE_MODE):
+    """Background job gabung_vcf_files"""
+    phone_counts = []
+    duplicates = [] if dedupe else None
+    
+    if external:
+        try:
+            with ExitStack() as stack:
+                streams = [stack.enter_context(open(path, 'rb')) for path, _ in uploads]
+                file_id, merged_count = store_merged_vcf_external(streams, contact_name_prefix, output_filename,
+                                                                  sort_by, phone_counts, duplicates, phone_mode)
+        finally:
+            remove_job_uploads(uploads)
+    else:
+        vcf_datas = []
+        
+        try:
+            for path, _ in uploads:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                vcf_datas.append(data)
+                progress.add(lines=data.count(b'\n') + 1)
+        finally:
+            remove_job_uploads(uploads)
+        
+        file_id, merged_count = store_merged_vcf(vcf_datas, contact_name_prefix, output_filename, phone_counts,
+                                                 duplicates, phone_mode)
+    progress.add(contacts=sum(phone_counts))
+    
+    if not file_id:
+        raise ValueError('No valid contacts found in uploaded files')
+    
+    original_stats = vcf_file_stats([filename for _, filename in uploads], phone_counts, duplicates)
+    return {
+        'original_files': original_stats,
+        'total_original_contacts': sum(stat['contacts'] for stat in original_stats),
+        'merged_contacts': merged_count,
+        'duplicates_removed': sum(duplicates) if dedupe else 0,
+        'sort_by': sort_by,
+        'phone_mode': phone_mode,
+        'files': [{
+            'file_id': file_id,
+            'filename': f"{output_filename}.vcf",
+            'size': temp_file_storage.get(file_id)['size'],
+            'contacts': merged_count
+        }]
+    }
+
+@app.route('/admin-navy')
+def admin_navy():
+    """Halaman converter Admin & Navy"""
+    logger.debug("Accessing /admin-navy route")
+    
+    # Check session validity with tracking
+    redirect_response = require_valid_session()
+    if redirect_response:
+        return redirect_response
+    
+    logger.debug("Rendering admin_navy.html template")
+    return render_template('admin_navy.html')
+
+@app.route('/convert_admin_navy', methods=['POST'])
+def convert_admin_navy():
+    """Proses konversi Admin & Navy numbers ke VCF"""
+    logger.debug("convert_admin_navy called")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("request.form keys: %s", list(request.form.keys()))
+    
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        logger.debug("Session validation failed")
+        return error_response
+    
+    try:
+        # Ambil parameter dari form - sesuai dengan template baru
+        admin_numbers = request.form.get('admin_numbers', '').strip()
+        navy_numbers = request.form.get('navy_numbers', '').strip()
+        admin_name_prefix = request.form.get('admin_name_prefix', 'Admin').strip()
+        navy_name_prefix = request.form.get('navy_name_prefix', 'Navy').strip()
+        admin_start_number = int(request.form.get('admin_start_number', 1))
+        navy_start_number = int(request.form.get('navy_start_number', 1))
+        output_filename = request.form.get('output_filename', '').strip()
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("admin_numbers length: %s", len(admin_numbers.split()) if admin_numbers else 0)
+            logger.debug("navy_numbers length: %s", len(navy_numbers.split()) if navy_numbers else 0)
+        logger.debug("admin_name_prefix: %r", admin_name_prefix)
+        logger.debug("navy_name_prefix: %r", navy_name_prefix)
+        logger.debug("admin_start_number: %s", admin_start_number)
+        logger.debug("navy_start_number: %s", navy_start_number)
+        logger.debug("output_filename: %r", output_filename)
+        
+        # Validasi input
+        if not admin_numbers and not navy_numbers:
+            return jsonify({'error': 'Minimal salah satu nomor (admin atau navy) harus diisi'}), 400
+        
+        # Validasi nama kontak
+        if admin_numbers and not admin_name_prefix:
+            admin_name_prefix = 'Admin'
+        if navy_numbers and not navy_name_prefix:
+            navy_name_prefix = 'Navy'
+        
+        # Parse ke VCF dengan fungsi yang mendukung start number
+        vcf_contacts = admin_navy_contacts(
+            admin_numbers, 
+            navy_numbers, 
+            admin_name_prefix, 
+            navy_name_prefix,
+            admin_start_number,
+            navy_start_number
+        )
+        
+        if not vcf_contacts:
+            return jsonify({'error': 'Tidak ada nomor valid ditemukan'}), 400
+        
+        # Generate VCF content
+        vcf_content = '\n'.join(vcf_contacts.iter_vcf())
+        
+        # Generate filename
+        if output_filename:
+            if not output_filename.lower().endswith('.vcf'):
+                output_filename += '.vcf'
+            vcf_filename = secure_filename(output_filename)
+        else:
+            vcf_filename = "admin_navy_contacts.vcf"
+        
+        logger.debug("Generated %s contacts, filename: %s", len(vcf_contacts), vcf_filename)
+        
+        response = make_response(vcf_content)
+        response.headers['Content-Type'] = 'text/vcard'
+        response.headers['Content-Disposition'] = f'attachment; filename="{vcf_filename}"'
+        return response
+        
+    except Exception as e:
+        logger.exception("Error in convert_admin_navy")
+        return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
+
+# ========================
+# GABUNG TXT ROUTES
+# ========================
+
+@app.route('/gabung-txt')
+def gabung_txt():
+    """Halaman gabung multiple TXT files"""
+    logger.debug("Accessing /gabung-txt route")
+    
+    # Check session validity with tracking
+    redirect_response = require_valid_session()
+    if redirect_response:
+        return redirect_response
+    
+    logger.debug("Rendering gabung_txt.html template")
+    return render_template('gabung_txt.html')
+
+@app.route('/gabung_txt_files', methods=['POST'])
+def gabung_txt_files():
+    """Proses gabung multiple TXT files menjadi 1 file TXT"""
+    logger.debug("gabung_txt_files called")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("request.files keys: %s", list(request.files.keys()))
+        logger.debug("request.form keys: %s", list(request.form.keys()))
+    
+    # Check session validity with tracking
+    error_response = require_valid_session(return_json=True)
+    if error_response:
+        logger.debug("Session validation failed")
+        return error_response
+    
+    if 'txt_files' not in request.files:
+        logger.debug("txt_files not in request.files")
+        return jsonify({'error': 'File tidak ditemukan'}), 400
+    
+    files = request.files.getlist('txt_files')
+    if not files or len(files) < 2:
+        logger.debug("Not enough files: %s", len(files) if files else 0)
+        return jsonify({'error': 'Minimal 2 file TXT diperlukan untuk digabung'}), 400
+    
+    try:
+        # Ambil parameter
+        output_filename = request.form.get('output_filename', '').strip()
+        separator_option = request.form.get('separator_option', 'none')
+        custom_separator = request.form.get('custom_separator', '').strip()
+        add_filename_headers = request.form.get('add_filename_headers') == 'true'
+        dedupe = request.form.get('dedupe') == 'true'
+        sort_by = merge_sort_by()
+        external = wants_external_merge(sort_by)
+        
+        logger.debug("output_filename: %r", output_filename)
+        logger.debug("separator_option: %r", separator_option)
+        logger.debug("custom_separator: %r", custom_separator)
+        logger.debug("add_filename_headers: %s", add_filename_headers)
+        logger.debug("dedupe: %s", dedupe)
+        logger.debug("sort_by: %r, external: %s", sort_by, external)
+        logger.debug("files_count: %s", len(files))
+        
+        # Validasi nama file output
+        if not output_filename:
+            output_filename = "merged_files"
+        
+        valid_files = [f for f in files if f.filename != '' and allowed_file(f.filename)]
+        
+        if wants_background():
+            uploads = save_job_uploads(valid_files)
+            return submit_job('gabung_txt_files', run_gabung_txt_job, uploads, output_filename,
+                              separator_option, custom_separator, add_filename_headers, dedupe, sort_by, external)
+        
+        if external:
+            duplicates = [] if dedupe else None
+            named_streams = [(file.filename, file.stream) for file in valid_files]
+            path, processed_files = write_external_merged_txt(
+                named_streams, separator_option, custom_separator, add_filename_headers, sort_by, duplicates
+            )
+            if processed_files < 2:
+                os.remove(path)
+                return jsonify({'error': 'Minimal 2 file berhasil diproses diperlukan untuk digabung'}), 400
+            
+            response = send_temp_file(path, merged_txt_output_filename(output_filename), 'text/plain')
+            if dedupe:
+                with_stats_header(response, txt_dedupe_stats([filename for filename, _ in named_streams], duplicates))
+            return response
+        
+        # Process files and merge content
+        named_contents = []
+        for file in valid_files:
+            try:
+                # Baca isi file
+                named_contents.append((file.filename, decode_txt_upload(file.read())))
+            except Exception as e:
+                logger.warning("Error processing file %s: %s", file.filename, e)
+                continue
+        
+        duplicates = [] if dedupe else None
+        merged_content, processed_files = merge_txt_contents(
+            named_contents, len(valid_files), separator_option, custom_separator, add_filename_headers, duplicates
+        )
+        
+        if processed_files < 2:
+            return jsonify({'error': 'Minimal 2 file berhasil diproses diperlukan untuk digabung'}), 400
+        
+        # Generate final merged content
+        final_content = '\n'.join(merged_content)
+        
+        final_filename = merged_txt_output_filename(output_filename)
+        
+        logger.debug("Generated merged file - %s files processed, filename: %s", processed_files, final_filename)
+        logger.debug("Content length: %s characters", len(final_content))
+        
+        response = make_response(final_content)
+        response.headers['Content-Type'] = 'text/plain; charset=utf-8'
+        response.headers['Content-Disposition'] = f'attachment; filename="{final_filename}"'
+        if dedupe:
+            with_stats_header(response, txt_dedupe_stats([filename for filename, _ in named_contents], duplicates))
+        return response
+        
+    except Exception as e:
+        logger.exception("Error in gabung_txt_files")
+        return jsonify({'error': f'Terjadi kesalahan: {str(e)}'}), 500
+
+def decode_txt_upload(raw):
+    """Decode isi file TXT (utf-8, fallback latin-1) dan strip"""
+    try:
+        return raw.decode('utf-8').strip()
+    except UnicodeDecodeError:
+        # Coba dengan encoding lain
+        return raw.decode('latin-1').strip()
+
+def txt_separator_lines(separator_option, custom_separator):
+    """Baris separator yang disisipkan antar file saat gabung TXT"""
+    if separator_option == 'newline':
+        return ['']  # Baris kosong
+    elif separator_option == 'double_newline':
+        return ['', '']  # 2 baris kosong
+    elif separator_option == 'dash':
+        return ['---']
+    elif separator_option == 'custom' and custom_separator:
+        return [custom_separator]
+    return []
+
+def merge_txt_contents(named_contents, total_files, separator_option, custom_separator, add_filename_headers,
+                       duplicates=None):
+    """Gabung isi beberapa file TXT, return (list baris/blok, jumlah file yang diproses)
+
+    Kalau duplicates diberikan, baris yang nomornya (E.164) sudah ada di baris / file sebelumnya
+    dibuang dan jumlahnya per file ditambahkan ke list itu.
+    """
+    merged_content = []
+    processed_files = 0
+    separator_lines = txt_separator_lines(separator_option, custom_separator)
+    dedupe = None
+    if duplicates is not None:
+        dedupe = create_dedupe(sum(content.count('\n') + 1 for _, content in named_contents if content))
+    
+    try:
+        for filename, content in named_contents:
+            if not content:  # Hanya proses jika ada content
+                if dedupe is not None:
+                    duplicates.append(0)
+                continue
+            
+            if dedupe is not None:
+                content, dropped = dedupe_txt_content(content, dedupe)
+                duplicates.append(dropped)
+            
+            # Tambah header nama file jika diperlukan
+            if add_filename_headers:
+                header = f"=== {filename} ==="
+                merged_content.append(header)
+            
+            # Tambah content file (bisa kosong kalau semua barisnya duplikat)
+            if content:
+                merged_content.append(content)
+            processed_files += 1
+            
+            # Tambah separator jika bukan file terakhir dan separator diperlukan
+            if processed_files < total_files:
+                merged_content.extend(separator_lines)
+    finally:
+        if dedupe is not None:
+            dedupe.close()
+    
+    return merged_content, processed_files
+
+def write_external_merged_txt(named_streams, separator_option, custom_separator, add_filename_headers, sort_by='',
+                              duplicates=None):
+    """Gabung file TXT (nama, stream biner) lewat external sort ke file baru di folder temp storage
+
+    Return (path file hasil, jumlah file yang diproses); file hasil jadi milik pemanggil.
+    """
+    path = temp_file_storage.new_path('.txt')
+    try:
+        with open(path, 'wb') as output:
+            processed_files, _ = external_merge_txt(
+                named_streams, output, len(named_streams), sort_by, add_filename_headers,
+                txt_separator_lines(separator_option, custom_separator), duplicates, temp_file_storage.folder
+            )
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, processed_files
+
+def txt_dedupe_stats(filenames, duplicates):
+    """Statistik dedupe gabung TXT: baris duplikat yang dibuang per file dan totalnya"""
+    return {
+        'original_files': [{'filename': filename, 'duplicates': count}
+                           for filename, count in zip(filenames, duplicates)],
+        'duplicates_removed': sum(duplicates)
+    }
+
+def merged_txt_output_filename(output_filename):
+    """Nama file hasil gabung TXT (selalu .txt)"""
+    if not output_filename.lower().endswith('.txt'):
+        output_filename += '.txt'
+    return secure_filename(output_filename)
+
+def run_gabung_txt_job(progress, uploads, output_filename, separator_option, custom_separator, add_filename_headers,
+                       dedupe=False, sort_by='', external=False):
+    """Background job gabung_txt_files"""
+    if external:
+        return run_external_gabung_txt_job(uploads, output_filename, separator_option, custom_separator,
+                                           add_filename_headers, dedupe, sort_by)
+    
+    named_contents = []
+    try:
+        for path, original_filename in uploads:
+            with open(path, 'rb') as f:
+                content = decode_txt_upload(f.read())
+            named_contents.append((original_filename, content))
+            progress.add(lines=content.count('\n') + 1 if content else 0)
+    finally:
+        remove_job_uploads(uploads)
+    
+    duplicates = [] if dedupe else None
+    merged_content, processed_files = merge_txt_contents(
+        named_contents, len(uploads), separator_option, custom_separator, add_filename_headers, duplicates
+    )
+    
+    if processed_files < 2:
+        raise ValueError('Minimal 2 file berhasil diproses diperlukan untuk digabung')
+    
+    final_content = '\n'.join(merged_content)
+    file_id = new_batch_id('gabung_txt')
+    final_filename = merged_txt_output_filename(output_filename)
+    size = temp_file_storage.put(file_id, final_filename, 'text/plain', content=final_content)
+    
+    result = {
+        'processed_files': processed_files,
+        'files': [{
+            'file_id': file_id,
+            'filename': final_filename,
+            'size': size
+        }]
+    }
+    if dedupe:
+        result.update(txt_dedupe_stats([filename for filename, _ in named_contents], duplicates))
+    return result
+
+def run_external_gabung_txt_job(uploads, output_filename, separator_option, custom_separator, add_filename_headers,
+                                dedupe, sort_by):
+    """Background job gabung_txt_files lewat external sort (upload dibaca dari disk satu per satu)"""
+    duplicates = [] if dedupe else None
+    try:
+        with ExitStack() as stack:
+            named_streams = [(original_filename, stack.enter_context(open(path, 'rb')))
+                             for path, original_filename in uploads]
+            path, processed_files = write_external_merged_txt(
+                named_streams, separator_option, custom_separator, add_filename_headers, sort_by, duplicates
+            )
+    finally:
+        remove_job_uploads(uploads)
+    
+    if processed_files < 2:
+        os.remove(path)
+        raise ValueError('Minimal 2 file berhasil diproses diperlukan untuk digabung')
+    
+    file_id = new_batch_id('gabung_txt')
+    final_filename = merged_txt_output_filename(output_filename)
+    size = temp_file_storage.put(file_id, final_filename, 'text/plain', path=path)
+    
+    result = {
+        'processed_files': processed_files,
+        'sort_by': sort_by,
+        'files': [{
+            'file_id': file_id,
+            'filename': final_filename,
+            'size': size
+        }]
+    }
+    if dedupe:
+        result.update(txt_dedupe_stats([filename for _, filename in uploads], duplicates))
+    return result
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Status dan progress background job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job tidak ditemukan'}), 404
+    
+    # Job milik user yang login hanya bisa dilihat oleh session API key yang sama
+    if job['owner'] is not None:
+        error_response = require_valid_session(return_json=True)
+        if error_response:
+            return error_response
+        if session.get('api_key') != job['owner']:
+            return jsonify({'error': 'Job tidak ditemukan'}), 404
+    
+    response = {
+        'success': job['status'] != JOB_FAILED,
+        'job_id': job['job_id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'lines_processed': job['lines_processed'],
+        'contacts_found': job['contacts_found']
+    }
+    
+    if job['status'] == JOB_DONE and job['result']:
+        response.update(job['result'])
+    elif job['status'] == JOB_FAILED:
+        response['error'] = job['error']
+    
+    return jsonify(response)
+
+@app.route('/logout')
+def logout():
+    """Logout user dan clear session"""
+    api_key = session.get('api_key')
+    
+    # Invalidate session tracking
+    if api_key:
+        invalidate_session(api_key)
+        logger.debug("User logged out, invalidated session for API key %s", api_key)
+    
+    # Clear session
+    session.clear()
+    flash('Berhasil logout. Terima kasih!', 'success')
+    return redirect(url_for('index'))
+
+@app.route('/admin')
+def admin_login():
+    """Halaman login admin"""
+    return render_template('admin_login.html')
+
+@app.route('/admin/verify', methods=['POST'])
+def admin_verify():
+    """Verifikasi login admin"""
+    password = request.form.get('password', '')
+    
+    if password == ADMIN_PASSWORD:
+        session['admin_logged_in'] = True
+        flash('Login admin berhasil!', 'success')
+        return redirect(url_for('admin_panel'))
+    else:
+        flash('Password admin salah!', 'error')
+        return redirect(url_for('admin_login'))
+
+@app.route('/admin/panel')
+def admin_panel():
+    """Panel admin untuk manage API keys"""
+    if 'admin_logged_in' not in session or not session['admin_logged_in']:
+        flash('Silakan login sebagai admin terlebih dahulu.', 'error')
+        return redirect(url_for('admin_login'))
+    
+    api_keys = load_api_keys()
+    return render_template('admin_panel.html', api_keys=api_keys)
+
+@app.route('/admin/generate_key', methods=['POST'])
+def generate_key():
+    """Generate API key baru"""
+    if 'admin_logged_in' not in session or not session['admin_logged_in']:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    duration_months = request.form.get('duration', '1')
+    description = request.form.get('description', '')
+    
+    try:
+        duration_months = int(duration_months)
+        if duration_months <= 0:
+            return jsonify({'error': 'Durasi harus lebih dari 0'}), 400
+    except ValueError:
+        return jsonify({'error': 'Durasi harus berupa angka'}), 400
+    
+    # Generate API key
+    new_api_key = generate_api_key()
+    
+    # Hitung tanggal expired
+    expiry_date = datetime.now() + timedelta(days=duration_months * 30)
+    
+    # Tambah key baru
+    api_key_store.add(new_api_key, {
+        'created_date': datetime.now().isoformat(),
+        'expiry_date': expiry_date.isoformat(),
+        'description': description,
+        'duration_months': duration_months
+    })
+    
+    flash(f'API key berhasil dibuat: {new_api_key}', 'success')
+    return redirect(url_for('admin_panel'))
+
+@app.route('/admin/delete_key/<api_key>', methods=['POST'])
+def delete_key(api_key):
+    """Hapus API key"""
+    if 'admin_logged_in' not in session or not session['admin_logged_in']:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    # Hapus API key dari database
+    if api_key_store.delete(api_key):
+        # PENTING: Hapus session aktif yang menggunakan API key ini
+        if active_sessions.get(api_key) is not None:
+            active_sessions.delete(api_key)
+            logger.debug("Deleted active session for API key %s", api_key)
+        
+        flash('API key berhasil dihapus!', 'success')
+    else:
+        flash('API key tidak ditemukan!', 'error')
+    
+    return redirect(url_for('admin_panel'))
+
+@app.route('/admin/metrics')
+def admin_metrics():
+    """Statistik API key, temp storage, result cache dan cache nomor telepon (JSON)"""
+    if 'admin_logged_in' not in session or not session['admin_logged_in']:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    return jsonify({
+        'api_keys': api_key_store.counts(),
+        'temp_storage': temp_file_storage.stats(),
+        'result_cache': result_cache.stats() if result_cache is not None else {'enabled': False},
+        'phone_cache': phone_cache.stats(),
+        'phone_fast_path': phone_fast_path.stats(),
+        'txt_parse_cache': txt_parse_cache.stats()
+    })
+
+@app.cli.command('import-api-keys')
+@click.argument('json_path', required=False)
+def import_api_keys_command(json_path):
+    """Import API key dari file JSON lama (default: api_keys.json) ke database"""
+    if not hasattr(api_key_store, 'import_json'):
+        click.echo('KEY_STORE bukan sqlite, tidak ada yang perlu di-import')
+        return
+    imported = api_key_store.import_json(json_path or API_KEYS_FILE)
+    click.echo(f'{imported} API key di-import ke {DATABASE_FILE}')
+
+@app.route('/admin/logout')
+def admin_logout():
+    """Logout admin"""
+    session.pop('admin_logged_in', None)
+    flash('Admin logout berhasil.', 'info')
+    return redirect(url_for('admin_login'))
+
+if __name__ == '__main__':
+    # `python app.py` (juga start command railway.json); gunicorn dan `flask` CLI cukup import app:app.
+    # Debugger Werkzeug hanya aktif kalau FLASK_DEBUG=1 (development), default mati
+    port = int(os.environ.get('PORT', 5000))
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=port)
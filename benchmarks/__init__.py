@@ -0,0 +1,3 @@
+"""
+Benchmark fungsi konversi di utils.py dengan corpus kontak sintetis (lihat benchmarks/run.py)
+"""
@@ -0,0 +1,118 @@
+"""
+Generator corpus kontak sintetis yang reproducible (seed tetap) untuk benchmark
+"""
+import random
+from typing import List
+
+# Komposisi nomor: (bobot, jenis)
+NUMBER_MIX = (
+    (0.40, 'local'),          # 08xx Indonesia
+    (0.15, 'plus_62'),        # +62 8xx
+    (0.10, 'bare_62'),        # 62 8xx tanpa +
+    (0.15, 'international'),  # +<kode negara> lain
+    (0.10, 'formatted'),      # 0812-3456-7890 / (0812) 345 678
+    (0.10, 'junk')            # bukan nomor / terlalu pendek
+)
+# Format baris TXT: (bobot, format)
+LINE_MIX = (
+    (0.30, 'comma'),
+    (0.15, 'semicolon'),
+    (0.15, 'colon'),
+    (0.15, 'dash'),
+    (0.15, 'number_only'),
+    (0.10, 'junk')
+)
+
+_COUNTRY_CODES = ('1', '44', '49', '60', '61', '65', '66', '81', '86', '91', '971')
+_FIRST_NAMES = ('Budi', 'Siti', 'Agus', 'Dewi', 'Rina', 'Andi', 'Putri', 'Joko', 'Ayu', 'Rizky')
+_LAST_NAMES = ('Santoso', 'Wijaya', 'Saputra', 'Lestari', 'Hidayat', 'Pratama', 'Kusuma', 'Nugroho')
+_JUNK_LINES = ('-', 'catatan: hubungi lagi', '12345', 'n/a', '=====', 'Nama,', ';;', 'tel:')
+
+
+def _pick(rng: random.Random, mix) -> str:
+    value = rng.random()
+    for weight, kind in mix:
+        if value < weight:
+            return kind
+        value -= weight
+    return mix[-1][1]
+
+
+def _digits(rng: random.Random, count: int) -> str:
+    return ''.join(rng.choice('0123456789') for _ in range(count))
+
+
+def make_number(rng: random.Random, kind: str) -> str:
+    """1 nomor telepon sesuai jenis di NUMBER_MIX"""
+    if kind == 'local':
+        return '08' + rng.choice('1235789') + _digits(rng, rng.randint(7, 10))
+    if kind == 'plus_62':
+        return '+628' + rng.choice('1235789') + _digits(rng, rng.randint(7, 9))
+    if kind == 'bare_62':
+        return '628' + rng.choice('1235789') + _digits(rng, rng.randint(7, 9))
+    if kind == 'international':
+        return '+' + rng.choice(_COUNTRY_CODES) + rng.choice('23456789') + _digits(rng, rng.randint(7, 9))
+    if kind == 'formatted':
+        if rng.random() < 0.5:
+            return f"08{rng.choice('1235789')}{_digits(rng, 1)}-{_digits(rng, 4)}-{_digits(rng, 4)}"
+        return f"(08{rng.choice('1235789')}{_digits(rng, 1)}) {_digits(rng, 3)} {_digits(rng, 4)}"
+    return rng.choice(('12345', 'abc', '0800', '+', '99-99'))
+
+
+def numbers(count: int, seed: int = 1) -> List[str]:
+    """count nomor campuran sesuai NUMBER_MIX"""
+    rng = random.Random(seed)
+    return [make_number(rng, _pick(rng, NUMBER_MIX)) for _ in range(count)]
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+
+
+def txt_lines(count: int, seed: int = 1) -> List[str]:
+    """count baris TXT campuran semua format delimiter (comma, semicolon, colon, dash), nomor saja dan junk"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        style = _pick(rng, LINE_MIX)
+        if style == 'junk':
+            lines.append(rng.choice(_JUNK_LINES))
+            continue
+        number = make_number(rng, _pick(rng, NUMBER_MIX))
+        if style == 'comma':
+            lines.append(f"{_name(rng)},{number}")
+        elif style == 'semicolon':
+            lines.append(f"{_name(rng)};{number}")
+        elif style == 'colon':
+            lines.append(f"{_name(rng)}: {number}")
+        elif style == 'dash':
+            lines.append(f"{_name(rng)} - {number}")
+        else:
+            lines.append(number)
+    return lines
+
+
+def txt_content(count: int, seed: int = 1) -> str:
+    """Isi file TXT dengan count baris"""
+    return '\n'.join(txt_lines(count, seed))
+
+
+def vcf_content(count: int, seed: int = 1, crlf: bool = False) -> str:
+    """Isi file VCF dengan count vCard (FN/N, 0-2 TEL dengan parameter, sebagian baris folded)"""
+    rng = random.Random(seed)
+    newline = '\r\n' if crlf else '\n'
+    cards = []
+    for i in range(count):
+        lines = ['BEGIN:VCARD', 'VERSION:3.0']
+        name = _name(rng)
+        if rng.random() < 0.8:
+            lines.append(f"FN:{name} {i}")
+        lines.append(f"N:{name.split()[1]};{name.split()[0]};;;")
+        for _ in range(rng.choice((0, 1, 1, 1, 1, 2))):
+            prop = rng.choice(('TEL', 'TEL;TYPE=CELL', 'TEL;type=HOME', 'item1.TEL'))
+            lines.append(f"{prop}:{make_number(rng, _pick(rng, NUMBER_MIX))}")
+        if rng.random() < 0.05:
+            lines.append(f"NOTE:catatan panjang untuk kontak {i}{newline} dilanjutkan di baris berikutnya")
+        lines.append('END:VCARD')
+        cards.append(newline.join(lines))
+    return newline.join(cards) + newline
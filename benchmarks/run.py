@@ -0,0 +1,271 @@
+"""
+Benchmark fungsi konversi di utils.py dengan corpus sintetis (lihat benchmarks/corpus.py)
+
+Contoh (jalankan dari root repo):
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1k,100k,1m --save benchmarks/baselines/main.json
+    python -m benchmarks.run --compare benchmarks/baselines/main.json
+    python -m benchmarks.run --only parse_txt_to_vcf,merge_vcf_files --sizes 100k
+
+Setiap pengukuran (fungsi x ukuran) dijalankan di process baru: cache nomor telepon
+selalu kosong di awal dan peak RSS tidak tercampur pengukuran lain.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import phonenumbers  # noqa: E402
+
+import utils  # noqa: E402
+from benchmarks import corpus  # noqa: E402
+
+DEFAULT_SIZES = '1k,100k'
+# Batas perlambatan (relatif ke baseline) yang dianggap regresi
+DEFAULT_THRESHOLD = 0.10
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Daftarkan benchmark: fungsi setup(size) return fungsi tanpa argumen yang diukur"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark('clean_phone_number')
+def _clean_phone_number(size):
+    numbers = corpus.numbers(size)
+    return lambda: [utils.clean_phone_number(number) for number in numbers]
+
+
+@benchmark('clean_phone_numbers')
+def _clean_phone_numbers(size):
+    numbers = corpus.numbers(size)
+    return lambda: utils.clean_phone_numbers(numbers)
+
+
+@benchmark('parse_txt_to_vcf')
+def _parse_txt_to_vcf(size):
+    content = corpus.txt_content(size)
+    return lambda: utils.parse_txt_to_vcf(content)
+
+
+@benchmark('split_txt_line')
+def _split_txt_line(size):
+    # Per baris TXT: pilih format, pisah nama / nomor dan normalisasi nomor (tanpa rendering vCard)
+    lines = [line.strip() for line in corpus.txt_lines(size)]
+    return lambda: [utils._split_txt_line(line) for line in lines]
+
+
+@benchmark('parse_vcf_to_txt')
+def _parse_vcf_to_txt(size):
+    content = corpus.vcf_content(size)
+    return lambda: utils.parse_vcf_to_txt(content, 'comma')
+
+
+@benchmark('parse_txt_uploads')
+def _parse_txt_uploads(size):
+    # Multi convert 16 file TXT (total size baris), paralel per file kalau PARSE_WORKERS > 0
+    datas = [corpus.txt_content(size // 16 or 1, seed=seed).encode('utf-8') for seed in range(16)]
+
+    def run():
+        # Tanpa cache parse supaya semua file benar-benar diparse ulang
+        utils.txt_parse_cache.clear()
+        for _ in utils.parse_txt_uploads(enumerate(datas)):
+            pass
+    return run
+
+
+@benchmark('merge_vcf_files')
+def _merge_vcf_files(size):
+    # Gabung 4 file dengan total size vCard
+    contents = [corpus.vcf_content(size // 4 or 1, seed=seed) for seed in range(4)]
+    return lambda: utils.merge_vcf_files(contents, 'Gabung')
+
+
+@benchmark('merge_vcf_files_quick')
+def _merge_vcf_files_quick(size):
+    # Pembanding merge_vcf_files: pembersihan cepat digit saja tanpa normalisasi (phone_mode 'quick')
+    contents = [corpus.vcf_content(size // 4 or 1, seed=seed) for seed in range(4)]
+    return lambda: utils.merge_vcf_files(contents, 'Gabung', phone_mode='quick')
+
+
+@benchmark('merge_vcf_files_dedupe')
+def _merge_vcf_files_dedupe(size):
+    # Gabung 4 file dengan total size vCard, file ke-3 dan ke-4 duplikat file ke-1 dan ke-2
+    contents = [corpus.vcf_content(size // 4 or 1, seed=seed % 2) for seed in range(4)]
+    return lambda: utils.merge_vcf_files(contents, 'Gabung', duplicates=[])
+
+
+@benchmark('external_merge_vcf')
+def _external_merge_vcf(size):
+    # Sama dengan merge_vcf_files (4 file, total size vCard) tapi lewat external sort, urut nomor + dedupe,
+    # hasil ditulis ke file
+    contents = [corpus.vcf_content(size // 4 or 1, seed=seed).encode('utf-8') for seed in range(4)]
+
+    def run():
+        with open(os.devnull, 'wb') as output:
+            utils.external_merge_vcf([io.BytesIO(content) for content in contents], output, 'Gabung', 'number',
+                                     duplicates=[])
+    return run
+
+
+@benchmark('bloom_dedupe')
+def _bloom_dedupe(size):
+    # Mode dedupe memori terbatas: setiap nomor dicatat 2x (separuh pengecekan "mungkin ada" ke disk)
+    keys = [utils._pack_phone(phone) for phone in utils.clean_phone_numbers(corpus.numbers(size)) if phone]
+
+    def run():
+        dedupe = utils.BloomDedupe(len(keys) * 2)
+        try:
+            for key in keys * 2:
+                dedupe.add(key)
+        finally:
+            dedupe.close()
+    return run
+
+
+@benchmark('split_txt_file')
+def _split_txt_file(size):
+    content = corpus.txt_content(size)
+    return lambda: utils.split_txt_file(content, max(1, size // 10))
+
+
+@benchmark('txt_line_segments')
+def _txt_line_segments(size):
+    # Split yang sama dengan split_txt_file, langsung dari byte upload (offset newline, tanpa decode / join)
+    data = corpus.txt_content(size).encode('utf-8')
+    return lambda: utils.txt_line_segments(data, max(1, size // 10))
+
+
+def parse_size(text: str) -> int:
+    """'1k' -> 1000, '1m' -> 1000000"""
+    text = text.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def _max_rss_mb() -> float:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+def _measure(name: str, size: int, repeat: int) -> dict:
+    """Dijalankan di process baru: ukur waktu terbaik dari repeat kali jalan (cache nomor dikosongkan tiap kali)"""
+    run = BENCHMARKS[name](size)
+    rss_before = _max_rss_mb()
+    times = []
+    for _ in range(repeat):
+        utils.phone_cache.clear()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+    return {
+        'function': name,
+        'lines': size,
+        'seconds': seconds,
+        'lines_per_sec': size / seconds if seconds > 0 else None,
+        'peak_rss_mb': _max_rss_mb(),
+        'rss_increase_mb': _max_rss_mb() - rss_before
+    }
+
+
+def run_benchmarks(names, sizes, repeat: int) -> dict:
+    results = {}
+    for size in sizes:
+        for name in names:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(_measure, name, size, repeat).result()
+            results[f"{name}@{size}"] = result
+            print(f"{name:<22} {size:>9,} lines  {result['seconds']:>9.3f}s  "
+                  f"{result['lines_per_sec']:>12,.0f} lines/s  peak RSS {result['peak_rss_mb']:>8.1f} MB",
+                  flush=True)
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ''
+
+
+def environment() -> dict:
+    return {
+        'date': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'phonenumbers': phonenumbers.__version__,
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Print perbandingan dengan baseline, return False kalau ada regresi waktu di atas threshold"""
+    ok = True
+    print(f"\nDibandingkan dengan baseline {baseline['environment'].get('commit', '')} "
+          f"({baseline['environment'].get('date', '')})")
+    for key, result in results.items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        ratio = result['seconds'] / base['seconds'] if base['seconds'] > 0 else float('inf')
+        regression = ratio > 1 + threshold
+        ok = ok and not regression
+        print(f"{key:<32} {base['seconds']:>9.3f}s -> {result['seconds']:>9.3f}s  x{ratio:.2f}  "
+              f"RSS {base['peak_rss_mb']:.1f} -> {result['peak_rss_mb']:.1f} MB"
+              f"{'  REGRESI' if regression else ''}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"ukuran corpus, contoh 1k,100k,1m (default {DEFAULT_SIZES})")
+    parser.add_argument('--only', default='', help='nama benchmark dipisah koma (default semua)')
+    parser.add_argument('--repeat', type=int, default=3, help='jumlah pengulangan, yang dilaporkan waktu terbaik')
+    parser.add_argument('--save', metavar='PATH', help='simpan hasil sebagai baseline JSON')
+    parser.add_argument('--compare', metavar='PATH', help='bandingkan dengan baseline JSON')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='perlambatan relatif yang dianggap regresi (default 0.10 = 10%%)')
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.only.split(',') if name.strip()] or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"benchmark tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(BENCHMARKS)})")
+    sizes = [parse_size(size) for size in args.sizes.split(',') if size.strip()]
+
+    report = {'environment': environment(), 'results': run_benchmarks(names, sizes, max(1, args.repeat))}
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline disimpan di {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(report['results'], baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
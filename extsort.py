@@ -0,0 +1,108 @@
+"""
+External sort: baris teks diurutkan per run di memori, run ditulis ke disk lalu di-merge (k-way, heapq.merge),
+jadi memori yang dipakai tergantung ukuran run, bukan total data
+"""
+import heapq
+import os
+import tempfile
+from contextlib import ExitStack
+from typing import Iterable, Iterator, List, Optional
+
+# Jumlah baris yang diurutkan di memori sebelum ditulis ke disk sebagai 1 run
+EXTERNAL_SORT_RUN_LINES = int(os.environ.get('EXTERNAL_SORT_RUN_LINES', 100000))
+# Jumlah run maksimal yang di-merge sekaligus (file terbuka), lebih dari itu di-merge bertahap
+EXTERNAL_SORT_FAN_IN = int(os.environ.get('EXTERNAL_SORT_FAN_IN', 64))
+_BUFFER_SIZE = 64 * 1024
+
+
+class ExternalSorter:
+    """Urutkan baris str (diakhiri '\\n', dibandingkan sebagai string) lewat run terurut di disk.
+
+    Urutan stabil: baris yang sama persis keluar sesuai urutan add(). Panggil close() untuk
+    menghapus file run (juga kalau iter_sorted() tidak dibaca sampai habis).
+    """
+
+    def __init__(self, directory: Optional[str] = None, run_lines: int = EXTERNAL_SORT_RUN_LINES,
+                 fan_in: int = EXTERNAL_SORT_FAN_IN):
+        self.directory = directory
+        self.run_lines = max(1, run_lines)
+        self.fan_in = max(2, fan_in)
+        self.runs_written = 0
+        self._buffer = []
+        self._runs = []
+
+    def add(self, line: str) -> None:
+        self._buffer.append(line)
+        if len(self._buffer) >= self.run_lines:
+            self._spill()
+
+    def extend(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.add(line)
+
+    def _write_run(self, lines: Iterable[str]) -> str:
+        fd, path = tempfile.mkstemp(prefix='run_', suffix='.txt', dir=self.directory)
+        self._runs.append(path)
+        self.runs_written += 1
+        with open(fd, 'w', encoding='utf-8', newline='\n', buffering=_BUFFER_SIZE) as f:
+            f.writelines(lines)
+        return path
+
+    def _spill(self) -> None:
+        self._buffer.sort()
+        self._write_run(self._buffer)
+        self._buffer = []
+
+    def _open_runs(self, stack: ExitStack, paths: List[str]) -> list:
+        return [stack.enter_context(open(path, 'r', encoding='utf-8', newline='\n', buffering=_BUFFER_SIZE))
+                for path in paths]
+
+    def _remove_run(self, path: str) -> None:
+        self._runs.remove(path)
+        os.remove(path)
+
+    def iter_sorted(self) -> Iterator[str]:
+        """Semua baris terurut (dipanggil sekali, setelah semua baris ditambahkan)"""
+        if not self._runs:
+            # Muat di 1 run: tidak perlu ke disk
+            self._buffer.sort()
+            lines, self._buffer = self._buffer, []
+            yield from lines
+            return
+        if self._buffer:
+            self._spill()
+
+        runs = list(self._runs)
+        # Merge bertahap supaya file yang terbuka sekaligus maksimal fan_in
+        while len(runs) > self.fan_in:
+            merged = []
+            for start in range(0, len(runs), self.fan_in):
+                group = runs[start:start + self.fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                with ExitStack() as stack:
+                    path = self._write_run(heapq.merge(*self._open_runs(stack, group)))
+                for run in group:
+                    self._remove_run(run)
+                merged.append(path)
+            runs = merged
+
+        with ExitStack() as stack:
+            yield from heapq.merge(*self._open_runs(stack, runs))
+
+    def close(self) -> None:
+        """Hapus semua file run"""
+        self._buffer = []
+        for path in self._runs:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._runs = []
+
+    def __enter__(self) -> 'ExternalSorter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
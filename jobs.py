@@ -0,0 +1,220 @@
+"""
+Background job queue untuk proses konversi file besar
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Jumlah thread worker untuk job background
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+# Backend penyimpanan status job: 'sqlite' (bisa di-poll dari semua worker) atau 'memory' (in-process)
+JOB_STORE = os.environ.get('JOB_STORE', 'sqlite')
+# Lama (detik) job yang sudah selesai tetap bisa di-poll
+JOB_TTL = int(os.environ.get('JOB_TTL', 3600))
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+_JOB_FIELDS = ('job_id', 'kind', 'owner', 'status', 'lines_processed', 'contacts_found',
+               'result', 'error', 'created_at', 'updated_at')
+
+
+def _new_job(job_id: str, kind: str, owner: Optional[str]) -> dict:
+    now = time.time()
+    return {
+        'job_id': job_id,
+        'kind': kind,
+        'owner': owner,
+        'status': JOB_QUEUED,
+        'lines_processed': 0,
+        'contacts_found': 0,
+        'result': None,
+        'error': None,
+        'created_at': now,
+        'updated_at': now
+    }
+
+
+class MemoryJobStore:
+    """Status job di memori process (cukup untuk 1 worker gunicorn)"""
+
+    def __init__(self, ttl: int = JOB_TTL):
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, kind: str, owner: Optional[str] = None) -> dict:
+        job = _new_job(job_id, kind, owner)
+        with self._lock:
+            self._purge_expired()
+            self._jobs[job_id] = job
+            return dict(job)
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+                job['updated_at'] = time.time()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['status'] in (JOB_DONE, JOB_FAILED) and job['updated_at'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """Status job di file SQLite, bisa di-poll dari process/worker lain"""
+
+    def __init__(self, path: str, ttl: int = JOB_TTL):
+        self.path = path
+        self.ttl = ttl
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    owner TEXT,
+                    status TEXT NOT NULL,
+                    lines_processed INTEGER NOT NULL DEFAULT 0,
+                    contacts_found INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (status, updated_at)')
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def create(self, job_id: str, kind: str, owner: Optional[str] = None) -> dict:
+        job = _new_job(job_id, kind, owner)
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JOB_DONE, JOB_FAILED, time.time() - self.ttl)
+            )
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(_JOB_FIELDS)}) VALUES ({', '.join('?' * len(_JOB_FIELDS))})",
+                tuple(job[field] for field in _JOB_FIELDS)
+            )
+        return job
+
+    def update(self, job_id: str, **fields) -> None:
+        fields['updated_at'] = time.time()
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'])
+        assignments = ', '.join(f"{field} = ?" for field in fields if field in _JOB_FIELDS)
+        values = [value for field, value in fields.items() if field in _JOB_FIELDS]
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", values + [job_id])
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_JOB_FIELDS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_JOB_FIELDS, row))
+        if job['result'] is not None:
+            job['result'] = json.loads(job['result'])
+        return job
+
+
+class JobProgress:
+    """Dipakai fungsi job untuk melaporkan progress (ditulis ke store secara berkala)"""
+
+    def __init__(self, store, job_id: str, interval: float = 0.5):
+        self.store = store
+        self.job_id = job_id
+        self.interval = interval
+        self.lines_processed = 0
+        self.contacts_found = 0
+        self._last_flush = 0.0
+
+    def add(self, lines: int = 0, contacts: int = 0) -> None:
+        """Tambah counter progress"""
+        self.lines_processed += lines
+        self.contacts_found += contacts
+        now = time.monotonic()
+        if now - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        self.store.update(self.job_id, lines_processed=self.lines_processed,
+                          contacts_found=self.contacts_found)
+
+    def track_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Bungkus iterator baris supaya jumlah baris yang diproses ikut terhitung"""
+        for line in lines:
+            self.add(lines=1)
+            yield line
+
+    def track_contacts(self, contacts: Iterable) -> Iterator:
+        """Bungkus iterator hasil parse supaya jumlah kontak ikut terhitung"""
+        for contact in contacts:
+            self.add(contacts=1)
+            yield contact
+
+
+class JobQueue:
+    """Antrian job background: submit() return job id, fungsi dijalankan di thread pool"""
+
+    def __init__(self, store, workers: int = JOB_WORKERS):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+
+    def submit(self, kind: str, func: Callable, *args, owner: Optional[str] = None) -> str:
+        """Daftarkan job baru; func dipanggil sebagai func(progress, *args) dan return dict hasil"""
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, kind, owner)
+        self._executor.submit(self._run, job_id, func, args)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def _run(self, job_id: str, func: Callable, args: tuple) -> None:
+        progress = JobProgress(self.store, job_id)
+        self.store.update(job_id, status=JOB_RUNNING)
+        try:
+            result = func(progress, *args)
+        except Exception as e:
+            logger.exception("Error in job %s", job_id)
+            self.store.update(job_id, status=JOB_FAILED, error=str(e),
+                              lines_processed=progress.lines_processed,
+                              contacts_found=progress.contacts_found)
+        else:
+            self.store.update(job_id, status=JOB_DONE, result=result,
+                              lines_processed=progress.lines_processed,
+                              contacts_found=progress.contacts_found)
+
+
+def create_job_queue(data_folder: str) -> JobQueue:
+    """Buat JobQueue sesuai konfigurasi JOB_STORE"""
+    if JOB_STORE == 'sqlite':
+        store = SQLiteJobStore(os.path.join(data_folder, 'jobs.db'))
+    else:
+        store = MemoryJobStore()
+    return JobQueue(store)
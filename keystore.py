@@ -0,0 +1,238 @@
+"""
+Penyimpanan API key
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from storage import SQLiteDatabase
+
+logger = logging.getLogger(__name__)
+
+# Backend API key: 'sqlite' (default) atau 'json' (file api_keys.json)
+KEY_STORE = os.environ.get('KEY_STORE', 'sqlite')
+# Interval minimal (detik) antar pengecekan perubahan file api_keys.json
+API_KEYS_CHECK_INTERVAL = float(os.environ.get('API_KEYS_CHECK_INTERVAL', 1.0))
+
+
+def _parse_expiry(key_data: dict) -> datetime:
+    try:
+        return datetime.fromisoformat(key_data['expiry_date'])
+    except (KeyError, TypeError, ValueError):
+        # Data expiry rusak dianggap sudah expired
+        return datetime.min
+
+
+class ApiKeyIndex:
+    """Index API key dari file JSON di memori, di-reload hanya kalau file berubah (mtime/inode/size)
+
+    Lookup pakai key lowercase (case-insensitive) dan tanggal expiry sudah di-parse,
+    jadi cek API key tidak perlu baca/parse file di setiap request.
+    """
+
+    def __init__(self, path: str, check_interval: float = API_KEYS_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = None
+        self._last_check = 0.0
+        self._keys = {}
+        self._index = {}
+
+    def _file_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            signature = self._file_signature()
+            if signature == self._signature:
+                return
+            if signature is None:
+                self._build({}, None)
+                return
+            try:
+                with open(self.path, 'r') as f:
+                    api_keys = json.load(f)
+            except (OSError, ValueError):
+                # File sedang ditulis / rusak: pakai index lama, coba lagi nanti
+                return
+            self._build(api_keys, signature)
+
+    def _build(self, api_keys: dict, signature) -> None:
+        index = {}
+        for key, key_data in api_keys.items():
+            # Kalau ada key yang sama (beda huruf besar/kecil), yang pertama di file yang dipakai
+            index.setdefault(key.lower(), (key, key_data, _parse_expiry(key_data)))
+        self._keys = api_keys
+        self._index = index
+        self._signature = signature
+
+    def lookup(self, api_key: str) -> Optional[Tuple[str, dict, datetime]]:
+        """Cari API key (case-insensitive), return (key asli, data key, tanggal expiry) atau None"""
+        self._refresh()
+        return self._index.get(api_key.lower())
+
+    def load(self) -> dict:
+        """Semua API key (copy dict, aman diubah lalu disimpan dengan save())"""
+        self._refresh()
+        return dict(self._keys)
+
+    def save(self, api_keys: dict) -> None:
+        """Tulis file JSON secara atomic lalu update index"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(api_keys, f, indent=4, default=str)
+        os.replace(tmp_path, self.path)
+        with self._lock:
+            # Round-trip lewat JSON supaya isi index sama dengan yang dibaca worker lain
+            self._build(json.loads(json.dumps(api_keys, default=str)), self._file_signature())
+            self._last_check = time.monotonic()
+
+    def add(self, api_key: str, key_data: dict) -> None:
+        """Tambah / ganti 1 API key"""
+        api_keys = self.load()
+        api_keys[api_key] = key_data
+        self.save(api_keys)
+
+    def delete(self, api_key: str) -> bool:
+        """Hapus 1 API key, return False kalau key tidak ada"""
+        api_keys = self.load()
+        if api_key not in api_keys:
+            return False
+        del api_keys[api_key]
+        self.save(api_keys)
+        return True
+
+    def counts(self, now: Optional[datetime] = None) -> dict:
+        """Jumlah key total / aktif / expired"""
+        self._refresh()
+        now = now or datetime.now()
+        active = sum(1 for _, _, expiry_date in self._index.values() if expiry_date >= now)
+        return {'total': len(self._keys), 'active': active, 'expired': len(self._keys) - active}
+
+
+class SQLiteKeyStore:
+    """API key di SQLite (WAL): lookup lewat index key lowercase, query expiry lewat index expiry"""
+
+    def __init__(self, path: str):
+        self.db = SQLiteDatabase(path)
+        with self.db.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS api_keys (
+                    api_key TEXT PRIMARY KEY,
+                    key_lower TEXT NOT NULL,
+                    expiry_ts REAL NOT NULL,
+                    data TEXT NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_api_keys_lower ON api_keys (key_lower)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_api_keys_expiry ON api_keys (expiry_ts)')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+
+    @staticmethod
+    def _row(api_key: str, key_data: dict) -> tuple:
+        key_data = json.loads(json.dumps(key_data, default=str))
+        expiry_date = _parse_expiry(key_data)
+        expiry_ts = expiry_date.timestamp() if expiry_date != datetime.min else float('-inf')
+        return (api_key, api_key.lower(), expiry_ts, json.dumps(key_data))
+
+    def lookup(self, api_key: str) -> Optional[Tuple[str, dict, datetime]]:
+        """Cari API key (case-insensitive), return (key asli, data key, tanggal expiry) atau None"""
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT api_key, data FROM api_keys WHERE key_lower = ? ORDER BY rowid LIMIT 1",
+                (api_key.lower(),)
+            ).fetchone()
+        if row is None:
+            return None
+        key_data = json.loads(row[1])
+        return row[0], key_data, _parse_expiry(key_data)
+
+    def load(self) -> dict:
+        """Semua API key (urutan sesuai waktu dibuat)"""
+        with self.db.connection() as conn:
+            rows = conn.execute("SELECT api_key, data FROM api_keys ORDER BY rowid").fetchall()
+        return {api_key: json.loads(data) for api_key, data in rows}
+
+    def save(self, api_keys: dict) -> None:
+        """Samakan isi tabel dengan dict api_keys (1 transaksi)"""
+        with self.db.connection() as conn:
+            existing = {row[0] for row in conn.execute("SELECT api_key FROM api_keys")}
+            removed = existing - set(api_keys)
+            conn.executemany("DELETE FROM api_keys WHERE api_key = ?", [(key,) for key in removed])
+            conn.executemany(
+                "INSERT OR REPLACE INTO api_keys (api_key, key_lower, expiry_ts, data) VALUES (?, ?, ?, ?)",
+                [self._row(key, key_data) for key, key_data in api_keys.items()]
+            )
+
+    def add(self, api_key: str, key_data: dict) -> None:
+        """Tambah / ganti 1 API key"""
+        with self.db.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO api_keys (api_key, key_lower, expiry_ts, data) VALUES (?, ?, ?, ?)",
+                self._row(api_key, key_data)
+            )
+
+    def delete(self, api_key: str) -> bool:
+        """Hapus 1 API key, return False kalau key tidak ada"""
+        with self.db.connection() as conn:
+            cursor = conn.execute("DELETE FROM api_keys WHERE api_key = ?", (api_key,))
+        return cursor.rowcount > 0
+
+    def counts(self, now: Optional[datetime] = None) -> dict:
+        """Jumlah key total / aktif / expired"""
+        now = now or datetime.now()
+        with self.db.connection() as conn:
+            total, active = conn.execute(
+                "SELECT COUNT(*), COUNT(CASE WHEN expiry_ts >= ? THEN 1 END) FROM api_keys",
+                (now.timestamp(),)
+            ).fetchone()
+        return {'total': total, 'active': active, 'expired': total - active}
+
+    def import_json(self, json_path: str, only_once: bool = False) -> int:
+        """Import API key dari file JSON lama, return jumlah key yang di-import
+
+        Key yang sudah ada di database tidak ditimpa. Dengan only_once=True import
+        hanya dijalankan sekali (dicatat di tabel meta), supaya key yang sudah
+        dihapus admin tidak muncul lagi saat restart.
+        """
+        if not os.path.exists(json_path):
+            return 0
+        with open(json_path, 'r') as f:
+            api_keys = json.load(f)
+        with self.db.connection() as conn:
+            if only_once and conn.execute("SELECT 1 FROM meta WHERE name = 'json_imported'").fetchone():
+                return 0
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO api_keys (api_key, key_lower, expiry_ts, data) VALUES (?, ?, ?, ?)",
+                [self._row(key, key_data) for key, key_data in api_keys.items()]
+            )
+            imported = conn.total_changes - before
+            conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('json_imported', ?)",
+                         (datetime.now().isoformat(),))
+        return imported
+
+
+def create_key_store(db_path: str, json_path: str):
+    """Buat store API key sesuai konfigurasi KEY_STORE (sqlite: api_keys.json di-import sekali)"""
+    if KEY_STORE == 'json':
+        return ApiKeyIndex(json_path)
+    store = SQLiteKeyStore(db_path)
+    try:
+        store.import_json(json_path, only_once=True)
+    except (OSError, ValueError) as e:
+        logger.error("Error importing API keys from %s: %s", json_path, e)
+    return store
@@ -0,0 +1,70 @@
+"""
+Konfigurasi logging aplikasi (level global / per module, format text atau JSON)
+"""
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+# Level default semua logger: DEBUG, INFO, WARNING, ERROR
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# Level per module, contoh: "app=DEBUG,utils=WARNING"
+LOG_LEVELS = os.environ.get('LOG_LEVELS', '')
+# Format output: 'text' atau 'json' (1 objek JSON per baris)
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+
+_TEXT_FORMAT = '%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'
+# Atribut bawaan LogRecord, sisanya dianggap field tambahan dari extra={...}
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_configured = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log record sebagai 1 baris JSON (field extra={...} ikut disertakan)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'process': record.process,
+            'message': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def parse_levels(spec: str) -> dict:
+    """Parse "module=LEVEL,module2=LEVEL" jadi dict {module: LEVEL}"""
+    levels = {}
+    for item in spec.split(','):
+        name, sep, level = item.partition('=')
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> None:
+    """Pasang handler stderr di root logger sesuai LOG_LEVEL / LOG_LEVELS / LOG_FORMAT (sekali saja)"""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    handler = logging.StreamHandler(sys.stderr)
+    if LOG_FORMAT == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(_TEXT_FORMAT))
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+    for name, level in parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
@@ -0,0 +1,708 @@
+"""
+Penyimpanan file hasil sementara (hasil convert/split/gabung) dan session aktif
+"""
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, List, Optional, Union
+
+# Backend file hasil: 'filesystem' (bisa diakses semua worker gunicorn) atau 'memory' (per process)
+RESULT_STORE = os.environ.get('RESULT_STORE', 'filesystem')
+# Backend session aktif: 'sqlite' (bisa diakses semua worker gunicorn) atau 'memory' (per process)
+SESSION_STORE = os.environ.get('SESSION_STORE', 'sqlite')
+
+# Total byte isi file yang boleh disimpan di RAM, sisanya di-spill ke disk
+TEMP_STORE_MEMORY_LIMIT = int(os.environ.get('TEMP_STORE_MEMORY_LIMIT', 64 * 1024 * 1024))
+# File yang lebih besar dari ini langsung disimpan di disk
+TEMP_STORE_SPILL_SIZE = int(os.environ.get('TEMP_STORE_SPILL_SIZE', 1024 * 1024))
+# Total byte file hasil di disk; kalau lewat, entry paling lama tidak dipakai dibuang
+TEMP_STORE_DISK_LIMIT = int(os.environ.get('TEMP_STORE_DISK_LIMIT', 2 * 1024 * 1024 * 1024))
+# Lama (detik) file hasil disimpan kalau tidak pernah di-download
+TEMP_STORE_TTL = int(os.environ.get('TEMP_STORE_TTL', 3600))
+# Cache hasil konversi (content-addressed, dibagi semua worker): total byte di disk (0 = dimatikan)
+RESULT_CACHE_DISK_LIMIT = int(os.environ.get('RESULT_CACHE_DISK_LIMIT', 1024 * 1024 * 1024))
+# Lama (detik) hasil konversi disimpan di cache
+RESULT_CACHE_TTL = int(os.environ.get('RESULT_CACHE_TTL', 24 * 3600))
+
+
+_FILE_ID_RE = re.compile(r'[A-Za-z0-9_\-]+')
+
+
+def _link_range(src_path: str, dst_path: str, offset: int, size: int) -> int:
+    """Hard link src_path ke dst_path (isi tidak di-copy), return offset potongan di dst_path.
+
+    Kalau filesystem tidak mendukung hard link, potongan [offset, offset + size) di-copy ke
+    file sendiri (offset jadi 0).
+    """
+    try:
+        os.link(src_path, dst_path)
+        return offset
+    except OSError:
+        with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+            src.seek(offset)
+            remaining = size
+            while remaining > 0:
+                block = src.read(min(remaining, 1024 * 1024))
+                if not block:
+                    break
+                dst.write(block)
+                remaining -= len(block)
+        return 0
+
+
+class RangeReader(io.RawIOBase):
+    """File-like read-only untuk potongan [offset, offset + size) file di disk (mmap + memoryview, tanpa copy isi)"""
+
+    def __init__(self, path: str, offset: int, size: int):
+        with open(path, 'rb') as f:
+            # mmap tidak bisa untuk file kosong (ValueError), isinya cukup b''
+            empty = os.fstat(f.fileno()).st_size == 0
+            self._mmap = None if empty else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._base = memoryview(self._mmap if self._mmap is not None else b'')
+        self._view = self._base[offset:offset + size]
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = min(len(buffer), len(self._view) - self._pos)
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+            self._base.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        super().close()
+
+
+@contextmanager
+def map_file(path: str):
+    """Isi file di disk sebagai buffer read-only (mmap, b'' untuk file kosong) tanpa membaca isinya ke RAM"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+
+class TempFileStore:
+    """Store file hasil per process dengan batas memori: file kecil di RAM, file besar di disk, eviction TTL + LRU"""
+
+    def __init__(self, folder: str, memory_limit: int = TEMP_STORE_MEMORY_LIMIT,
+                 spill_size: int = TEMP_STORE_SPILL_SIZE, disk_limit: int = TEMP_STORE_DISK_LIMIT,
+                 ttl: int = TEMP_STORE_TTL):
+        self.folder = folder
+        self.memory_limit = memory_limit
+        self.spill_size = spill_size
+        self.disk_limit = disk_limit
+        self.ttl = ttl
+        os.makedirs(folder, exist_ok=True)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = time.time()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.spilled = 0
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self.hits = 0
+        self.misses = 0
+
+    def new_path(self, suffix: str = '.tmp') -> str:
+        """Path file baru di folder store (untuk hasil yang ditulis langsung ke disk)"""
+        return os.path.join(self.folder, f"{uuid.uuid4().hex}{suffix}")
+
+    def put(self, file_id: str, filename: str, mimetype: str,
+            content: Union[str, bytes, None] = None, path: Optional[str] = None) -> int:
+        """Simpan file hasil (isi str/bytes, atau file yang sudah ada di disk), return ukuran dalam byte"""
+        if path is not None:
+            entry = self._new_entry(filename, mimetype, None, path, os.path.getsize(path))
+        else:
+            data = content.encode('utf-8') if isinstance(content, str) else content
+            entry = self._new_entry(filename, mimetype, data, None, len(data))
+            if entry['size'] > self.spill_size:
+                self._spill(entry)
+        self._insert(file_id, entry)
+        return entry['size']
+
+    def put_range(self, file_id: str, filename: str, mimetype: str, path: str, offset: int, size: int) -> int:
+        """Simpan potongan [offset, offset + size) dari file di disk tanpa copy isi, return ukuran dalam byte
+
+        File asal boleh dihapus pemanggil setelah semua potongan disimpan.
+        """
+        link_path = self.new_path('.part')
+        offset = _link_range(path, link_path, offset, size)
+        self._insert(file_id, self._new_entry(filename, mimetype, None, link_path, size, offset))
+        return size
+
+    def _insert(self, file_id: str, entry: dict) -> None:
+        with self._lock:
+            removed = []
+            old = self._entries.pop(file_id, None)
+            if old is not None:
+                self._account(old, -1)
+                removed.append(old)
+            self._entries[file_id] = entry
+            self._account(entry, 1)
+            removed.extend(self._enforce_limits(file_id))
+        self._remove_files(removed)
+
+    def get(self, file_id: str) -> Optional[dict]:
+        """Ambil info file tanpa menghapusnya dari store"""
+        with self._lock:
+            entry = self._lookup(file_id)
+            return dict(entry) if entry is not None else None
+
+    def pop(self, file_id: str) -> Optional[dict]:
+        """Ambil dan hapus file dari store (file di disk jadi tanggung jawab pemanggil)"""
+        with self._lock:
+            entry = self._lookup(file_id)
+            if entry is None:
+                return None
+            del self._entries[file_id]
+            self._account(entry, -1)
+            return entry
+
+    def __contains__(self, file_id: str) -> bool:
+        return self.get(file_id) is not None
+
+    def stats(self) -> dict:
+        """Statistik jumlah entry dan byte di RAM/disk"""
+        with self._lock:
+            disk_entries = sum(1 for entry in self._entries.values() if entry['path'] is not None)
+            lookups = self.hits + self.misses
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'memory_entries': len(self._entries) - disk_entries,
+                'disk_entries': disk_entries,
+                'memory_bytes': self.memory_bytes,
+                'disk_bytes': self.disk_bytes,
+                'memory_limit': self.memory_limit,
+                'disk_limit': self.disk_limit,
+                'spill_size': self.spill_size,
+                'ttl': self.ttl,
+                'spilled': self.spilled,
+                'evicted_ttl': self.evicted_ttl,
+                'evicted_lru': self.evicted_lru,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0
+            }
+
+    @staticmethod
+    def _new_entry(filename: str, mimetype: str, content: Optional[bytes], path: Optional[str],
+                   size: int, offset: Optional[int] = None) -> dict:
+        # offset None = seluruh file di path, selain itu hanya potongan [offset, offset + size)
+        return {
+            'filename': filename,
+            'mimetype': mimetype,
+            'content': content,
+            'path': path,
+            'offset': offset,
+            'size': size,
+            'created_at': time.time()
+        }
+
+    def _lookup(self, file_id: str) -> Optional[dict]:
+        entry = self._entries.get(file_id)
+        if entry is None or entry['created_at'] < time.time() - self.ttl:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(file_id)
+        self.hits += 1
+        return entry
+
+    def _account(self, entry: dict, sign: int) -> None:
+        if entry['path'] is not None:
+            self.disk_bytes += sign * entry['size']
+        else:
+            self.memory_bytes += sign * entry['size']
+
+    def _spill(self, entry: dict) -> None:
+        """Pindahkan isi entry dari RAM ke file di disk"""
+        path = self.new_path('.spill')
+        with open(path, 'wb') as f:
+            f.write(entry['content'])
+        entry['content'] = None
+        entry['path'] = path
+        self.spilled += 1
+
+    def _enforce_limits(self, keep_id: str) -> List[dict]:
+        """Jalankan eviction TTL, spill RAM -> disk dan eviction LRU; return entry yang dibuang"""
+        removed = []
+        now = time.time()
+        if now - self._last_purge >= min(self.ttl, 60):
+            self._last_purge = now
+            removed.extend(self._purge_expired(now - self.ttl))
+
+        # Spill entry RAM yang paling lama tidak dipakai sampai di bawah batas memori
+        if self.memory_bytes > self.memory_limit:
+            for entry in list(self._entries.values()):
+                if self.memory_bytes <= self.memory_limit:
+                    break
+                if entry['path'] is None:
+                    self._account(entry, -1)
+                    self._spill(entry)
+                    self._account(entry, 1)
+
+        # Buang entry paling lama tidak dipakai kalau disk penuh (entry baru tidak ikut dibuang)
+        while self.disk_bytes > self.disk_limit and len(self._entries) > 1:
+            file_id, entry = next(iter(self._entries.items()))
+            if file_id == keep_id:
+                break
+            del self._entries[file_id]
+            self._account(entry, -1)
+            removed.append(entry)
+            self.evicted_lru += 1
+        return removed
+
+    def _purge_expired(self, cutoff: float) -> List[dict]:
+        expired = [file_id for file_id, entry in self._entries.items() if entry['created_at'] < cutoff]
+        removed = []
+        for file_id in expired:
+            entry = self._entries.pop(file_id)
+            self._account(entry, -1)
+            removed.append(entry)
+        self.evicted_ttl += len(expired)
+
+        # File sisa worker lain / process sebelumnya yang sudah lewat TTL
+        live_paths = {entry['path'] for entry in self._entries.values()}
+        try:
+            with os.scandir(self.folder) as it:
+                for dir_entry in it:
+                    if dir_entry.is_file() and dir_entry.path not in live_paths \
+                            and dir_entry.stat().st_mtime < cutoff:
+                        removed.append({'path': dir_entry.path})
+        except OSError:
+            pass
+        return removed
+
+    @staticmethod
+    def _remove_files(entries: List[dict]) -> None:
+        for entry in entries:
+            if entry.get('path'):
+                try:
+                    os.remove(entry['path'])
+                except OSError:
+                    pass
+
+
+class FileSystemTempStore:
+    """Store file hasil di folder bersama: setiap entry = file data + file metadata JSON
+
+    Semua worker/process yang memakai folder yang sama melihat entry yang sama,
+    jadi download bisa dilayani worker mana pun. Isi file selalu di disk dan
+    dikirim lewat file handle.
+    """
+
+    def __init__(self, folder: str, disk_limit: int = TEMP_STORE_DISK_LIMIT, ttl: int = TEMP_STORE_TTL):
+        self.folder = folder
+        self.disk_limit = disk_limit
+        self.ttl = ttl
+        os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._last_purge = time.time()
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self.hits = 0
+        self.misses = 0
+
+    def new_path(self, suffix: str = '.tmp') -> str:
+        """Path file baru di folder store (untuk hasil yang ditulis langsung ke disk)"""
+        return os.path.join(self.folder, f"{uuid.uuid4().hex}{suffix}")
+
+    def _paths(self, file_id: str):
+        return (os.path.join(self.folder, f"{file_id}.data"),
+                os.path.join(self.folder, f"{file_id}.meta"))
+
+    def put(self, file_id: str, filename: str, mimetype: str,
+            content: Union[str, bytes, None] = None, path: Optional[str] = None, extra: Optional[dict] = None) -> int:
+        """Simpan file hasil (isi str/bytes, atau file yang sudah ada di disk), return ukuran dalam byte
+
+        extra (dict JSON) ikut disimpan di metadata dan dikembalikan get() / pop() sebagai entry['extra'].
+        """
+        if not _FILE_ID_RE.fullmatch(file_id):
+            raise ValueError(f"File id tidak valid: {file_id}")
+        data_path, meta_path = self._paths(file_id)
+
+        if path is not None:
+            os.replace(path, data_path)
+        else:
+            data = content.encode('utf-8') if isinstance(content, str) else content
+            tmp_path = self.new_path('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, data_path)
+        size = os.path.getsize(data_path)
+
+        self._write_meta(meta_path, {'filename': filename, 'mimetype': mimetype, 'size': size,
+                                     'created_at': time.time(), 'extra': extra})
+        return size
+
+    def put_range(self, file_id: str, filename: str, mimetype: str, path: str, offset: int, size: int,
+                  extra: Optional[dict] = None) -> int:
+        """Simpan potongan [offset, offset + size) dari file di disk tanpa copy isi, return ukuran dalam byte
+
+        File data entry adalah hard link ke file asal; file asal boleh dihapus pemanggil
+        setelah semua potongan disimpan, isinya dibebaskan setelah potongan terakhir dihapus.
+        """
+        if not _FILE_ID_RE.fullmatch(file_id):
+            raise ValueError(f"File id tidak valid: {file_id}")
+        data_path, meta_path = self._paths(file_id)
+
+        tmp_path = self.new_path('.tmp')
+        offset = _link_range(path, tmp_path, offset, size)
+        os.replace(tmp_path, data_path)
+
+        self._write_meta(meta_path, {'filename': filename, 'mimetype': mimetype, 'size': size,
+                                     'offset': offset, 'created_at': time.time(), 'extra': extra})
+        return size
+
+    def _write_meta(self, meta_path: str, meta: dict) -> None:
+        # Metadata ditulis terakhir: entry baru terlihat oleh worker lain setelah data lengkap
+        tmp_path = self.new_path('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+        self._maybe_purge()
+
+    def _read_meta(self, meta_path: str) -> Optional[dict]:
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _entry(self, file_id: str, meta: Optional[dict]) -> Optional[dict]:
+        if meta is None or meta['created_at'] < time.time() - self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        data_path, _ = self._paths(file_id)
+        return dict({'offset': None}, **meta, content=None, path=data_path)
+
+    def get(self, file_id: str) -> Optional[dict]:
+        """Ambil info file tanpa menghapusnya dari store"""
+        if not _FILE_ID_RE.fullmatch(file_id):
+            return None
+        _, meta_path = self._paths(file_id)
+        entry = self._entry(file_id, self._read_meta(meta_path))
+        if entry is not None:
+            try:
+                # mtime metadata = waktu terakhir dipakai (untuk eviction LRU)
+                os.utime(meta_path)
+            except OSError:
+                pass
+        return entry
+
+    def pop(self, file_id: str) -> Optional[dict]:
+        """Ambil dan hapus file dari store (file di disk jadi tanggung jawab pemanggil)"""
+        if not _FILE_ID_RE.fullmatch(file_id):
+            return None
+        _, meta_path = self._paths(file_id)
+        # Rename atomic: kalau 2 worker pop bersamaan hanya 1 yang dapat
+        claimed_path = f"{meta_path}.{uuid.uuid4().hex}.claimed"
+        try:
+            os.rename(meta_path, claimed_path)
+        except OSError:
+            self.misses += 1
+            return None
+        meta = self._read_meta(claimed_path)
+        self._remove(claimed_path)
+        entry = self._entry(file_id, meta)
+        if entry is None:
+            self._remove(self._paths(file_id)[0])
+        return entry
+
+    def __contains__(self, file_id: str) -> bool:
+        return self.get(file_id) is not None
+
+    def _scan(self):
+        """Return list (file_id, ukuran data, mtime metadata) semua entry di folder"""
+        entries = []
+        with os.scandir(self.folder) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith('.meta'):
+                    continue
+                file_id = dir_entry.name[:-len('.meta')]
+                try:
+                    mtime = dir_entry.stat().st_mtime
+                    data_stat = os.stat(self._paths(file_id)[0])
+                except OSError:
+                    continue
+                # File yang di-share beberapa potongan (hard link) dihitung proporsional
+                size = data_stat.st_size // data_stat.st_nlink
+                entries.append((file_id, size, mtime))
+        return entries
+
+    def _maybe_purge(self) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._last_purge < min(self.ttl, 60):
+                return
+            self._last_purge = now
+        self.purge()
+
+    def purge(self) -> None:
+        """Buang entry yang lewat TTL, file yatim, lalu entry paling lama tidak dipakai kalau disk penuh"""
+        cutoff = time.time() - self.ttl
+        live = []
+        for file_id, size, mtime in self._scan():
+            meta = self._read_meta(self._paths(file_id)[1])
+            if meta is None or meta['created_at'] < cutoff:
+                self._remove_entry(file_id)
+                self.evicted_ttl += 1
+            else:
+                live.append((file_id, size, mtime))
+
+        # File data/tmp tanpa metadata (sisa proses yang mati di tengah jalan)
+        live_ids = {file_id for file_id, _, _ in live}
+        with os.scandir(self.folder) as it:
+            for dir_entry in it:
+                name = dir_entry.name
+                if name.endswith('.meta') or name.rsplit('.', 1)[0] in live_ids:
+                    continue
+                try:
+                    if dir_entry.stat().st_mtime < cutoff:
+                        self._remove(dir_entry.path)
+                except OSError:
+                    pass
+
+        disk_bytes = sum(size for _, size, _ in live)
+        for file_id, size, _ in sorted(live, key=lambda item: item[2]):
+            if disk_bytes <= self.disk_limit:
+                break
+            self._remove_entry(file_id)
+            disk_bytes -= size
+            self.evicted_lru += 1
+
+    def stats(self) -> dict:
+        """Statistik jumlah entry dan byte di disk"""
+        entries = self._scan()
+        lookups = self.hits + self.misses
+        return {
+            'backend': 'filesystem',
+            'entries': len(entries),
+            'memory_entries': 0,
+            'disk_entries': len(entries),
+            'memory_bytes': 0,
+            'disk_bytes': sum(size for _, size, _ in entries),
+            'disk_limit': self.disk_limit,
+            'ttl': self.ttl,
+            'evicted_ttl': self.evicted_ttl,
+            'evicted_lru': self.evicted_lru,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0
+        }
+
+    def _remove_entry(self, file_id: str) -> None:
+        data_path, meta_path = self._paths(file_id)
+        self._remove(meta_path)
+        self._remove(data_path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def create_temp_store(folder: str):
+    """Buat store file hasil sesuai konfigurasi RESULT_STORE"""
+    if RESULT_STORE == 'memory':
+        return TempFileStore(folder)
+    return FileSystemTempStore(folder)
+
+
+class ResultCache:
+    """Cache hasil konversi content-addressed: key = hash (route, hash isi upload, opsi konversi)
+
+    Output disimpan di FileSystemTempStore sendiri (folder bersama semua worker, TTL + eviction
+    LRU sesuai batas disk) dan tidak pernah di-pop: pemakai meng-hard link output ke store file
+    hasil dengan put_range, jadi download tetap sekali pakai tanpa copy isi.
+    """
+
+    def __init__(self, folder: str, disk_limit: int = RESULT_CACHE_DISK_LIMIT, ttl: int = RESULT_CACHE_TTL):
+        self.store = FileSystemTempStore(folder, disk_limit, ttl)
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    @staticmethod
+    def key(route: str, digests: Iterable[str], options: dict) -> str:
+        """Key cache dari nama route, hash isi file upload (urutan berpengaruh) dan opsi konversi"""
+        payload = json.dumps([route, list(digests), options], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Entry output di cache (path, offset, size, mimetype, extra) atau None"""
+        entry = self.store.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, mimetype: str, content: Union[str, bytes, None] = None,
+            path: Optional[str] = None, extra: Optional[dict] = None) -> Optional[dict]:
+        """Simpan output (isi, atau file di disk yang di-hard link tanpa dipindah), return entry atau None kalau gagal"""
+        try:
+            if path is not None:
+                self.store.put_range(key, key, mimetype, path, 0, os.path.getsize(path), extra=extra)
+            else:
+                self.store.put(key, key, mimetype, content=content, extra=extra)
+        except OSError:
+            return None
+        self.stored += 1
+        return self.store.get(key)
+
+    def stats(self) -> dict:
+        """Statistik hit/miss cache dan isi store di disk"""
+        stats = self.store.stats()
+        lookups = self.hits + self.misses
+        stats.update({
+            'stored': self.stored,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0
+        })
+        return stats
+
+
+def create_result_cache(folder: str) -> Optional[ResultCache]:
+    """Buat cache hasil konversi, None kalau dimatikan (RESULT_CACHE_DISK_LIMIT=0)"""
+    if RESULT_CACHE_DISK_LIMIT <= 0:
+        return None
+    return ResultCache(folder)
+
+
+class SQLiteDatabase:
+    """Koneksi SQLite per thread (mode WAL) ke file database yang dipakai bersama semua worker"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        """Koneksi milik thread ini; pakai `with db.connection() as conn:` supaya transaksi di-commit"""
+        conn = getattr(self._local, 'conn', None)
+        # Koneksi tidak boleh dipakai ulang di process hasil fork
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+
+class MemorySessionStore:
+    """Session aktif per API key di memori process (cukup untuk 1 worker gunicorn)"""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, api_key: str) -> Optional[dict]:
+        with self._lock:
+            data = self._sessions.get(api_key)
+            return dict(data) if data is not None else None
+
+    def put(self, api_key: str, data: dict) -> None:
+        with self._lock:
+            self._sessions[api_key] = dict(data)
+
+    def update(self, api_key: str, **fields) -> None:
+        with self._lock:
+            if api_key in self._sessions:
+                self._sessions[api_key].update(fields)
+
+    def delete(self, api_key: str) -> None:
+        with self._lock:
+            self._sessions.pop(api_key, None)
+
+
+class SQLiteSessionStore:
+    """Session aktif per API key di file SQLite, dipakai bersama semua worker"""
+
+    def __init__(self, path: str):
+        self.db = SQLiteDatabase(path)
+        with self.db.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    api_key TEXT PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    login_time TEXT NOT NULL,
+                    last_activity TEXT NOT NULL,
+                    user_info TEXT NOT NULL,
+                    is_active INTEGER NOT NULL
+                )
+            ''')
+
+    def get(self, api_key: str) -> Optional[dict]:
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT session_id, login_time, last_activity, user_info, is_active FROM sessions WHERE api_key = ?",
+                (api_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'session_id': row[0],
+            'login_time': datetime.fromisoformat(row[1]),
+            'last_activity': datetime.fromisoformat(row[2]),
+            'user_info': json.loads(row[3]),
+            'is_active': bool(row[4])
+        }
+
+    def put(self, api_key: str, data: dict) -> None:
+        with self.db.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (api_key, session_id, login_time, last_activity, user_info, is_active) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (api_key, data['session_id'], data['login_time'].isoformat(), data['last_activity'].isoformat(),
+                 json.dumps(data.get('user_info') or {}), int(data.get('is_active', True)))
+            )
+
+    def update(self, api_key: str, **fields) -> None:
+        columns = {}
+        if 'last_activity' in fields:
+            columns['last_activity'] = fields['last_activity'].isoformat()
+        if 'is_active' in fields:
+            columns['is_active'] = int(fields['is_active'])
+        if not columns:
+            return
+        assignments = ', '.join(f"{column} = ?" for column in columns)
+        with self.db.connection() as conn:
+            conn.execute(f"UPDATE sessions SET {assignments} WHERE api_key = ?", list(columns.values()) + [api_key])
+
+    def delete(self, api_key: str) -> None:
+        with self.db.connection() as conn:
+            conn.execute("DELETE FROM sessions WHERE api_key = ?", (api_key,))
+
+
+def create_session_store(db_path: str):
+    """Buat store session sesuai konfigurasi SESSION_STORE"""
+    if SESSION_STORE == 'memory':
+        return MemorySessionStore()
+    return SQLiteSessionStore(db_path)
@@ -0,0 +1,74 @@
+"""
+Dedupe nomor saat gabung: BloomDedupe harus memberi hasil yang sama persis dengan ExactDedupe
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+
+
+def _keys(count, seed=1):
+    rng = random.Random(seed)
+    # Banyak duplikat: nomor diambil dari rentang kecil
+    return [6281200000000 + rng.randrange(count // 2) for _ in range(count)]
+
+
+def test_bloom_false_positive_falls_back_to_sqlite():
+    # Filter 64 bit untuk ribuan key: hampir semua jawaban "mungkin sudah ada" adalah false positive
+    bloom = utils.BloomDedupe(1, error_rate=0.5, batch_size=10)
+    exact = utils.ExactDedupe()
+    try:
+        keys = _keys(2000)
+        assert [bloom.add(key) for key in keys] == [exact.add(key) for key in keys]
+        assert bloom.disk_checks > 0
+    finally:
+        bloom.close()
+        exact.close()
+
+
+def test_bloom_pending_batch_duplicate():
+    # Duplikat yang belum di-flush ke SQLite tetap terdeteksi
+    bloom = utils.BloomDedupe(1000, batch_size=1000)
+    try:
+        assert bloom.add(6281200000001)
+        assert not bloom.add(6281200000001)
+        assert bloom.add(6281200000002)
+    finally:
+        bloom.close()
+
+
+def test_create_dedupe_threshold(monkeypatch):
+    monkeypatch.setattr(utils, 'DEDUPE_EXACT_LIMIT', 100)
+    exact = utils.create_dedupe(100)
+    bloom = utils.create_dedupe(101)
+    try:
+        assert exact.mode == 'exact'
+        assert bloom.mode == 'bloom'
+    finally:
+        exact.close()
+        bloom.close()
+
+
+def test_dedupe_txt_content_keeps_lines_without_number():
+    dedupe = utils.ExactDedupe()
+    content = 'Daftar\n081234567890\n+6281234567890\n\ncatatan\n081234567891'
+    assert utils.dedupe_txt_content(content, dedupe) == ('Daftar\n081234567890\n\ncatatan\n081234567891', 1)
+    # Nomor dari file sebelumnya ikut dihitung duplikat
+    assert utils.dedupe_txt_content('081234567891\n081234567892', dedupe) == ('081234567892', 1)
+
+
+def test_merge_vcf_contacts_dedupe_bloom_matches_exact(monkeypatch):
+    contents = ['\n'.join(f'BEGIN:VCARD\nFN:C{i}\nTEL:+62812{key % 10000000:07d}\nEND:VCARD'
+                          for i, key in enumerate(_keys(300, seed)))
+                for seed in (1, 2)]
+    exact_duplicates = []
+    exact = utils.merge_vcf_contacts(contents, duplicates=exact_duplicates)
+    monkeypatch.setattr(utils, 'DEDUPE_EXACT_LIMIT', 0)
+    bloom_duplicates = []
+    bloom = utils.merge_vcf_contacts(contents, duplicates=bloom_duplicates)
+    assert sum(exact_duplicates) > 0
+    assert bloom_duplicates == exact_duplicates
+    assert [(contact.name, contact.phone) for contact in bloom] == [(contact.name, contact.phone) for contact in exact]
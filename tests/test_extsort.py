@@ -0,0 +1,79 @@
+"""
+External sort: hasil sama dengan sorted() untuk run di disk dan merge bertahap (fan-in kecil)
+"""
+import functools
+import io
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+from extsort import ExternalSorter  # noqa: E402
+
+
+def _lines(count, seed=1):
+    rng = random.Random(seed)
+    return [f"{rng.randrange(count // 3):05d}\t{rng.choice(['a', 'b', 'ß', 'z'])}\n" for _ in range(count)]
+
+
+def test_multi_pass_merge_order(tmp_path):
+    lines = _lines(100)
+    with ExternalSorter(str(tmp_path), run_lines=3, fan_in=2) as sorter:
+        sorter.extend(lines)
+        assert list(sorter.iter_sorted()) == sorted(lines)
+        # 34 run awal, fan-in 2: run hasil merge bertahap juga ditulis ke disk
+        assert sorter.runs_written > 34
+    assert os.listdir(tmp_path) == []
+
+
+def test_in_memory_run_skips_disk(tmp_path):
+    lines = _lines(30)
+    with ExternalSorter(str(tmp_path), run_lines=100) as sorter:
+        sorter.extend(lines)
+        assert list(sorter.iter_sorted()) == sorted(lines)
+        assert sorter.runs_written == 0
+
+
+def test_close_after_partial_read_removes_runs(tmp_path):
+    sorter = ExternalSorter(str(tmp_path), run_lines=5, fan_in=3)
+    sorter.extend(_lines(60))
+    sorted_lines = sorter.iter_sorted()
+    next(sorted_lines)
+    assert os.listdir(tmp_path)
+    sorted_lines.close()
+    sorter.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_external_merge_vcf_matches_memory_merge(monkeypatch, tmp_path):
+    rng = random.Random(3)
+    contents = ['\n'.join(f'BEGIN:VCARD\nFN:Kontak {rng.randrange(50)}\nTEL:+62812{rng.randrange(40):07d}\nEND:VCARD'
+                          for _ in range(80))
+                for _ in range(3)]
+    expected_duplicates = []
+    expected = '\n\n'.join(utils.merge_vcf_contacts(contents, duplicates=expected_duplicates).iter_vcf())
+
+    monkeypatch.setattr(utils, 'ExternalSorter', functools.partial(ExternalSorter, run_lines=7, fan_in=2))
+    output = io.BytesIO()
+    duplicates = []
+    count = utils.external_merge_vcf([io.BytesIO(content.encode('utf-8')) for content in contents], output,
+                                     duplicates=duplicates, directory=str(tmp_path))
+    assert sum(duplicates) > 0
+    assert duplicates == expected_duplicates
+    assert output.getvalue().decode('utf-8') == expected
+    assert count == expected.count('BEGIN:VCARD')
+    assert os.listdir(tmp_path) == []
+
+
+def test_external_merge_sort_by_number_with_dedupe(monkeypatch):
+    monkeypatch.setattr(utils, 'ExternalSorter', functools.partial(ExternalSorter, run_lines=4, fan_in=2))
+    items = [(file_index, str(6281200000000 + number), '', f'p{file_index}-{seq}')
+             for seq, (file_index, number) in enumerate([(0, 5), (0, 3), (1, 5), (1, 1), (1, 3), (2, 2), (2, 5)])]
+    items.append((2, '', '', 'tanpa-nomor'))
+    duplicates = [0, 0, 0]
+    merged = list(utils.external_merge(items, 'number', duplicates))
+    # Nomor yang sama: item pertama (urutan masuk) yang dipakai; item tanpa nomor di akhir
+    assert merged == [(1, 'p1-3'), (2, 'p2-5'), (0, 'p0-1'), (0, 'p0-0'), (2, 'tanpa-nomor')]
+    assert duplicates == [0, 2, 1]
@@ -0,0 +1,88 @@
+"""
+Job background: status queued -> running -> done/failed di kedua backend store
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jobs  # noqa: E402
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return jobs.MemoryJobStore()
+    return jobs.SQLiteJobStore(str(tmp_path / 'jobs.db'))
+
+
+def _wait(queue, job_id, statuses, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} masih {queue.get(job_id)['status']}")
+
+
+def test_job_status_transitions(store):
+    queue = jobs.JobQueue(store, workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(progress, count):
+        started.set()
+        release.wait(5)
+        lines = list(progress.track_lines(str(i) for i in range(count)))
+        progress.add(contacts=len(lines))
+        return {'files': lines}
+
+    first = queue.submit('convert', blocking, 3, owner='KEY-1')
+    assert started.wait(5)
+    # 1 worker sedang sibuk: job kedua masih antri
+    second = queue.submit('convert', lambda progress: {'ok': True})
+    assert queue.get(first)['status'] == jobs.JOB_RUNNING
+    assert queue.get(second)['status'] == jobs.JOB_QUEUED
+
+    release.set()
+    job = _wait(queue, first, (jobs.JOB_DONE, jobs.JOB_FAILED))
+    assert job['status'] == jobs.JOB_DONE
+    assert job['result'] == {'files': ['0', '1', '2']}
+    assert job['owner'] == 'KEY-1' and job['kind'] == 'convert'
+    assert (job['lines_processed'], job['contacts_found']) == (3, 3)
+    assert _wait(queue, second, (jobs.JOB_DONE, jobs.JOB_FAILED))['result'] == {'ok': True}
+
+
+def test_failed_job_keeps_error_and_progress(store):
+    queue = jobs.JobQueue(store, workers=1)
+
+    def failing(progress):
+        progress.add(lines=5, contacts=2)
+        raise ValueError('file rusak')
+
+    job = _wait(queue, queue.submit('split', failing), (jobs.JOB_DONE, jobs.JOB_FAILED))
+    assert job['status'] == jobs.JOB_FAILED
+    assert job['error'] == 'file rusak'
+    assert job['result'] is None
+    assert (job['lines_processed'], job['contacts_found']) == (5, 2)
+
+
+def test_unknown_job(store):
+    assert jobs.JobQueue(store, workers=1).get('tidak-ada') is None
+
+
+def test_finished_jobs_expire_on_create(store):
+    store.ttl = -1
+    store.create('selesai', 'convert')
+    store.update('selesai', status=jobs.JOB_DONE)
+    store.create('jalan', 'convert')
+    store.update('jalan', status=jobs.JOB_RUNNING)
+    store.create('baru', 'convert')
+    assert store.get('selesai') is None
+    # Job yang belum selesai tidak pernah dibuang
+    assert store.get('jalan')['status'] == jobs.JOB_RUNNING
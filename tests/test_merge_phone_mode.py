@@ -0,0 +1,37 @@
+"""
+phone_mode gabung VCF: 'strict' hanya memakai nomor yang valid, 'lenient' tetap memakai hasil fallback
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+
+# Minimal 8 digit, tidak valid menurut phonenumbers: clean_phone_number mengembalikan fallback '+' + digit
+INVALID_PHONE = '+1 000 000 0000'
+VALID_PHONE = '081234567890'
+
+
+def _vcf(phones):
+    return '\n'.join(f'BEGIN:VCARD\nVERSION:3.0\nFN:C{i}\nTEL:{phone}\nEND:VCARD' for i, phone in enumerate(phones))
+
+
+def test_invalid_number_passes_clean_phone_number():
+    assert utils.clean_phone_number(INVALID_PHONE) == '+10000000000'
+    assert not utils.is_valid_e164('+10000000000')
+
+
+def test_merge_vcf_phones_strict_drops_invalid():
+    phones = [INVALID_PHONE, VALID_PHONE]
+    assert utils.merge_vcf_phones(phones, 'strict') == [(None, None), ('+6281234567890', '+6281234567890')]
+    assert utils.merge_vcf_phones(phones, 'lenient') == [('+10000000000', '+10000000000'),
+                                                         ('+6281234567890', '+6281234567890')]
+
+
+def test_merge_vcf_contacts_phone_modes():
+    content = _vcf([INVALID_PHONE, VALID_PHONE])
+    strict = utils.merge_vcf_contacts([content], phone_mode='strict')
+    lenient = utils.merge_vcf_contacts([content], phone_mode='lenient')
+    assert [contact.phone for contact in strict] == ['+6281234567890']
+    assert [contact.phone for contact in lenient] == ['+10000000000', '+6281234567890']
@@ -0,0 +1,61 @@
+"""
+Potongan file hasil: RangeReader dan put_range (hard link) tanpa copy isi
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import FileSystemTempStore, RangeReader  # noqa: E402
+
+
+def _write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+
+def test_range_reader_reads_slice(tmp_path):
+    path = _write(tmp_path / 'data', b'0123456789')
+    with RangeReader(path, 3, 4) as reader:
+        assert reader.read() == b'3456'
+    # Potongan melewati akhir file dipotong sampai akhir file
+    with RangeReader(path, 8, 10) as reader:
+        assert reader.read(1) == b'8'
+        assert reader.read() == b'9'
+
+
+def test_range_reader_empty_file(tmp_path):
+    path = _write(tmp_path / 'empty', b'')
+    with RangeReader(path, 0, 0) as reader:
+        assert reader.read() == b''
+    assert reader.closed
+
+
+def test_put_range_survives_pop_and_source_removal(tmp_path):
+    store = FileSystemTempStore(str(tmp_path / 'store'))
+    source = _write(tmp_path / 'hasil.txt', b'bagian-1|bagian-2|')
+    store.put_range('split_1', 'a.txt', 'text/plain', source, 0, 9)
+    store.put_range('split_2', 'b.txt', 'text/plain', source, 9, 9)
+    os.remove(source)
+
+    first = store.pop('split_1')
+    assert store.pop('split_1') is None
+    with RangeReader(first['path'], first['offset'], first['size']) as reader:
+        os.remove(first['path'])
+        assert reader.read() == b'bagian-1|'
+
+    # Potongan lain tetap utuh setelah link potongan pertama dihapus
+    second = store.get('split_2')
+    with RangeReader(second['path'], second['offset'], second['size']) as reader:
+        assert reader.read() == b'bagian-2|'
+    assert second['filename'] == 'b.txt' and second['size'] == 9
+
+
+def test_put_range_empty_file(tmp_path):
+    store = FileSystemTempStore(str(tmp_path / 'store'))
+    source = _write(tmp_path / 'kosong.txt', b'')
+    assert store.put_range('split_0', 'kosong.txt', 'text/plain', source, 0, 0) == 0
+    entry = store.pop('split_0')
+    with RangeReader(entry['path'], entry['offset'], entry['size']) as reader:
+        assert reader.read() == b''
@@ -0,0 +1,25 @@
+"""
+Key result cache ikut setting environment yang memengaruhi hasil konversi
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+from storage import ResultCache  # noqa: E402
+
+
+def _key():
+    return ResultCache.key('txt_to_vcf', ['digest'], {'name_prefix': '', 'settings': utils.output_settings()})
+
+
+def test_key_changes_with_output_settings(monkeypatch):
+    key = _key()
+    assert _key() == key
+    for name, value in (('PHONE_FAST_PATH', 'off'), ('PHONE_FAST_PATH_REGION', 'MY'),
+                        ('MERGE_PHONE_MODE', 'strict'), ('OUTPUT_VERSION', utils.OUTPUT_VERSION + 1)):
+        with monkeypatch.context() as patch:
+            patch.setattr(utils, name, value)
+            assert _key() != key, name
+    assert _key() == key
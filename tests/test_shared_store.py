@@ -0,0 +1,91 @@
+"""
+Store bersama semua worker: file hasil di folder bersama dan session di SQLite
+"""
+import os
+import sys
+import threading
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import FileSystemTempStore, SQLiteSessionStore  # noqa: E402
+
+
+def _read(entry):
+    with open(entry['path'], 'rb') as f:
+        return f.read()
+
+
+def test_entry_visible_to_other_worker_and_popped_once(tmp_path):
+    worker_a = FileSystemTempStore(str(tmp_path))
+    worker_b = FileSystemTempStore(str(tmp_path))
+    assert worker_a.put('convert_1', 'hasil.vcf', 'text/vcard', content='BEGIN:VCARD') == 11
+
+    entry = worker_b.get('convert_1')
+    assert entry['filename'] == 'hasil.vcf' and entry['mimetype'] == 'text/vcard'
+    assert _read(entry) == b'BEGIN:VCARD'
+
+    entry = worker_b.pop('convert_1')
+    assert _read(entry) == b'BEGIN:VCARD'
+    assert worker_a.get('convert_1') is None
+    assert worker_a.pop('convert_1') is None
+
+
+def test_concurrent_pop_claims_once(tmp_path):
+    stores = [FileSystemTempStore(str(tmp_path)) for _ in range(8)]
+    stores[0].put('merge_1', 'gabung.txt', 'text/plain', content=b'isi')
+    results = []
+    threads = [threading.Thread(target=lambda store=store: results.append(store.pop('merge_1'))) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len([entry for entry in results if entry is not None]) == 1
+
+
+def test_expired_entry_removed_on_pop(tmp_path):
+    FileSystemTempStore(str(tmp_path)).put('old_1', 'a.txt', 'text/plain', content='a')
+    expired = FileSystemTempStore(str(tmp_path), ttl=-1)
+    assert expired.get('old_1') is None
+    assert expired.pop('old_1') is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_invalid_file_id(tmp_path):
+    store = FileSystemTempStore(str(tmp_path))
+    assert store.get('../etc/passwd') is None
+    assert store.pop('a/b') is None
+
+
+def test_purge_evicts_least_recently_used(tmp_path):
+    store = FileSystemTempStore(str(tmp_path), disk_limit=12)
+    for i, file_id in enumerate(('f_1', 'f_2', 'f_3')):
+        store.put(file_id, f'{file_id}.txt', 'text/plain', content='123456')
+        os.utime(os.path.join(str(tmp_path), f'{file_id}.meta'), (1000 + i, 1000 + i))
+    # f_1 baru dipakai: f_2 yang paling lama tidak dipakai
+    store.get('f_1')
+    store.purge()
+    assert store.get('f_2') is None
+    assert store.get('f_1') is not None and store.get('f_3') is not None
+    assert store.evicted_lru == 1
+
+
+def test_sqlite_session_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    worker_a = SQLiteSessionStore(path)
+    worker_b = SQLiteSessionStore(path)
+    login = datetime(2024, 1, 2, 3, 4, 5)
+    worker_a.put('KEY-1', {'session_id': 's1', 'login_time': login, 'last_activity': login,
+                           'user_info': {'name': 'Andi'}})
+
+    session = worker_b.get('KEY-1')
+    assert session == {'session_id': 's1', 'login_time': login, 'last_activity': login,
+                       'user_info': {'name': 'Andi'}, 'is_active': True}
+
+    later = datetime(2024, 1, 2, 4, 0, 0)
+    worker_b.update('KEY-1', last_activity=later, is_active=False)
+    session = worker_a.get('KEY-1')
+    assert session['last_activity'] == later and session['is_active'] is False
+
+    worker_a.delete('KEY-1')
+    assert worker_b.get('KEY-1') is None
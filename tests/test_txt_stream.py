@@ -0,0 +1,33 @@
+"""
+iter_txt_stream_lines harus sama dengan decode isi file utuh (utf-8, fallback latin-1) lalu strip() dan split('\\n')
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+
+
+def _expected_lines(raw):
+    try:
+        content = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        content = raw.decode('latin-1')
+    return content.strip().split('\n')
+
+
+def test_iter_txt_stream_lines_mixed_encoding():
+    utf8_line = 'Budi Müller,081234567890'.encode('utf-8')
+    latin1_line = 'José,081298765432'.encode('latin-1')
+    samples = [
+        b'\n'.join([utf8_line, latin1_line, b'', utf8_line]) + b'\n\n',
+        # Byte tidak valid baru muncul setelah beberapa blok scan
+        b'\n'.join([utf8_line] * 10000 + [latin1_line]),
+        b'\n'.join([utf8_line] * 3),
+        b'  \n' + b'\n'.join([b'081111111111', b'082222222222']) + b'\n',
+    ]
+    for raw in samples:
+        stream = io.BytesIO(raw)
+        assert list(utils.iter_txt_stream_lines(stream)) == _expected_lines(raw)
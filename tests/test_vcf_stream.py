@@ -0,0 +1,43 @@
+"""
+iter_vcf_stream harus menghasilkan vCard yang sama dengan iter_vcards untuk isi file utuh
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+
+
+def _vcf_content(count, name):
+    return '\n'.join(
+        f'BEGIN:VCARD\nVERSION:3.0\nFN:{name} {i}\nTEL:+62812{i:07d}\nEND:VCARD' for i in range(count)
+    ).encode('utf-8')
+
+
+def test_iter_vcf_stream_non_ascii_small_blocks():
+    # 'ß' jadi 'SS' kalau di-upper(): offset dari teks upper() tidak cocok dengan teks asli
+    for name in ('Straße Weiß', 'Straße ' + 'ß' * 16, 'Straße ' + 'ß' * 32):
+        content = _vcf_content(50, name)
+        expected = [(card.name, card.tels) for card in utils.iter_vcards(content.decode('utf-8'))]
+        assert len(expected) == 50
+        for block_size in (7, 64, 100, 200, 1024 * 1024):
+            cards = [(card.name, card.tels) for card in utils.iter_vcf_stream(io.BytesIO(content), block_size)]
+            assert cards == expected, (name, block_size)
+
+
+def test_iter_vcf_stream_end_split_across_blocks():
+    # END:VCARD / newline terpotong di batas blok, huruf kecil, CRLF, dan kartu panjang di banyak blok
+    cards = [
+        'BEGIN:VCARD\r\nFN:Andi\r\nTEL:+6281200000001\r\nEND:VCARD\r\n',
+        'begin:vcard\nfn:Budi\ntel:+6281200000002\nend:vcard  \n',
+        'BEGIN:VCARD\nFN:Citra\nNOTE:' + 'x' * 5000 + '\nTEL:+6281200000003\nEND:VCARD\n',
+        'BEGIN:VCARD\nFN:Dewi\nTEL:+6281200000004\nEND:VCARD',
+    ]
+    content = ''.join(cards).encode('utf-8')
+    expected = [(card.name, card.tels) for card in utils.iter_vcards(content.decode('utf-8'))]
+    assert len(expected) == 4
+    for block_size in range(1, 40):
+        streamed = [(card.name, card.tels) for card in utils.iter_vcf_stream(io.BytesIO(content), block_size)]
+        assert streamed == expected, block_size
@@ -0,0 +1,29 @@
+"""
+iter_vcards: perilaku sama dengan parser VCF lama (kartu terakhir tanpa END:VCARD, pemisah baris '\\n')
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+
+
+def test_truncated_last_card_is_kept():
+    content = ('BEGIN:VCARD\r\nFN:Andi\r\nTEL:081234567890\r\nEND:VCARD\r\n'
+               'BEGIN:VCARD\r\nFN:Budi\r\nTEL:081298765432\r\n')
+    cards = list(utils.iter_vcards(content))
+    assert [(card.fn, card.tels) for card in cards] == [('Andi', ['081234567890']), ('Budi', ['081298765432'])]
+    assert [contact.name for contact in utils.vcf_to_contacts(content)] == ['Andi', 'Budi']
+    # Jalur stream juga menyimpan kartu terakhir
+    streamed = list(utils.iter_vcf_stream(io.BytesIO(content.encode('utf-8')), 16))
+    assert [(card.fn, card.tels) for card in streamed] == [(card.fn, card.tels) for card in cards]
+
+
+def test_only_newline_splits_lines():
+    # \x0c, \x1c, \x85 dan   dipecah str.splitlines() tapi bukan pemisah baris di parser lama
+    for separator in ('\x0b', '\x0c', '\x1c', '\x1e', '\x85', ' '):
+        content = f'BEGIN:VCARD\nFN:Andi{separator}TEL:0811\nTEL:081234567890\nEND:VCARD\n'
+        cards = list(utils.iter_vcards(content))
+        assert [(card.fn, card.tels) for card in cards] == [(f'Andi{separator}TEL:0811', ['081234567890'])]
@@ -1,661 +1,2154 @@
-"""
-Utility functions untuk website operations
-"""
-import re
-import phonenumbers
-from typing import List, Optional, Tuple
-
-def clean_phone_number(phone: str) -> Optional[str]:
-    """Clean dan standardize phone number dengan auto-detection negara"""
-    if not phone:
-        return None
-    
-    try:
-        # Remove extra spaces and characters
-        phone = re.sub(r'[^\d+]', '', phone.strip())
-        
-        if not phone:
-            return None
-        
-        # Jika sudah ada + di awal, coba parse langsung
-        if phone.startswith('+'):
-            try:
-                parsed = phonenumbers.parse(phone, None)
-                if phonenumbers.is_valid_number(parsed):
-                    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-            except:
-                pass
-        
-        # Jika tidak ada +, coba parse langsung dengan + di awal (mungkin sudah lengkap dengan country code)
-        if not phone.startswith('+') and len(phone) >= 8:
-            try:
-                test_phone = f'+{phone}'
-                parsed = phonenumbers.parse(test_phone, None)
-                if phonenumbers.is_valid_number(parsed):
-                    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-            except:
-                pass
-        
-        # List negara untuk auto-detection (diperluas untuk semua negara utama)
-        country_codes = [
-            # Asia Pacific
-            "ID", "MY", "SG", "TH", "PH", "VN", "JP", "KR", "CN", "IN", "PK", "BD", "AU", "NZ",
-            # Europe  
-            "GB", "DE", "FR", "IT", "ES", "NL", "BE", "CH", "AT", "SE", "NO", "DK", "FI", "PL", "RU", "TR",
-            # North America
-            "US", "CA", "MX",
-            # South America
-            "BR", "AR", "CL", "CO", "PE", "VE",
-            # Africa
-            "ZA", "EG", "NG", "KE", "MA",
-            # Middle East
-            "SA", "AE", "IL", "IR", "IQ", "JO", "LB", "KW", "QA", "BH", "OM"
-        ]
-        
-        # Coba parse dengan berbagai region (fallback)
-        for region in country_codes:
-            try:
-                parsed = phonenumbers.parse(phone, region)
-                if phonenumbers.is_valid_number(parsed):
-                    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-            except:
-                continue
-        
-        # Manual handling untuk format umum hanya untuk nomor lokal (dimulai 0)
-        if phone.startswith('0') and len(phone) >= 10:
-            # Nomor lokal, coba berbagai country code (diperluas)
-            common_codes = [
-                '62',   # Indonesia
-                '60',   # Malaysia  
-                '65',   # Singapore
-                '66',   # Thailand
-                '63',   # Philippines
-                '84',   # Vietnam
-                '81',   # Japan
-                '82',   # South Korea
-                '86',   # China
-                '91',   # India
-                '1',    # US/Canada
-                '44',   # UK
-                '49',   # Germany
-                '33',   # France
-                '39',   # Italy
-                '34',   # Spain
-                '31',   # Netherlands
-                '41',   # Switzerland
-                '46',   # Sweden
-                '47',   # Norway
-                '45',   # Denmark
-                '48',   # Poland
-                '7',    # Russia
-                '55',   # Brazil
-                '54',   # Argentina
-                '56',   # Chile
-                '57',   # Colombia
-                '51',   # Peru
-                '58',   # Venezuela
-                '27',   # South Africa
-                '20',   # Egypt
-                '234',  # Nigeria
-                '254',  # Kenya
-                '212',  # Morocco
-                '966',  # Saudi Arabia
-                '971',  # UAE
-                '972',  # Israel
-                '98',   # Iran
-                '964',  # Iraq
-                '962',  # Jordan
-                '961',  # Lebanon
-                '965',  # Kuwait
-                '974',  # Qatar
-                '973',  # Bahrain
-                '968'   # Oman
-            ]
-            for code in common_codes:
-                try:
-                    test_phone = f'+{code}{phone[1:]}'
-                    parsed = phonenumbers.parse(test_phone, None)
-                    if phonenumbers.is_valid_number(parsed):
-                        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-                except:
-                    continue
-        
-        # Jika tidak ada +, coba deteksi dari panjang dan pattern
-        if not phone.startswith('+') and len(phone) >= 8:
-            # Special handling untuk nomor yang dimulai dengan 1 (US/Canada format tanpa +)
-            if phone.startswith('1') and len(phone) >= 10:
-                try:
-                    test_phone = f'+{phone}'
-                    parsed = phonenumbers.parse(test_phone, None)
-                    if phonenumbers.is_valid_number(parsed):
-                        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-                except:
-                    pass
-            
-            # Coba parse langsung dengan + di awal (mungkin sudah lengkap dengan country code)
-            try:
-                test_phone = f'+{phone}'
-                parsed = phonenumbers.parse(test_phone, None)
-                if phonenumbers.is_valid_number(parsed):
-                    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-            except:
-                pass
-            
-            # Pattern detection berdasarkan panjang nomor (hanya jika parsing langsung gagal)
-            if phone.startswith('0') and len(phone) >= 10:
-                # Nomor lokal, coba berbagai country code (gunakan list yang sama)
-                common_codes = [
-                    '62', '60', '65', '66', '63', '84', '81', '82', '86', '91',
-                    '1', '44', '49', '33', '39', '34', '31', '41', '46', '47',
-                    '45', '48', '7', '55', '54', '56', '57', '51', '58', '27',
-                    '20', '234', '254', '212', '966', '971', '972', '98', '964',
-                    '962', '961', '965', '974', '973', '968'
-                ]
-                for code in common_codes:
-                    try:
-                        test_phone = f'+{code}{phone[1:]}'
-                        parsed = phonenumbers.parse(test_phone, None)
-                        if phonenumbers.is_valid_number(parsed):
-                            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-                    except:
-                        continue
-            
-            # Special handling untuk nomor yang dimulai dengan angka tertentu (tanpa leading 0)
-            # Coba deteksi berdasarkan panjang dan pattern umum
-            if len(phone) >= 10:
-                # Untuk nomor 10-11 digit yang dimulai dengan 1 (kemungkinan US/Canada)
-                if phone.startswith('1') and len(phone) in [10, 11]:
-                    try:
-                        test_phone = f'+{phone}'
-                        parsed = phonenumbers.parse(test_phone, None)
-                        if phonenumbers.is_valid_number(parsed):
-                            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-                    except:
-                        pass
-                
-                # Untuk nomor panjang lainnya, coba berbagai country code
-                common_long_codes = ['86', '91', '7', '81', '82', '49', '33', '39', '34']
-                for code in common_long_codes:
-                    try:
-                        test_phone = f'+{code}{phone}'
-                        parsed = phonenumbers.parse(test_phone, None)
-                        if phonenumbers.is_valid_number(parsed):
-                            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-                    except:
-                        continue
-        
-        # Terakhir, return original jika valid format
-        if len(phone.replace('+', '')) >= 8:
-            return phone if phone.startswith('+') else f'+{phone}'
-        
-        return None
-    except Exception as e:
-        print(f"Error cleaning phone number {phone}: {e}")
-        return None
-
-def parse_txt_to_vcf(content: str, name_prefix: str = '') -> List[str]:
-    """Parse TXT content dan convert ke VCF format"""
-    try:
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        
-        if not lines:
-            return []
-        
-        # Calculate padding for line numbers
-        total_lines = len(lines)
-        padding = max(2, len(str(total_lines)))  # Minimal 2 digit
-        
-        vcf_contacts = []
-        
-        for line_num, line in enumerate(lines, 1):
-            name = None
-            phone = None
-            
-            # Parse different formats
-            if ',' in line:
-                # Format: Nama,Nomor
-                parts = line.split(',', 1)
-                if len(parts) == 2:
-                    name = parts[0].strip()
-                    phone = clean_phone_number(parts[1].strip())
-            elif ';' in line:
-                # Format: Nama;Nomor
-                parts = line.split(';', 1)
-                if len(parts) == 2:
-                    name = parts[0].strip()
-                    phone = clean_phone_number(parts[1].strip())
-            elif ':' in line:
-                # Format: Nama: Nomor
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    name = parts[0].strip()
-                    phone = clean_phone_number(parts[1].strip())
-            elif '-' in line and any(char.isdigit() for char in line):
-                # Format: Nama - Nomor
-                parts = line.split('-', 1)
-                if len(parts) == 2:
-                    name = parts[0].strip()
-                    phone = clean_phone_number(parts[1].strip())
-            else:
-                # Try to extract phone number from line
-                phone_pattern = r'[+0-9][0-9+\s\-()]{6,}'
-                matches = re.findall(phone_pattern, line)
-                for candidate in matches or [line]:
-                    candidate = candidate.strip()
-                    cleaned_phone = clean_phone_number(candidate)
-                    if cleaned_phone:
-                        phone = cleaned_phone
-                        # Use line number as name if no name found
-                        padded_num = str(line_num).zfill(padding)
-                        name = f"Contact {padded_num}"
-                        break
-            
-            # Generate VCF entry if we have valid phone
-            if phone and len(phone.replace('+', '')) >= 8:
-                if not name:
-                    padded_num = str(line_num).zfill(padding)
-                    name = f"Contact {padded_num}"
-                
-                # Apply name prefix if provided
-                if name_prefix:
-                    if name.startswith('Contact'):
-                        # For auto-generated names, replace "Contact" with prefix
-                        padded_num = str(line_num).zfill(padding)
-                        name = f"{name_prefix} {padded_num}"
-                    else:
-                        # For parsed names, add prefix
-                        name = f"{name_prefix} {name}"
-                
-                # Clean name
-                name = re.sub(r'[^\w\s]', '', name).strip()
-                if not name:
-                    padded_num = str(line_num).zfill(padding)
-                    name = f"Contact {padded_num}"
-                
-                vcf_entry = f"""BEGIN:VCARD
-VERSION:3.0
-FN:{name}
-N:{name};;;;
-TEL:{phone}
-END:VCARD"""
-                vcf_contacts.append(vcf_entry)
-        
-        return vcf_contacts
-        
-    except Exception as e:
-        print(f"Error parsing TXT to VCF: {e}")
-        return []
-
-def split_txt_file(content: str, chunk_size: int) -> List[str]:
-    """Split TXT file content menjadi chunks"""
-    try:
-        lines = content.split('\n')
-        
-        if not lines:
-            return []
-        
-        chunks = []
-        
-        for i in range(0, len(lines), chunk_size):
-            chunk_lines = lines[i:i + chunk_size]
-            chunk_content = '\n'.join(chunk_lines)
-            chunks.append(chunk_content)
-        
-        return chunks
-        
-    except Exception as e:
-        print(f"Error splitting TXT file: {e}")
-        return []
-
-def validate_txt_format(content: str) -> Tuple[bool, str, dict]:
-    """Validate TXT file format dan return statistics"""
-    try:
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        
-        if not lines:
-            return False, "File kosong", {}
-        
-        valid_contacts = 0
-        total_lines = len(lines)
-        detected_formats = []
-        
-        for line in lines:
-            if ',' in line:
-                detected_formats.append('comma')
-                parts = line.split(',', 1)
-                if len(parts) == 2:
-                    phone = clean_phone_number(parts[1].strip())
-                    if phone:
-                        valid_contacts += 1
-            elif ';' in line:
-                detected_formats.append('semicolon')
-                parts = line.split(';', 1)
-                if len(parts) == 2:
-                    phone = clean_phone_number(parts[1].strip())
-                    if phone:
-                        valid_contacts += 1
-            elif ':' in line:
-                detected_formats.append('colon')
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    phone = clean_phone_number(parts[1].strip())
-                    if phone:
-                        valid_contacts += 1
-            else:
-                # Try to extract phone number
-                phone_pattern = r'[+0-9][0-9+\s\-()]{6,}'
-                matches = re.findall(phone_pattern, line)
-                for candidate in matches or [line]:
-                    phone = clean_phone_number(candidate.strip())
-                    if phone:
-                        detected_formats.append('phone_only')
-                        valid_contacts += 1
-                        break
-        
-        stats = {
-            'total_lines': total_lines,
-            'valid_contacts': valid_contacts,
-            'success_rate': (valid_contacts / total_lines * 100) if total_lines > 0 else 0,
-            'detected_formats': list(set(detected_formats))
-        }
-        
-        if valid_contacts == 0:
-            return False, "Tidak ada nomor telepon valid ditemukan", stats
-        elif valid_contacts < total_lines * 0.5:
-            return True, f"Peringatan: Hanya {valid_contacts}/{total_lines} kontak valid ditemukan", stats
-        else:
-            return True, f"Format valid: {valid_contacts}/{total_lines} kontak ditemukan", stats
-            
-    except Exception as e:
-        return False, f"Error validating format: {str(e)}", {}
-
-def format_file_size(size_bytes: int) -> str:
-    """Format file size dalam human readable format"""
-    if size_bytes == 0:
-        return "0 B"
-    
-    size_names = ["B", "KB", "MB", "GB"]
-    i = 0
-    
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f} {size_names[i]}"
-
-
-def parse_vcf_to_txt(content: str, output_format: str = 'comma') -> List[str]:
-    """Parse VCF content dan convert ke TXT format"""
-    try:
-        # Split content by VCARD entries
-        vcards = content.split('BEGIN:VCARD')
-        contacts = []
-        
-        for vcard in vcards:
-            if not vcard.strip():
-                continue
-                
-            # Extract name and phone
-            name = None
-            phone = None
-            
-            lines = vcard.split('\n')
-            for line in lines:
-                line = line.strip()
-                
-                # Extract name (FN or N field)
-                if line.startswith('FN:'):
-                    name = line[3:].strip()
-                elif line.startswith('N:') and not name:
-                    n_parts = line[2:].split(';')
-                    if n_parts[0]:
-                        name = n_parts[0].strip()
-                
-                # Extract phone number
-                elif line.startswith('TEL:') or line.startswith('TEL;'):
-                    # Handle different TEL formats
-                    if ':' in line:
-                        phone = line.split(':', 1)[1].strip()
-                    
-            # Clean and validate data
-            if name and phone:
-                # Clean name
-                name = re.sub(r'[^\w\s]', '', name).strip()
-                if not name:
-                    name = "Unknown"
-                    
-                # Clean phone  
-                phone = clean_phone_number(phone)
-                
-                if phone:
-                    # Format output based on preference
-                    if output_format == 'comma':
-                        contacts.append(f"{name},{phone}")
-                    elif output_format == 'semicolon':
-                        contacts.append(f"{name};{phone}")
-                    elif output_format == 'colon':
-                        contacts.append(f"{name}: {phone}")
-                    elif output_format == 'dash':
-                        contacts.append(f"{name} - {phone}")
-                    elif output_format == 'space':
-                        contacts.append(f"{name} {phone}")
-                    elif output_format == 'phone_only':
-                        # HANYA NOMOR TELEPON TANPA NAMA DAN TANPA +
-                        phone_clean = phone.replace('+', '') if phone.startswith('+') else phone
-                        contacts.append(phone_clean)
-                    else:
-                        contacts.append(f"{name},{phone}")  # Default to comma
-        
-        return contacts
-        
-    except Exception as e:
-        print(f"Error parsing VCF to TXT: {e}")
-        return []
-
-
-def parse_admin_navy_to_vcf(admin_numbers: str, navy_numbers: str, admin_contact_name: str = 'Admin', navy_contact_name: str = 'Navy') -> List[str]:
-    """Parse admin and navy phone numbers and convert to VCF format with sequential naming"""
-    try:
-        vcf_contacts = []
-        
-        # Process admin numbers
-        if admin_numbers.strip():
-            admin_lines = [line.strip() for line in admin_numbers.split('\n') if line.strip()]
-            # Calculate padding for admin numbers
-            total_admin = len(admin_lines)
-            padding = max(2, len(str(total_admin)))  # Minimal 2 digit
-            
-            for i, line in enumerate(admin_lines, 1):
-                # Clean phone number
-                phone = clean_phone_number(line)
-                if phone and len(phone.replace('+', '')) >= 8:
-                    contact_number = str(i).zfill(padding)
-                    contact_name = f"{admin_contact_name} {contact_number}"
-                    
-                    vcf_entry = f"""BEGIN:VCARD
-VERSION:3.0
-FN:{contact_name}
-N:{contact_name};;;;
-TEL:{phone}
-END:VCARD"""
-                    vcf_contacts.append(vcf_entry)
-        
-        # Process navy numbers
-        if navy_numbers.strip():
-            navy_lines = [line.strip() for line in navy_numbers.split('\n') if line.strip()]
-            # Calculate padding for navy numbers
-            total_navy = len(navy_lines)
-            padding = max(2, len(str(total_navy)))  # Minimal 2 digit
-            
-            for i, line in enumerate(navy_lines, 1):
-                # Clean phone number
-                phone = clean_phone_number(line)
-                if phone and len(phone.replace('+', '')) >= 8:
-                    contact_number = str(i).zfill(padding)
-                    contact_name = f"{navy_contact_name} {contact_number}"
-                    
-                    vcf_entry = f"""BEGIN:VCARD
-VERSION:3.0
-FN:{contact_name}
-N:{contact_name};;;;
-TEL:{phone}
-END:VCARD"""
-                    vcf_contacts.append(vcf_entry)
-        
-        return vcf_contacts
-        
-    except Exception as e:
-        print(f"Error parsing admin/navy to VCF: {e}")
-        return []
-
-def parse_admin_navy_to_vcf_with_start(admin_numbers: str, navy_numbers: str, 
-                                     admin_name_prefix: str = 'Admin', navy_name_prefix: str = 'Navy',
-                                     admin_start_number: int = 1, navy_start_number: int = 1) -> List[str]:
-    """Parse admin and navy phone numbers with custom start numbers and convert to VCF format"""
-    try:
-        vcf_contacts = []
-        
-        # Process admin numbers
-        if admin_numbers.strip():
-            admin_lines = [line.strip() for line in admin_numbers.split('\n') if line.strip()]
-            # Calculate padding needed based on total number of contacts
-            total_admin = len(admin_lines)
-            max_number = admin_start_number + total_admin - 1
-            padding = max(2, len(str(max_number)))  # Minimal 2 digit
-            
-            for i, line in enumerate(admin_lines):
-                # Clean phone number
-                phone = clean_phone_number(line)
-                if phone and len(phone.replace('+', '')) >= 8:
-                    contact_number = str(admin_start_number + i).zfill(padding)
-                    contact_name = f"{admin_name_prefix} {contact_number}"
-                    
-                    vcf_entry = f"""BEGIN:VCARD
-VERSION:3.0
-FN:{contact_name}
-N:{contact_name};;;;
-TEL:{phone}
-END:VCARD"""
-                    vcf_contacts.append(vcf_entry)
-        
-        # Process navy numbers
-        if navy_numbers.strip():
-            navy_lines = [line.strip() for line in navy_numbers.split('\n') if line.strip()]
-            # Calculate padding needed based on total number of contacts
-            total_navy = len(navy_lines)
-            max_number = navy_start_number + total_navy - 1
-            padding = max(2, len(str(max_number)))  # Minimal 2 digit
-            
-            for i, line in enumerate(navy_lines):
-                # Clean phone number
-                phone = clean_phone_number(line)
-                if phone and len(phone.replace('+', '')) >= 8:
-                    contact_number = str(navy_start_number + i).zfill(padding)
-                    contact_name = f"{navy_name_prefix} {contact_number}"
-                    
-                    vcf_entry = f"""BEGIN:VCARD
-VERSION:3.0
-FN:{contact_name}
-N:{contact_name};;;;
-TEL:{phone}
-END:VCARD"""
-                    vcf_contacts.append(vcf_entry)
-        
-        return vcf_contacts
-        
-    except Exception as e:
-        print(f"Error parsing admin/navy to VCF with start numbers: {e}")
-        return []
-
-def merge_vcf_files(vcf_contents_list: List[str], contact_name_prefix: str = 'Gabung') -> List[str]:
-    """Merge multiple VCF file contents into one with sequential naming - Optimized"""
-    try:
-        merged_vcf_contacts = []
-        contact_counter = 1
-        
-        # First pass: count total contacts to calculate padding
-        total_contacts = 0
-        for vcf_content in vcf_contents_list:
-            if vcf_content.strip():
-                import re
-                total_contacts += len(re.findall(r'BEGIN:VCARD', vcf_content))
-        
-        # Calculate padding
-        padding = max(2, len(str(total_contacts)))  # Minimal 2 digit
-        
-        for vcf_content in vcf_contents_list:
-            if not vcf_content.strip():
-                continue
-            
-            # Optimized: Use regex to find all VCARD blocks at once
-            import re
-            vcard_pattern = r'BEGIN:VCARD(.*?)END:VCARD'
-            vcards = re.findall(vcard_pattern, vcf_content, re.DOTALL)
-            
-            for vcard_content in vcards:
-                # Optimized: Use regex to extract phone number directly
-                tel_pattern = r'TEL[^:]*:([^\r\n]+)'
-                tel_match = re.search(tel_pattern, vcard_content)
-                
-                if tel_match:
-                    phone = tel_match.group(1).strip()
-                    
-                    # Quick clean phone number (simplified for speed)
-                    cleaned_phone = ''.join(filter(str.isdigit, phone))
-                    if len(cleaned_phone) >= 10:  # Basic validation
-                        # Add + if not present and looks like international
-                        if not phone.startswith('+') and len(cleaned_phone) > 10:
-                            cleaned_phone = '+' + cleaned_phone
-                        elif phone.startswith('+'):
-                            cleaned_phone = '+' + cleaned_phone
-                        else:
-                            cleaned_phone = phone  # Keep original format
-                        
-                        contact_number = str(contact_counter).zfill(padding)
-                        contact_name = f"{contact_name_prefix} {contact_number}"
-                        
-                        # Optimized: Direct string formatting
-                        vcf_entry = f"BEGIN:VCARD\nVERSION:3.0\nFN:{contact_name}\nN:{contact_name};;;;\nTEL:{cleaned_phone}\nEND:VCARD"
-                        merged_vcf_contacts.append(vcf_entry)
-                        contact_counter += 1
-        
-        return merged_vcf_contacts
-        
-    except Exception as e:
-        print(f"Error merging VCF files: {e}")
-        return []
-
-def analyze_vcf_file(content: str) -> dict:
-    """Analyze VCF file and return statistics - Optimized"""
-    try:
-        import re
-        
-        # Quick count using regex
-        vcard_count = len(re.findall(r'BEGIN:VCARD', content))
-        
-        # Quick phone extraction for preview (first 5 only)
-        tel_pattern = r'TEL[^:]*:([^\r\n]+)'
-        tel_matches = re.findall(tel_pattern, content)
-        
-        # Quick preview without full parsing
-        preview_contacts = []
-        for i, phone in enumerate(tel_matches[:5]):
-            phone_clean = ''.join(filter(str.isdigit, phone.strip()))
-            if len(phone_clean) >= 10:
-                preview_contacts.append(phone.strip())
-        
-        return {
-            'total_contacts': len(tel_matches),
-            'total_vcards': vcard_count,
-            'preview': preview_contacts,
-            'has_valid_contacts': len(tel_matches) > 0
-        }
-        
-    except Exception as e:
-        print(f"Error analyzing VCF file: {e}")
-        return {
-            'total_contacts': 0,
-            'total_vcards': 0,
-            'preview': [],
-            'has_valid_contacts': False
-        }
+"""
+Utility functions untuk website operations
+"""
+import codecs
+import hashlib
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, compress, islice
+import phonenumbers
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from extsort import ExternalSorter
+
+logger = logging.getLogger(__name__)
+
+# Ukuran maksimal cache normalisasi nomor (0 = cache dimatikan)
+PHONE_CACHE_SIZE = int(os.environ.get('PHONE_CACHE_SIZE', 100000))
+
+# Parsing paralel (opt-in): jumlah worker process, 0 = parsing di thread request saja
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', 0))
+# Minimal jumlah baris sebelum parsing paralel dipakai, dan ukuran shard per task
+PARALLEL_MIN_LINES = int(os.environ.get('PARALLEL_MIN_LINES', 20000))
+PARALLEL_SHARD_LINES = int(os.environ.get('PARALLEL_SHARD_LINES', 5000))
+# Multi convert (banyak file sekaligus): jumlah file yang diproses bersamaan di process pool parsing
+# (butuh PARSE_WORKERS > 0, 0 = file diproses satu per satu) dan total ukuran isi upload yang boleh
+# sedang diproses / menunggu dikirim sesuai urutan
+MULTI_FILE_CONCURRENCY = int(os.environ.get('MULTI_FILE_CONCURRENCY', PARSE_WORKERS * 2))
+MULTI_FILE_MEMORY_BUDGET = int(os.environ.get('MULTI_FILE_MEMORY_BUDGET', 256 * 1024 * 1024))
+
+# Fast path nomor region dominan sebelum phonenumbers: 'strict' (divalidasi pola metadata,
+# hasil sama dengan jalur phonenumbers), 'loose' (cek prefix + panjang nomor seluler saja), 'off'
+PHONE_FAST_PATH = os.environ.get('PHONE_FAST_PATH', 'strict')
+PHONE_FAST_PATH_REGION = os.environ.get('PHONE_FAST_PATH_REGION', 'ID')
+
+# Cache hasil parse TXT per hash isi file (validasi lalu convert tidak normalisasi ulang):
+# jumlah file dan total kontak maksimal di cache, 0 = cache dimatikan
+TXT_PARSE_CACHE_SIZE = int(os.environ.get('TXT_PARSE_CACHE_SIZE', 16))
+TXT_PARSE_CACHE_CONTACTS = int(os.environ.get('TXT_PARSE_CACHE_CONTACTS', 2000000))
+
+# Dedupe nomor saat gabung: sampai DEDUPE_EXACT_LIMIT nomor dicek dengan set di memori, di atas itu
+# Bloom filter di memori + verifikasi ke SQLite sementara di disk (memori terbatas, hasil tetap exact)
+DEDUPE_EXACT_LIMIT = int(os.environ.get('DEDUPE_EXACT_LIMIT', 1000000))
+DEDUPE_BLOOM_ERROR_RATE = float(os.environ.get('DEDUPE_BLOOM_ERROR_RATE', 0.01))
+
+# Nomor TEL saat gabung VCF: 'lenient' (dinormalisasi ke E.164, nomor yang gagal dinormalisasi tetap
+# dipakai hasil pembersihan cepat), 'strict' (hanya nomor yang valid menurut metadata phonenumbers
+# setelah normalisasi, hasil fallback '+' + digit dibuang),
+# 'quick' (pembersihan cepat digit saja tanpa normalisasi, perilaku lama)
+MERGE_PHONE_MODES = ('lenient', 'strict', 'quick')
+MERGE_PHONE_MODE = os.environ.get('MERGE_PHONE_MODE', 'lenient')
+
+# Naikkan kalau kode parser / normalisasi mengubah hasil konversi, supaya hasil lama di result cache tidak dipakai
+OUTPUT_VERSION = 1
+
+
+def output_settings() -> dict:
+    """Setting yang memengaruhi hasil konversi selain isi upload dan opsi form (ikut key result cache).
+
+    Setting yang hanya memengaruhi kecepatan / memori (worker, cache, dedupe exact vs Bloom) tidak ikut.
+    """
+    return {
+        'version': OUTPUT_VERSION,
+        'phonenumbers': phonenumbers.__version__,
+        'phone_fast_path': PHONE_FAST_PATH,
+        'phone_fast_path_region': PHONE_FAST_PATH_REGION,
+        'merge_phone_mode': MERGE_PHONE_MODE
+    }
+
+_SANITIZE_PHONE_RE = re.compile(r'[^\d+]')
+_NAME_CLEAN_RE = re.compile(r'[^\w\s]')
+# Pemisah nama dan nomor baris TXT, dicek berurutan: yang pertama ada di baris yang dipakai.
+# Baris "Nama - Nomor" tanpa digit sama sekali tidak mungkin punya nomor valid, jadi tidak perlu dicek terpisah.
+_TXT_DELIMITERS = {',': 'comma', ';': 'semicolon', ':': 'colon', '-': 'dash'}
+# Kandidat nomor di baris TXT tanpa pemisah
+_TXT_PHONE_RE = re.compile(r'[+0-9][0-9+\s\-()]{6,}')
+# Byte di awal / akhir baris yang membuat baris TXT perlu di-strip atau dibuang: whitespace ASCII (newline = baris
+# kosong) dan byte non-ASCII (bisa jadi whitespace Unicode, dicek lewat jalur normalisasi)
+_TXT_EDGE = rb'[\s\x1c-\x1f\x80-\xff]'
+_TXT_EDGE_RE = re.compile(_TXT_EDGE)
+# Diawali newline literal supaya regex melompat antar newline, bukan mencoba di setiap byte
+_UNCLEAN_TXT_RE = re.compile(rb'\n(?:%s|(?<=%s\n))' % (_TXT_EDGE, _TXT_EDGE))
+# Ukuran blok saat scan buffer (count / decode per blok, tanpa menyalin seluruh isi)
+_SCAN_BLOCK_SIZE = 64 * 1024
+_MISSING = object()
+
+
+class PhoneNumberCache:
+    """LRU cache thread-safe untuk hasil normalisasi nomor telepon"""
+
+    def __init__(self, maxsize: int = PHONE_CACHE_SIZE):
+        self.maxsize = max(0, maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Ambil hasil dari cache, return _MISSING jika belum ada"""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Optional[str]) -> None:
+        """Simpan hasil normalisasi, buang entry paling lama jika penuh"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        """Ubah ukuran maksimal cache"""
+        with self._lock:
+            self.maxsize = max(0, maxsize)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Kosongkan cache dan reset counter"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Statistik cache (hit, miss, ukuran)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0
+            }
+
+
+# Cache global, dipakai bersama oleh semua parser lewat clean_phone_number
+phone_cache = PhoneNumberCache()
+
+_parse_pool = None
+_parse_pool_workers = 0
+_parse_pool_lock = threading.Lock()
+
+
+def clean_phone_number(phone: str) -> Optional[str]:
+    """Clean dan standardize phone number dengan auto-detection negara (cached)"""
+    if not phone:
+        return None
+    
+    phone = phone.strip()
+    # Nomor yang sudah bersih (digit ASCII, boleh diawali +) tidak perlu regex cleanup
+    digits = phone[1:] if phone.startswith('+') else phone
+    if not (digits.isdigit() and digits.isascii()):
+        # Remove extra spaces and characters
+        phone = _SANITIZE_PHONE_RE.sub('', phone)
+        
+        if not phone:
+            return None
+    
+    result = phone_fast_path.normalize(phone)
+    if result is not None:
+        return result
+    
+    result = phone_cache.get(phone)
+    if result is _MISSING:
+        result = _normalize_phone_number(phone)
+        phone_cache.set(phone, result)
+    return result
+
+
+_SANITIZE_PHONES_RE = re.compile(r'[^\d+\n]')
+
+
+def clean_phone_numbers(phones: Iterable[str]) -> List[Optional[str]]:
+    """clean_phone_number untuk banyak nomor sekaligus, hasil sesuai urutan input.
+
+    Semua nomor digabung per baris lalu dibersihkan dan diklasifikasi fast path dengan
+    1 regex pass masing-masing. Sisanya diproses sekali per nomor unik lewat cache.
+    """
+    phones = list(phones)
+    if not phones:
+        return []
+    text = '\n'.join(phones)
+    if text.count('\n') != len(phones) - 1:
+        # Ada nomor yang mengandung newline, tidak bisa diproses per baris
+        return [clean_phone_number(phone) for phone in phones]
+    
+    text = _SANITIZE_PHONES_RE.sub('', text)
+    cleaned = text.split('\n')
+    results = phone_fast_path.normalize_lines(text)
+    
+    # Nomor internasional dikelompokkan per kode negara, sisanya lewat cache / phonenumbers
+    resolved = phone_fast_path.normalize_international(
+        {phone for phone, result in zip(cleaned, results) if result is None and phone.startswith('+')})
+    for i, result in enumerate(results):
+        if result is None and cleaned[i]:
+            phone = cleaned[i]
+            result = resolved.get(phone, _MISSING)
+            if result is _MISSING:
+                result = phone_cache.get(phone)
+                if result is _MISSING:
+                    result = _normalize_phone_number(phone)
+                    phone_cache.set(phone, result)
+                resolved[phone] = result
+            results[i] = result
+    return results
+
+
+# List negara untuk auto-detection, urutan = prioritas (diperluas untuk semua negara utama)
+FALLBACK_REGIONS = (
+    # Asia Pacific
+    "ID", "MY", "SG", "TH", "PH", "VN", "JP", "KR", "CN", "IN", "PK", "BD", "AU", "NZ",
+    # Europe
+    "GB", "DE", "FR", "IT", "ES", "NL", "BE", "CH", "AT", "SE", "NO", "DK", "FI", "PL", "RU", "TR",
+    # North America
+    "US", "CA", "MX",
+    # South America
+    "BR", "AR", "CL", "CO", "PE", "VE",
+    # Africa
+    "ZA", "EG", "NG", "KE", "MA",
+    # Middle East
+    "SA", "AE", "IL", "IR", "IQ", "JO", "LB", "KW", "QA", "BH", "OM"
+)
+
+# Country code yang dicoba untuk nomor lokal (dimulai 0), urutan = prioritas
+LOCAL_COUNTRY_CODES = (
+    '62',   # Indonesia
+    '60',   # Malaysia
+    '65',   # Singapore
+    '66',   # Thailand
+    '63',   # Philippines
+    '84',   # Vietnam
+    '81',   # Japan
+    '82',   # South Korea
+    '86',   # China
+    '91',   # India
+    '1',    # US/Canada
+    '44',   # UK
+    '49',   # Germany
+    '33',   # France
+    '39',   # Italy
+    '34',   # Spain
+    '31',   # Netherlands
+    '41',   # Switzerland
+    '46',   # Sweden
+    '47',   # Norway
+    '45',   # Denmark
+    '48',   # Poland
+    '7',    # Russia
+    '55',   # Brazil
+    '54',   # Argentina
+    '56',   # Chile
+    '57',   # Colombia
+    '51',   # Peru
+    '58',   # Venezuela
+    '27',   # South Africa
+    '20',   # Egypt
+    '234',  # Nigeria
+    '254',  # Kenya
+    '212',  # Morocco
+    '966',  # Saudi Arabia
+    '971',  # UAE
+    '972',  # Israel
+    '98',   # Iran
+    '964',  # Iraq
+    '962',  # Jordan
+    '961',  # Lebanon
+    '965',  # Kuwait
+    '974',  # Qatar
+    '973',  # Bahrain
+    '968'   # Oman
+)
+
+# Country code untuk nomor panjang tanpa leading 0 dan tanpa country code
+LONG_COUNTRY_CODES = ('86', '91', '7', '81', '82', '49', '33', '39', '34')
+
+
+class _RegionInfo:
+    """Metadata ringkas satu region untuk menyaring kandidat parse"""
+
+    __slots__ = ('region', 'country_code', 'idd_pattern', 'prefix_patterns', 'lengths')
+
+    def __init__(self, region, country_code, idd_pattern, prefix_patterns, lengths):
+        self.region = region
+        self.country_code = country_code
+        self.idd_pattern = idd_pattern
+        # None = ada transform rule, panjang NSN tidak bisa diprediksi
+        self.prefix_patterns = prefix_patterns
+        self.lengths = lengths
+
+
+class CountryCodeResolver:
+    """Resolver country code berbasis trie + metadata panjang nomor per region.
+
+    Hanya menyaring kandidat: region/country code yang lolos tetap divalidasi
+    oleh phonenumbers, jadi hasil E.164 sama dengan loop fallback lama.
+    """
+
+    def __init__(self, regions=FALLBACK_REGIONS):
+        self._trie = {}
+        self._lengths = {}
+        self._prefix_patterns = {}
+        for country_code, region_codes in phonenumbers.COUNTRY_CODE_TO_REGION_CODE.items():
+            self._insert(str(country_code), country_code)
+            lengths = set()
+            for region_code in region_codes:
+                metadata = self._metadata(country_code, region_code)
+                if metadata is not None:
+                    lengths.update(metadata.general_desc.possible_length)
+            self._lengths[country_code] = frozenset(lengths)
+            main_metadata = self._metadata(country_code, region_codes[0])
+            self._prefix_patterns[country_code] = self._national_prefix_patterns(main_metadata)
+        self.regions = [self._region_info(region) for region in regions]
+
+    @staticmethod
+    def _metadata(country_code, region_code):
+        return phonenumbers.PhoneMetadata.metadata_for_region_or_calling_code(country_code, region_code)
+
+    @staticmethod
+    def _national_prefix_patterns(metadata):
+        if metadata is None or not metadata.national_prefix_for_parsing:
+            return ()
+        if metadata.national_prefix_transform_rule:
+            return None
+        return (re.compile(metadata.national_prefix_for_parsing),)
+
+    def _insert(self, digits: str, country_code: int) -> None:
+        node = self._trie
+        for digit in digits:
+            node = node.setdefault(digit, {})
+        node[None] = country_code
+
+    def _region_info(self, region: str) -> _RegionInfo:
+        metadata = phonenumbers.PhoneMetadata.metadata_for_region(region)
+        country_code = metadata.country_code
+        idd_pattern = re.compile(metadata.international_prefix or 'NonMatch')
+        # Prefix nasional bisa di-strip dengan metadata region ini atau region utama country code-nya
+        own_patterns = self._national_prefix_patterns(metadata)
+        main_patterns = self._prefix_patterns[country_code]
+        if own_patterns is None or main_patterns is None:
+            prefix_patterns = None
+        else:
+            prefix_patterns = own_patterns + main_patterns
+        return _RegionInfo(region, country_code, idd_pattern, prefix_patterns, self._lengths[country_code])
+
+    def country_code(self, digits: str) -> Tuple[int, str]:
+        """Cari country code di awal digits (O(len) lewat trie), return (0, digits) jika tidak ada"""
+        node = self._trie
+        for i, digit in enumerate(digits[:3]):
+            node = node.get(digit)
+            if node is None:
+                break
+            if None in node:
+                return node[None], digits[i + 1:]
+        return 0, digits
+
+    @staticmethod
+    def _length_possible(nsn: str, prefix_patterns, lengths) -> bool:
+        if prefix_patterns is None or len(nsn) in lengths:
+            return True
+        # Kandidat NSN setelah prefix nasional di-strip (maksimal 2 kali oleh phonenumbers.parse)
+        for pattern in prefix_patterns:
+            match = pattern.match(nsn)
+            if match:
+                stripped = nsn[match.end():]
+                if len(stripped) in lengths:
+                    return True
+                for inner in prefix_patterns:
+                    match = inner.match(stripped)
+                    if match and len(stripped) - match.end() in lengths:
+                        return True
+        return False
+
+    def is_possible(self, country_code: int, nsn: str) -> bool:
+        """Cek apakah NSN mungkin valid untuk country code (syarat perlu, bukan cukup)"""
+        lengths = self._lengths.get(country_code)
+        if lengths is None:
+            return False
+        return self._length_possible(nsn, self._prefix_patterns[country_code], lengths)
+
+    def is_possible_international(self, digits: str) -> bool:
+        """Cek apakah '+digits' mungkin valid"""
+        country_code, nsn = self.country_code(digits)
+        return country_code != 0 and self.is_possible(country_code, nsn)
+
+    def regions_for(self, digits: str):
+        """Yield region (urut prioritas) yang mungkin menghasilkan nomor valid untuk digits"""
+        for info in self.regions:
+            if info.idd_pattern.match(digits):
+                # Diawali kode akses internasional region ini, country code tidak bisa ditebak
+                yield info.region
+            elif self._length_possible(digits, info.prefix_patterns, info.lengths):
+                yield info.region
+            elif (digits.startswith(str(info.country_code)) and
+                  self._length_possible(digits[len(str(info.country_code)):], info.prefix_patterns, info.lengths)):
+                yield info.region
+
+
+country_code_resolver = CountryCodeResolver()
+
+
+# Tipe nomor yang dicek phonenumbers.is_valid_number. Urutan tidak berpengaruh untuk valid/tidak,
+# tipe yang paling sering muncul ditaruh di depan supaya regex gabungannya cepat ketemu
+_NUMBER_TYPE_DESCS = ('mobile', 'fixed_line', 'premium_rate', 'toll_free', 'shared_cost', 'voip',
+                      'personal_number', 'pager', 'uan', 'voicemail')
+
+
+def _desc_regex(desc) -> Optional[str]:
+    """Regex yang sama dengan pengecekan 1 PhoneNumberDesc di phonenumbers (pola + panjang yang mungkin)"""
+    if desc is None or desc.national_number_pattern is None:
+        return None
+    pattern = f'(?:{desc.national_number_pattern})$'
+    if desc.possible_length:
+        lengths = '|'.join(rf'\d{{{length}}}' for length in desc.possible_length if length > 0)
+        if not lengths:
+            return None
+        pattern = f'(?=(?:{lengths})$){pattern}'
+    return pattern
+
+
+def _valid_number_pattern(metadata) -> str:
+    """Regex NSN valid untuk 1 region, sama dengan _number_type_helper != UNKNOWN di phonenumbers"""
+    types = [pattern for pattern in map(_desc_regex, (getattr(metadata, name) for name in _NUMBER_TYPE_DESCS))
+             if pattern is not None]
+    return f'(?={_desc_regex(metadata.general_desc)})(?:{"|".join(types) or "(?!)"})'
+
+
+class PhoneFastPath:
+    """Normalisasi langsung nomor region dominan (+62..., 62..., 08...) tanpa phonenumbers.parse.
+
+    Mode 'strict': NSN divalidasi dengan 1 regex gabungan dari metadata phonenumbers
+    (pola umum + salah satu pola tipe nomor), hasilnya sama dengan jalur phonenumbers.
+    Mode 'loose': cukup prefix nomor seluler + panjang yang mungkin. Nomor yang tidak
+    lolos dikembalikan None dan diproses jalur biasa.
+    """
+
+    def __init__(self, region: str = PHONE_FAST_PATH_REGION, mode: str = PHONE_FAST_PATH):
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._countries = {}
+        # Counter dipakai bersama oleh thread request/worker, update di bawah lock
+        self._lock = threading.Lock()
+        metadata = phonenumbers.PhoneMetadata.metadata_for_region(region)
+        if mode not in ('strict', 'loose') or metadata is None:
+            self.mode = 'off'
+            return
+        country_code = str(metadata.country_code)
+        self.prefix = f'+{country_code}'
+        # Prefix nasional (0...) hanya aman kalau region ini yang pertama dicoba jalur biasa
+        national_prefix = metadata.national_prefix if FALLBACK_REGIONS[0] == region else None
+        if national_prefix and metadata.national_prefix_for_parsing in (None, national_prefix) \
+                and not metadata.national_prefix_transform_rule:
+            prefixes = rf'\+?{country_code}|{national_prefix}'
+        else:
+            prefixes = rf'\+?{country_code}'
+        # NSN diawali 0 bisa di-strip lagi oleh phonenumbers, biarkan jalur biasa yang proses
+        # re.ASCII: digit non-ASCII (mis. angka Arab) tetap lewat phonenumbers yang mengonversinya
+        self._number_re = re.compile(rf'(?:{prefixes})([1-9]\d{{1,16}})', re.ASCII)
+        if mode == 'strict':
+            valid = _valid_number_pattern(metadata)
+        else:
+            mobile = metadata.mobile
+            leading = mobile.national_number_pattern[0]
+            valid = rf'{leading}(?:' + '|'.join(rf'\d{{{length - 1}}}' for length in mobile.possible_length) + ')$'
+        self._valid_re = re.compile(valid, re.ASCII)
+        # Versi multiline untuk banyak nomor sekaligus (1 nomor per baris): tepat 1 match per baris,
+        # group 1 berisi NSN kalau lolos fast path, None kalau tidak
+        self._lines_re = re.compile(rf'^(?:(?:{prefixes})(?={valid})([1-9]\d{{1,16}})$|.*$)', re.ASCII | re.MULTILINE)
+
+    def normalize(self, phone: str) -> Optional[str]:
+        """E.164 untuk nomor yang sudah dibersihkan, atau None kalau harus lewat jalur biasa"""
+        if self.mode == 'off':
+            return None
+        match = self._number_re.fullmatch(phone)
+        if match is not None:
+            nsn = match.group(1)
+            if self._valid_re.match(nsn):
+                self._count(1, 0)
+                return self.prefix + nsn
+        self._count(0, 1)
+        return None
+
+    def normalize_lines(self, text: str) -> List[Optional[str]]:
+        """normalize() untuk setiap baris text (nomor yang sudah dibersihkan) dengan 1 regex pass"""
+        if self.mode == 'off':
+            return [None] * (text.count('\n') + 1)
+        prefix = self.prefix
+        results = [prefix + nsn if nsn else None for nsn in
+                   (match.group(1) for match in self._lines_re.finditer(text))]
+        hits = len(results) - results.count(None)
+        self._count(hits, len(results) - hits)
+        return results
+
+    def _country(self, country_code: int) -> Optional[tuple]:
+        """Pola validasi kode negara: (regex prefix nasional region utama, [(leading digits, NSN valid) per region])"""
+        country = self._countries.get(country_code, _MISSING)
+        if country is _MISSING:
+            country = None
+            regions = phonenumbers.COUNTRY_CODE_TO_REGION_CODE.get(country_code, ())
+            metadatas = [phonenumbers.PhoneMetadata.metadata_for_region(region) for region in regions]
+            # Kode non-geografis (001) tidak didukung, selalu lewat phonenumbers
+            if metadatas and None not in metadatas:
+                prefix = metadatas[0].national_prefix_for_parsing
+                country = (re.compile(prefix) if prefix else None,
+                           [(re.compile(metadata.leading_digits) if metadata.leading_digits is not None else None,
+                             re.compile(_valid_number_pattern(metadata), re.ASCII))
+                            for metadata in metadatas])
+            self._countries[country_code] = country
+        return country
+
+    def normalize_international(self, phones: Iterable[str]) -> dict:
+        """Nomor +<kode negara><NSN> (sudah dibersihkan) yang pasti valid menurut metadata negaranya.
+
+        Nomor dikelompokkan per kode negara lalu divalidasi dengan pola yang dikompilasi sekali
+        per kode negara, meniru phonenumbers.parse + is_valid_number. Return dict nomor -> E.164;
+        nomor yang tidak pasti (prefix nasional, NSN diawali 0, tidak valid) tidak dimasukkan.
+        """
+        groups = {}
+        if self.mode == 'off':
+            return groups
+        for phone in phones:
+            if phone[:1] != '+' or phone[1:2] == '0' or not (phone[1:].isdigit() and phone.isascii()):
+                continue
+            for length in (1, 2, 3):
+                country_code = int(phone[1:1 + length])
+                if country_code in phonenumbers.COUNTRY_CODE_TO_REGION_CODE:
+                    nsn = phone[1 + length:]
+                    if 2 <= len(nsn) <= 17 and nsn[0] != '0':
+                        groups.setdefault(country_code, []).append((phone, nsn))
+                    break
+        
+        results = {}
+        for country_code, numbers in groups.items():
+            country = self._country(country_code)
+            if country is None:
+                continue
+            prefix_re, regions = country
+            for phone, nsn in numbers:
+                if prefix_re is not None and prefix_re.match(nsn):
+                    continue
+                # Region pertama yang leading digits-nya cocok (atau NSN-nya valid) menentukan validitas
+                for leading_re, valid_re in regions:
+                    if leading_re is not None:
+                        if leading_re.match(nsn):
+                            if valid_re.match(nsn):
+                                results[phone] = phone
+                            break
+                    elif valid_re.match(nsn):
+                        results[phone] = phone
+                        break
+        self._count(len(results), 0)
+        return results
+
+    def _count(self, hits: int, misses: int) -> None:
+        """Tambah counter hit/miss"""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'mode': self.mode,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0
+            }
+
+
+phone_fast_path = PhoneFastPath()
+
+
+def _parse_e164(phone: str, region: Optional[str] = None) -> Optional[str]:
+    """Parse + validasi satu kandidat, return E.164 atau None"""
+    try:
+        parsed = phonenumbers.parse(phone, region)
+        if phonenumbers.is_valid_number(parsed):
+            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    except:
+        pass
+    return None
+
+
+def is_valid_e164(phone: str) -> bool:
+    """Cek nomor E.164 hasil normalisasi valid menurut metadata phonenumbers.
+
+    Fallback terakhir _normalize_phone_number mengembalikan '+' + digit tanpa validasi
+    untuk nomor minimal 8 digit, jadi hasil clean_phone_number belum tentu valid.
+    """
+    try:
+        return phonenumbers.is_valid_number(phonenumbers.parse(phone))
+    except phonenumbers.NumberParseException:
+        return False
+
+
+def _normalize_phone_number(phone: str) -> Optional[str]:
+    """Normalisasi nomor yang sudah dibersihkan ke format E.164 (tanpa cache)"""
+    try:
+        resolver = country_code_resolver
+        has_plus = phone.startswith('+')
+        digits = phone[1:] if has_plus else phone
+        # '+' di tengah nomor: tidak bisa diprediksi, coba semua kandidat tanpa filter
+        indexed = '+' not in digits
+        
+        # Jika sudah ada + di awal, coba parse langsung
+        if has_plus:
+            result = _parse_e164(phone)
+            if result:
+                return result
+            # Fallback region hanya berpengaruh jika country code setelah + tidak dikenal
+            if indexed and resolver.country_code(digits)[0] != 0:
+                regions = ()
+            elif indexed:
+                regions = resolver.regions_for(digits)
+            else:
+                regions = FALLBACK_REGIONS
+            for region in regions:
+                result = _parse_e164(phone, region)
+                if result:
+                    return result
+        else:
+            # Coba parse langsung dengan + di awal (mungkin sudah lengkap dengan country code)
+            if len(phone) >= 8 and (not indexed or resolver.is_possible_international(phone)):
+                result = _parse_e164(f'+{phone}')
+                if result:
+                    return result
+            
+            # Coba parse dengan region yang mungkin saja (urutan sama dengan FALLBACK_REGIONS)
+            for region in resolver.regions_for(phone) if indexed else FALLBACK_REGIONS:
+                result = _parse_e164(phone, region)
+                if result:
+                    return result
+            
+            # Manual handling untuk format umum hanya untuk nomor lokal (dimulai 0)
+            if phone.startswith('0') and len(phone) >= 10:
+                national = phone[1:]
+                for code in LOCAL_COUNTRY_CODES:
+                    if not indexed or resolver.is_possible(int(code), national):
+                        result = _parse_e164(f'+{code}{national}')
+                        if result:
+                            return result
+            
+            # Untuk nomor panjang lainnya, coba berbagai country code
+            if len(phone) >= 10:
+                for code in LONG_COUNTRY_CODES:
+                    if not indexed or resolver.is_possible(int(code), phone):
+                        result = _parse_e164(f'+{code}{phone}')
+                        if result:
+                            return result
+        
+        # Terakhir, return original jika valid format
+        if len(phone.replace('+', '')) >= 8:
+            return phone if phone.startswith('+') else f'+{phone}'
+        
+        return None
+    except Exception as e:
+        logger.warning("Error cleaning phone number %s: %s", phone, e)
+        return None
+
+
+def contact_padding(total: int) -> int:
+    """Jumlah digit nomor urut kontak (minimal 2 digit)"""
+    return max(2, len(str(total)))
+
+
+def iter_upload_lines(stream, encoding: str = 'utf-8') -> Iterator[str]:
+    """Baca stream upload baris per baris, yield baris yang tidak kosong (sudah di-strip)"""
+    for raw_line in stream:
+        line = raw_line.decode(encoding).strip()
+        if line:
+            yield line
+
+
+def count_upload_lines(stream, encoding: str = 'utf-8') -> int:
+    """Pass pertama: hitung baris tidak kosong lalu kembalikan stream ke awal.
+
+    Sekaligus memvalidasi encoding, jadi error decode muncul sebelum response dikirim.
+    """
+    total = sum(1 for _ in iter_upload_lines(stream, encoding))
+    stream.seek(0)
+    return total
+
+
+def render_vcard(name: str, phone: str) -> str:
+    """Render 1 kontak ke vCard 3.0"""
+    return f"BEGIN:VCARD\nVERSION:3.0\nFN:{name}\nN:{name};;;;\nTEL:{phone}\nEND:VCARD"
+
+
+def render_txt_contact(name: str, phone: str, output_format: str = 'comma') -> str:
+    """Render 1 kontak ke 1 baris TXT sesuai output_format (default comma)"""
+    if output_format == 'semicolon':
+        return f"{name};{phone}"
+    elif output_format == 'colon':
+        return f"{name}: {phone}"
+    elif output_format == 'dash':
+        return f"{name} - {phone}"
+    elif output_format == 'space':
+        return f"{name} {phone}"
+    elif output_format == 'phone_only':
+        # HANYA NOMOR TELEPON TANPA NAMA DAN TANPA +
+        return phone.replace('+', '') if phone.startswith('+') else phone
+    return f"{name},{phone}"
+
+
+def _pack_phone(phone: str) -> int:
+    """Nomor "+<digit>" (tanpa 0 di depan) sebagai int, 0 kalau harus disimpan sebagai string"""
+    digits = phone[1:]
+    if phone[:1] == '+' and digits[:1] != '0' and len(digits) <= 19 and digits.isascii() and digits.isdigit():
+        return int(digits)
+    return 0
+
+
+class Contact:
+    """1 kontak (nama + nomor), hasil indexing / iterasi ContactList"""
+    __slots__ = ('name', 'phone')
+
+    def __init__(self, name: str, phone: str):
+        self.name = name
+        self.phone = phone
+
+    def __repr__(self) -> str:
+        return f"Contact({self.name!r}, {self.phone!r})"
+
+    def to_vcf(self) -> str:
+        return render_vcard(self.name, self.phone)
+
+    def to_txt(self, output_format: str = 'comma') -> str:
+        return render_txt_contact(self.name, self.phone, output_format)
+
+
+class ContactList:
+    """Kumpulan kontak hasil parser, disimpan di array paralel dan baru dirender ke VCF/TXT saat output.
+
+    Nomor E.164 disimpan sebagai int (array 'Q'), nomor lain tetap string di dict terpisah.
+    Nama None berarti nama otomatis name_prefix + nomor urut (zero-padded sesuai padding),
+    jadi penomoran ulang cukup mengubah nomor urut tanpa membuat string baru.
+    """
+    __slots__ = ('name_prefix', 'padding', '_names', '_numbers', '_phones', '_raw_phones')
+
+    def __init__(self, name_prefix: str = '', padding: int = 2):
+        self.name_prefix = name_prefix
+        self.padding = padding
+        self._names = []
+        self._numbers = array('I')
+        self._phones = array('Q')
+        self._raw_phones = {}
+
+    def __len__(self) -> int:
+        return len(self._phones)
+
+    def __getitem__(self, index: int) -> Contact:
+        return Contact(self.name(index), self.phone(index))
+
+    def __iter__(self) -> Iterator[Contact]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, phone: str, name: Optional[str] = None, number: int = 0) -> None:
+        """Tambah 1 kontak; name None = nama otomatis dengan nomor urut number"""
+        packed = _pack_phone(phone)
+        if not packed:
+            self._raw_phones[len(self._phones)] = phone
+        self._phones.append(packed)
+        self._numbers.append(number)
+        self._names.append(name)
+
+    def extend(self, other: 'ContactList') -> None:
+        """Tambahkan semua kontak dari ContactList lain (urutan tetap)"""
+        offset = len(self)
+        if other.name_prefix == self.name_prefix and other.padding == self.padding:
+            self._names.extend(other._names)
+        else:
+            # Nama otomatis dengan prefix/padding lain dijadikan nama biasa
+            self._names.extend(other.name(i) for i in range(len(other)))
+        self._numbers.extend(other._numbers)
+        self._phones.extend(other._phones)
+        for index, phone in other._raw_phones.items():
+            self._raw_phones[offset + index] = phone
+
+    def renumber(self, start: int = 1, padding: Optional[int] = None) -> None:
+        """Ganti semua nama jadi nama otomatis dengan nomor urut mulai dari start"""
+        if padding is not None:
+            self.padding = padding
+        self._names = [None] * len(self)
+        self._numbers = array('I', range(start, start + len(self)))
+
+    def name(self, index: int) -> str:
+        name = self._names[index]
+        if name is None:
+            return f"{self.name_prefix}{str(self._numbers[index]).zfill(self.padding)}"
+        return name
+
+    def phone(self, index: int) -> str:
+        packed = self._phones[index]
+        if packed:
+            return f"+{packed}"
+        return self._raw_phones[index % len(self)]
+
+    def iter_vcf(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """Render kontak [start:stop] ke vCard satu per satu"""
+        for i in range(*slice(start, stop).indices(len(self))):
+            yield render_vcard(self.name(i), self.phone(i))
+
+    def iter_txt(self, output_format: str = 'comma', start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """Render kontak [start:stop] ke baris TXT satu per satu"""
+        for i in range(*slice(start, stop).indices(len(self))):
+            yield render_txt_contact(self.name(i), self.phone(i), output_format)
+
+
+def _parse_txt_line(line: str, line_num: int, padding: int, name_prefix: str = '') -> Optional[Tuple[Optional[str], str]]:
+    """Parse satu baris TXT jadi (nama, nomor), return None jika tidak ada nomor valid.
+
+    Nama None berarti nama otomatis (prefix + nomor baris, lihat _txt_auto_prefix).
+    """
+    parsed = _split_txt_line(line)
+    if parsed is None:
+        return None
+    return _txt_contact_name(parsed[0], line_num, padding, name_prefix), parsed[1]
+
+
+def _split_txt_line(line: str) -> Optional[Tuple[Optional[str], str]]:
+    """Ambil (nama mentah, nomor) dari satu baris TXT, return None jika tidak ada nomor valid.
+
+    Nama mentah belum dibersihkan / diberi prefix (lihat _txt_contact_name), None kalau baris hanya nomor.
+    """
+    # Format: Nama,Nomor / Nama;Nomor / Nama: Nomor / Nama - Nomor (pemisah pertama di _TXT_DELIMITERS)
+    for delimiter in _TXT_DELIMITERS:
+        name, found, phone = line.partition(delimiter)
+        if found:
+            name = name.strip()
+            phone = clean_phone_number(phone)
+            break
+    else:
+        name = None
+        phone = _txt_line_phone(line)
+    
+    # Generate contact if we have valid phone
+    if not phone or len(phone.replace('+', '')) < 8:
+        return None
+    
+    return name, phone
+
+
+def _txt_line_phone(line: str) -> Optional[str]:
+    """Nomor valid dari baris TXT tanpa pemisah nama (kandidat nomor pertama yang valid)"""
+    # Baris yang hanya berisi nomor (paling umum) tidak perlu dicari kandidatnya
+    digits = line[1:] if line.startswith('+') else line
+    if digits.isdigit() and digits.isascii():
+        return clean_phone_number(line)
+    
+    for candidate in _TXT_PHONE_RE.findall(line) or [line]:
+        phone = clean_phone_number(candidate)
+        if phone:
+            return phone
+    return None
+
+
+def _txt_contact_name(name: Optional[str], line_num: int, padding: int, name_prefix: str = '') -> Optional[str]:
+    """Nama kontak dari nama mentah baris TXT, None berarti nama otomatis"""
+    # Nama kosong (atau "Contact..." kalau ada prefix) diganti nama otomatis
+    if not name or (name_prefix and name.startswith('Contact')):
+        return None
+    
+    # For parsed names, add prefix
+    if name_prefix:
+        name = f"{name_prefix} {name}"
+    
+    # Clean name
+    name = _NAME_CLEAN_RE.sub('', name).strip()
+    if not name:
+        name = f"Contact {str(line_num).zfill(padding)}"
+    
+    return name
+
+
+def _txt_auto_prefix(name_prefix: str) -> str:
+    """Bagian depan nama otomatis TXT to VCF ("Contact " atau prefix yang sudah dibersihkan)"""
+    if not name_prefix:
+        return 'Contact '
+    return (_NAME_CLEAN_RE.sub('', name_prefix) + ' ').lstrip()
+
+
+def iter_txt_to_vcf(lines: Iterable[str], name_prefix: str = '', padding: int = 2, start: int = 1,
+                    workers: int = 0) -> Iterator[str]:
+    """Convert baris TXT (sudah di-strip, tanpa baris kosong) ke vCard satu per satu.
+
+    padding harus dihitung dari total baris (lihat contact_padding / count_upload_lines)
+    supaya penomoran "Contact NN" sama dengan parse_txt_to_vcf. Jika workers > 0,
+    baris diproses paralel di process pool (lihat parallel_workers).
+    """
+    if workers > 0:
+        return _iter_txt_to_vcf_parallel(lines, name_prefix, padding, start, workers)
+    return _iter_txt_to_vcf_serial(lines, name_prefix, padding, start)
+
+
+def _iter_txt_to_vcf_serial(lines: Iterable[str], name_prefix: str, padding: int, start: int) -> Iterator[str]:
+    auto_prefix = _txt_auto_prefix(name_prefix)
+    for line_num, line in enumerate(lines, start):
+        parsed = _parse_txt_line(line, line_num, padding, name_prefix)
+        if parsed:
+            name, phone = parsed
+            if name is None:
+                name = auto_prefix + str(line_num).zfill(padding)
+            yield render_vcard(name, phone)
+
+
+def txt_lines_to_contacts(lines: Iterable[str], name_prefix: Optional[str] = '', padding: int = 2,
+                          start: int = 1) -> ContactList:
+    """Parse baris TXT (sudah di-strip, tanpa baris kosong) ke ContactList
+
+    Dengan name_prefix None nama yang disimpan masih nama mentah (lihat name_txt_contacts).
+    """
+    if name_prefix is None:
+        contacts = ContactList('', padding)
+        for line_num, line in enumerate(lines, start):
+            parsed = _split_txt_line(line)
+            if parsed:
+                contacts.append(parsed[1], parsed[0], line_num)
+        return contacts
+    
+    contacts = ContactList(_txt_auto_prefix(name_prefix), padding)
+    for line_num, line in enumerate(lines, start):
+        parsed = _parse_txt_line(line, line_num, padding, name_prefix)
+        if parsed:
+            contacts.append(parsed[1], parsed[0], line_num)
+    return contacts
+
+
+def _parse_txt_shard(lines: List[str], name_prefix: str, padding: int, start: int) -> ContactList:
+    """Dijalankan di worker process: parse satu shard baris berurutan (ContactList lebih kecil untuk di-pickle)"""
+    return txt_lines_to_contacts(lines, name_prefix, padding, start)
+
+
+def _iter_shards(lines: Iterable[str], shard_size: int) -> Iterator[List[str]]:
+    shard = []
+    for line in lines:
+        shard.append(line)
+        if len(shard) >= shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+def _iter_txt_to_vcf_parallel(lines: Iterable[str], name_prefix: str, padding: int, start: int,
+                              workers: int) -> Iterator[str]:
+    for contacts in _iter_txt_shards_parallel(lines, name_prefix, padding, start, workers):
+        yield from contacts.iter_vcf()
+
+
+def _iter_txt_shards_parallel(lines: Iterable[str], name_prefix: str, padding: int, start: int,
+                              workers: int) -> Iterator[ContactList]:
+    """Bagi baris ke shard berurutan, proses di process pool, yield hasil per shard sesuai urutan asli"""
+    pool = get_parse_pool(workers)
+    # Batasi shard yang sedang diproses supaya memori tetap terkendali untuk input streaming
+    max_pending = workers * 2
+    pending = deque()
+    try:
+        for shard in _iter_shards(lines, PARALLEL_SHARD_LINES):
+            pending.append(pool.submit(_parse_txt_shard, shard, name_prefix, padding, start))
+            start += len(shard)
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    except BrokenProcessPool:
+        # Worker mati (misal OOM), buang pool supaya request berikutnya membuat pool baru
+        reset_parse_pool()
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def get_parse_pool(workers: int = PARSE_WORKERS) -> ProcessPoolExecutor:
+    """Process pool global untuk parsing paralel, tetap hidup (warm) antar request"""
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is None or _parse_pool_workers != workers:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False)
+            _parse_pool = ProcessPoolExecutor(max_workers=workers)
+            _parse_pool_workers = workers
+        return _parse_pool
+
+
+def reset_parse_pool() -> None:
+    """Matikan process pool parsing (dibuat ulang saat dibutuhkan)"""
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False)
+        _parse_pool = None
+        _parse_pool_workers = 0
+
+
+def parallel_workers(total_lines: int) -> int:
+    """Jumlah worker untuk parsing paralel (0 = serial), sesuai PARSE_WORKERS dan ukuran input"""
+    if PARSE_WORKERS > 0 and total_lines >= PARALLEL_MIN_LINES:
+        return PARSE_WORKERS
+    return 0
+
+
+def iter_parallel_uploads(func: Callable[[bytes], Any], uploads: Iterable[Tuple[Any, Optional[bytes]]],
+                          serial_func: Optional[Callable[[bytes], Any]] = None,
+                          concurrency: int = MULTI_FILE_CONCURRENCY,
+                          memory_budget: int = MULTI_FILE_MEMORY_BUDGET) -> Iterator[Tuple[Any, Any]]:
+    """Jalankan func(data) untuk tiap (key, data) di process pool parsing, yield (key, hasil) sesuai urutan asli.
+
+    Hasil file pertama dikirim begitu selesai tanpa menunggu file lain. File yang sedang diproses dibatasi
+    concurrency dan total ukuran data memory_budget (1 file lebih besar dari budget tetap diproses sendirian).
+    data None tidak diproses (hasil None). Tanpa pool (PARSE_WORKERS / concurrency 0) dijalankan serial
+    dengan serial_func (default func).
+    """
+    serial_func = serial_func or func
+    if PARSE_WORKERS <= 0 or concurrency <= 0:
+        for key, data in uploads:
+            yield key, (None if data is None else serial_func(data))
+        return
+    
+    pool = get_parse_pool(PARSE_WORKERS)
+    pending = deque()
+    pending_bytes = 0
+    try:
+        for key, data in uploads:
+            if data is None:
+                pending.append((key, None, 0))
+                continue
+            # Tunggu file terdepan selesai sampai ada slot dan budget untuk file ini
+            while pending and (len(pending) >= concurrency or pending_bytes + len(data) > memory_budget):
+                done_key, future, size = pending.popleft()
+                pending_bytes -= size
+                yield done_key, (None if future is None else future.result())
+            pending.append((key, pool.submit(func, data), len(data)))
+            pending_bytes += len(data)
+        while pending:
+            done_key, future, _ = pending.popleft()
+            yield done_key, (None if future is None else future.result())
+    except BrokenProcessPool:
+        reset_parse_pool()
+        raise
+    finally:
+        for _, future, _ in pending:
+            if future is not None:
+                future.cancel()
+
+
+def parse_txt_to_contacts(content: str, name_prefix: str = '') -> ContactList:
+    """Parse TXT content ke ContactList (render dengan iter_vcf / iter_txt)"""
+    try:
+        lines = [line.strip() for line in content.split('\n') if line.strip()]
+        
+        if not lines:
+            return ContactList()
+        
+        # Calculate padding for line numbers
+        padding = contact_padding(len(lines))  # Minimal 2 digit
+        
+        workers = parallel_workers(len(lines))
+        if not workers:
+            return txt_lines_to_contacts(lines, name_prefix, padding)
+        
+        contacts = ContactList(_txt_auto_prefix(name_prefix), padding)
+        for shard_contacts in _iter_txt_shards_parallel(lines, name_prefix, padding, 1, workers):
+            contacts.extend(shard_contacts)
+        return contacts
+        
+    except Exception:
+        logger.exception("Error parsing TXT to VCF")
+        return ContactList()
+
+
+def parse_txt_to_vcf(content: str, name_prefix: str = '') -> List[str]:
+    """Parse TXT content dan convert ke VCF format"""
+    return list(parse_txt_to_contacts(content, name_prefix).iter_vcf())
+
+
+def name_txt_contacts(raw_contacts: ContactList, name_prefix: str = '') -> ContactList:
+    """ContactList dengan nama final dari hasil parse nama mentah (txt_lines_to_contacts dengan name_prefix None)"""
+    padding = raw_contacts.padding
+    contacts = ContactList(_txt_auto_prefix(name_prefix), padding)
+    contacts._names = [name if name is None else _txt_contact_name(name, line_num, padding, name_prefix)
+                       for name, line_num in zip(raw_contacts._names, raw_contacts._numbers)]
+    contacts._numbers = array('I', raw_contacts._numbers)
+    contacts._phones = array('Q', raw_contacts._phones)
+    contacts._raw_phones = dict(raw_contacts._raw_phones)
+    return contacts
+
+
+def _txt_line_format(line: str) -> str:
+    """Format baris TXT sesuai urutan pengecekan _split_txt_line"""
+    for delimiter, line_format in _TXT_DELIMITERS.items():
+        if delimiter in line:
+            return line_format
+    return 'phone_only'
+
+
+def txt_stats(total_lines: int, valid_contacts: int, detected_formats: Optional[Iterable[str]] = None) -> dict:
+    """Statistik validasi / konversi TXT"""
+    stats = {
+        'total_lines': total_lines,
+        'valid_contacts': valid_contacts,
+        'invalid_lines': total_lines - valid_contacts,
+        'success_rate': (valid_contacts / total_lines * 100) if total_lines > 0 else 0
+    }
+    if detected_formats is not None:
+        stats['detected_formats'] = sorted(set(detected_formats))
+    return stats
+
+
+def _parse_txt_raw(content: str, parallel: bool = True) -> Tuple[ContactList, dict]:
+    """Parse TXT content ke ContactList nama mentah + statistik (isi entry TxtParseCache)"""
+    lines = [line.strip() for line in content.split('\n') if line.strip()]
+    padding = contact_padding(len(lines))
+    
+    workers = parallel_workers(len(lines)) if parallel else 0
+    if workers:
+        contacts = ContactList('', padding)
+        for shard_contacts in _iter_txt_shards_parallel(lines, None, padding, 1, workers):
+            contacts.extend(shard_contacts)
+    else:
+        contacts = txt_lines_to_contacts(lines, None, padding)
+    
+    detected_formats = {_txt_line_format(lines[line_num - 1]) for line_num in contacts._numbers}
+    return contacts, txt_stats(len(lines), len(contacts), detected_formats)
+
+
+class TxtParseCache:
+    """LRU cache thread-safe hasil parse TXT (nama mentah, nomor ternormalisasi, statistik) per hash isi file
+
+    Dibatasi jumlah file dan total kontak. Cache ada per process, jadi validasi dan convert
+    yang ditangani worker berbeda tetap parse ulang.
+    """
+
+    def __init__(self, maxsize: int = TXT_PARSE_CACHE_SIZE, max_contacts: int = TXT_PARSE_CACHE_CONTACTS):
+        self.maxsize = max(0, maxsize)
+        self.max_contacts = max(0, max_contacts)
+        self.hits = 0
+        self.misses = 0
+        self.contacts = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[Tuple[ContactList, dict]]:
+        """Ambil hasil parse dari cache, return None jika belum ada"""
+        with self._lock:
+            parsed = self._data.get(digest)
+            if parsed is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(digest)
+            return parsed
+
+    def set(self, digest: str, parsed: Tuple[ContactList, dict]) -> None:
+        """Simpan hasil parse, buang entry paling lama jika jumlah file / kontak melebihi batas"""
+        if self.maxsize <= 0 or len(parsed[0]) > self.max_contacts:
+            return
+        with self._lock:
+            old = self._data.pop(digest, None)
+            if old is not None:
+                self.contacts -= len(old[0])
+            self._data[digest] = parsed
+            self.contacts += len(parsed[0])
+            while len(self._data) > self.maxsize or self.contacts > self.max_contacts:
+                _, (contacts, _) = self._data.popitem(last=False)
+                self.contacts -= len(contacts)
+
+    def clear(self) -> None:
+        """Kosongkan cache dan reset counter"""
+        with self._lock:
+            self._data.clear()
+            self.contacts = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Statistik cache (hit, miss, jumlah file dan kontak)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'contacts': self.contacts,
+                'max_contacts': self.max_contacts,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0
+            }
+
+
+# Cache global hasil parse TXT, diisi saat validasi / convert (lihat parse_txt_upload)
+txt_parse_cache = TxtParseCache()
+
+
+def content_digest(data: bytes) -> str:
+    """Hash isi file (blake2b) sebagai key cache"""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def upload_digest(stream, block_size: int = 1024 * 1024) -> str:
+    """content_digest dari stream upload (dibaca per blok) lalu kembalikan stream ke awal"""
+    hasher = hashlib.blake2b(digest_size=20)
+    for block in iter(lambda: stream.read(block_size), b''):
+        hasher.update(block)
+    stream.seek(0)
+    return hasher.hexdigest()
+
+
+def _parsed_txt_upload(data: bytes) -> Tuple[ContactList, dict]:
+    digest = content_digest(data)
+    parsed = txt_parse_cache.get(digest)
+    if parsed is None:
+        parsed = _parse_txt_raw(data.decode('utf-8'))
+        txt_parse_cache.set(digest, parsed)
+    return parsed
+
+
+def cached_txt_contacts(digest: str, name_prefix: str = '') -> Optional[Tuple[ContactList, dict]]:
+    """ContactList + statistik dari hasil parse di cache untuk hash isi file (lihat upload_digest), None kalau belum ada"""
+    parsed = txt_parse_cache.get(digest)
+    if parsed is None:
+        return None
+    return name_txt_contacts(parsed[0], name_prefix), parsed[1]
+
+
+def parse_txt_upload(data: bytes, name_prefix: str = '') -> Tuple[ContactList, dict]:
+    """Parse isi upload TXT ke ContactList + statistik.
+
+    Hasil parse disimpan di txt_parse_cache per hash isi file, jadi validasi lalu convert
+    file yang sama (atau convert ulang dengan prefix lain) tidak menormalisasi nomor lagi.
+    """
+    raw_contacts, stats = _parsed_txt_upload(data)
+    return name_txt_contacts(raw_contacts, name_prefix), stats
+
+
+def _parse_txt_file(data: bytes) -> Tuple[ContactList, dict]:
+    """Dijalankan di worker process: parse 1 file TXT multi convert (tanpa shard, sudah paralel per file)"""
+    return _parse_txt_raw(data.decode('utf-8'), parallel=False)
+
+
+def _parse_txt_file_serial(data: bytes) -> Tuple[ContactList, dict]:
+    return _parse_txt_raw(data.decode('utf-8'))
+
+
+def parse_txt_uploads(uploads: Iterable[Tuple[Any, Optional[bytes]]],
+                      name_prefix: str = '') -> Iterator[Tuple[Any, Optional[Tuple[ContactList, dict]]]]:
+    """parse_txt_upload untuk banyak file: yield (key, (ContactList, statistik)) sesuai urutan uploads.
+
+    File yang belum ada di txt_parse_cache diparse paralel per file (lihat iter_parallel_uploads),
+    hasilnya disimpan di cache process ini. data None dilewati (hasil None).
+    """
+    def misses():
+        for key, data in uploads:
+            if data is None:
+                yield (key, None, None), None
+                continue
+            digest = content_digest(data)
+            parsed = txt_parse_cache.get(digest)
+            yield (key, digest, parsed), (data if parsed is None else None)
+    
+    for (key, digest, parsed), result in iter_parallel_uploads(_parse_txt_file, misses(), _parse_txt_file_serial):
+        if result is not None:
+            txt_parse_cache.set(digest, result)
+            parsed = result
+        yield key, (None if parsed is None else (name_txt_contacts(parsed[0], name_prefix), parsed[1]))
+
+
+def validate_txt_upload(data: bytes) -> Tuple[bool, str, dict]:
+    """Validate isi upload TXT dan return statistik (hasil parse di-cache untuk convert berikutnya)"""
+    try:
+        _, stats = _parsed_txt_upload(data)
+        valid_contacts = stats['valid_contacts']
+        total_lines = stats['total_lines']
+        
+        if not total_lines:
+            return False, "File kosong", {}
+        
+        if valid_contacts == 0:
+            return False, "Tidak ada nomor telepon valid ditemukan", stats
+        elif valid_contacts < total_lines * 0.5:
+            return True, f"Peringatan: Hanya {valid_contacts}/{total_lines} kontak valid ditemukan", stats
+        else:
+            return True, f"Format valid: {valid_contacts}/{total_lines} kontak ditemukan", stats
+            
+    except Exception as e:
+        return False, f"Error validating format: {str(e)}", {}
+
+
+def write_vcf_segments(vcf_entries: Iterable[str], contacts_per_file: int, path: str) -> List[Tuple[int, int, int]]:
+    """Tulis semua vCard sekali ke 1 file, dibagi per contacts_per_file kontak.
+
+    Return list (offset byte, ukuran byte, jumlah kontak) per bagian; isi tiap bagian sama
+    dengan '\\n'.join(chunk), jadi bagian bisa dikirim langsung sebagai potongan file.
+    """
+    segments = []
+    position = 0
+    segment_start = 0
+    count = 0
+    with open(path, 'wb') as output:
+        for vcf_entry in vcf_entries:
+            if count == contacts_per_file:
+                segments.append((segment_start, position - segment_start, count))
+                segment_start = position
+                count = 0
+            elif count:
+                output.write(b'\n')
+                position += 1
+            data = vcf_entry.encode('utf-8')
+            output.write(data)
+            position += len(data)
+            count += 1
+    if count:
+        segments.append((segment_start, position - segment_start, count))
+    return segments
+
+def split_txt_file(content: str, chunk_size: int) -> List[str]:
+    """Split TXT file content menjadi chunks"""
+    try:
+        lines = content.split('\n')
+        
+        if not lines:
+            return []
+        
+        chunks = []
+        
+        for i in range(0, len(lines), chunk_size):
+            chunk_lines = lines[i:i + chunk_size]
+            chunk_content = '\n'.join(chunk_lines)
+            chunks.append(chunk_content)
+        
+        return chunks
+        
+    except Exception:
+        logger.exception("Error splitting TXT file")
+        return []
+
+def _buffer_blocks(buf, start: int, end: int) -> Iterator[Tuple[int, bytes]]:
+    for pos in range(start, end, _SCAN_BLOCK_SIZE):
+        yield pos, bytes(buf[pos:min(pos + _SCAN_BLOCK_SIZE, end)])
+
+
+def count_buffer_lines(buf, start: int = 0, end: Optional[int] = None) -> int:
+    """Jumlah baris buf[start:end] (bytes / mmap), sama dengan len(isi.split('\\n'))"""
+    end = len(buf) if end is None else end
+    return sum(block.count(b'\n') for _, block in _buffer_blocks(buf, start, end)) + 1
+
+
+def validate_utf8(buf, end: Optional[int] = None) -> None:
+    """Raise UnicodeDecodeError kalau buf[:end] bukan UTF-8 valid (dicek per blok, tanpa decode seluruh isi)"""
+    end = len(buf) if end is None else end
+    decoder = None
+    for _, block in _buffer_blocks(buf, 0, end):
+        if decoder is None:
+            # Sebelum byte non-ASCII pertama tidak ada sequence yang terpotong antar blok
+            if block.isascii():
+                continue
+            decoder = codecs.getincrementaldecoder('utf-8')()
+        decoder.decode(block)
+    if decoder is not None:
+        decoder.decode(b'', final=True)
+
+
+def clean_txt_end(buf) -> Optional[int]:
+    """Panjang isi TXT buf tanpa 1 newline penutup kalau isinya sudah bersih, None kalau perlu normalize_txt_lines.
+
+    Bersih = sama persis dengan baris tidak kosong yang sudah di-strip digabung '\\n' (UTF-8 valid),
+    jadi potongan byte isi bisa langsung dipakai sebagai hasil split.
+    """
+    end = len(buf) - 1 if buf[-1:] == b'\n' else len(buf)
+    if (end <= 0 or _TXT_EDGE_RE.match(buf, 0, end) or _TXT_EDGE_RE.match(buf, end - 1, end)
+            or _UNCLEAN_TXT_RE.search(buf, 0, end)):
+        return None
+    try:
+        validate_utf8(buf, end)
+    except UnicodeDecodeError:
+        return None
+    return end
+
+
+def normalize_txt_lines(stream, output, block_size: int = 1024 * 1024) -> Tuple[int, int]:
+    """Tulis baris tidak kosong (di-strip, byte UTF-8 invalid dibuang) dari stream biner ke output dipisah '\\n'.
+
+    Dibaca per blok yang dipotong di newline, jadi hasilnya sama dengan decode seluruh isi sekaligus.
+    Return (jumlah baris, ukuran isi setelah decode dalam byte UTF-8).
+    """
+    lines = 0
+    total_size = 0
+    pending = b''
+    while True:
+        block = stream.read(block_size)
+        data = pending + block
+        cut = data.rfind(b'\n') + 1 if block else len(data)
+        data, pending = data[:cut], data[cut:]
+        if data:
+            try:
+                text = data.decode('utf-8')
+                total_size += len(data)
+            except UnicodeDecodeError:
+                text = data.decode('utf-8', errors='ignore')
+                total_size += len(text.encode('utf-8'))
+            stripped = [line for line in (line.strip() for line in text.split('\n')) if line]
+            if stripped:
+                if lines:
+                    output.write(b'\n')
+                output.write('\n'.join(stripped).encode('utf-8'))
+                lines += len(stripped)
+        if not block:
+            return lines, total_size
+
+
+def txt_line_segments(buf, lines_per_part: int, max_parts: Optional[int] = None,
+                      end: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """Bagi buf[:end] (bytes / mmap) per lines_per_part baris tanpa decode, return list (offset, size, jumlah baris).
+
+    Bagian ke-i sama dengan '\\n'.join(lines[i * lines_per_part:(i + 1) * lines_per_part]) dari isi.split('\\n');
+    dengan max_parts, bagian terakhir berisi semua sisa baris. Blok tanpa titik potong hanya di-count.
+    """
+    end = len(buf) if end is None else end
+    segments = []
+    start = 0
+    # Newline yang masih dilewati sampai titik potong berikutnya
+    remaining = lines_per_part
+    for block_start, block in _buffer_blocks(buf, 0, end):
+        if max_parts is not None and len(segments) >= max_parts - 1:
+            break
+        count = block.count(b'\n')
+        if count < remaining:
+            remaining -= count
+            continue
+        newline = -1
+        for _ in range(count):
+            newline = block.find(b'\n', newline + 1)
+            remaining -= 1
+            if remaining:
+                continue
+            cut = block_start + newline
+            segments.append((start, cut - start, lines_per_part))
+            start = cut + 1
+            remaining = lines_per_part
+            if max_parts is not None and len(segments) >= max_parts - 1:
+                break
+    segments.append((start, end - start, count_buffer_lines(buf, start, end)))
+    return segments
+
+
+def validate_txt_format(content: str) -> Tuple[bool, str, dict]:
+    """Validate TXT file format dan return statistics (sama dengan hasil parse untuk convert)"""
+    return validate_txt_upload(content.encode('utf-8'))
+
+def format_file_size(size_bytes: int) -> str:
+    """Format file size dalam human readable format"""
+    if size_bytes == 0:
+        return "0 B"
+    
+    size_names = ["B", "KB", "MB", "GB"]
+    i = 0
+    
+    while size_bytes >= 1024 and i < len(size_names) - 1:
+        size_bytes /= 1024.0
+        i += 1
+    
+    return f"{size_bytes:.1f} {size_names[i]}"
+
+
+class VCardRecord:
+    """Data 1 vCard hasil tokenizer: FN, nama keluarga dari N, dan semua nilai TEL (urut sesuai file)"""
+    __slots__ = ('fn', 'n', 'tels')
+
+    def __init__(self):
+        self.fn = None
+        self.n = None
+        self.tels = []
+
+    @property
+    def name(self) -> Optional[str]:
+        """FN kalau ada, kalau tidak nama keluarga dari N"""
+        return self.fn or self.n
+
+
+# Baris lanjutan (folded line): line break diikuti 1 spasi/tab
+_VCF_FOLD_RE = re.compile(r'\r?\n[ \t]')
+# END:VCARD di teks (tanpa upper(): 'ß' dll. bisa mengubah panjang string jadi offset tidak cocok)
+_VCARD_END_RE = re.compile(r'END:VCARD', re.IGNORECASE)
+# Property vCard yang dipakai tokenizer (property lain dilewati)
+_VCF_TEL, _VCF_BEGIN, _VCF_END, _VCF_FN, _VCF_N = range(5)
+_VCF_PROPERTIES = {'TEL': _VCF_TEL, 'BEGIN': _VCF_BEGIN, 'END': _VCF_END, 'FN': _VCF_FN, 'N': _VCF_N}
+
+
+def iter_vcards(content: str) -> Iterator[VCardRecord]:
+    """Tokenizer VCF satu kali jalan: yield VCardRecord untuk setiap blok BEGIN:VCARD ... END:VCARD
+
+    Mendukung LF/CRLF dan baris lanjutan (folded line). Nama property tidak case-sensitive,
+    parameter (TEL;TYPE=CELL:...) dan prefix group (item1.TEL:...) diabaikan. Baris dipisah
+    hanya di '\n' (seperti parser lama, karakter lain seperti \x0c / \u2028 tetap bagian isi baris),
+    dan blok terakhir yang tidak ditutup END:VCARD (file terpotong) tetap di-yield.
+    """
+    if '\n ' in content or '\n\t' in content:
+        content = _VCF_FOLD_RE.sub('', content)
+    
+    card = None
+    for line in content.split('\n'):
+        if line.endswith('\r'):
+            line = line[:-1]
+        colon = line.find(':')
+        if colon <= 0:
+            continue
+        prop = line[:colon]
+        kind = _VCF_PROPERTIES.get(prop)
+        if kind is None:
+            # Ada parameter / prefix group / huruf kecil: normalisasi nama property dulu
+            semicolon = prop.find(';')
+            if semicolon >= 0:
+                prop = prop[:semicolon]
+            prop = prop.strip().upper()
+            prop = prop[prop.rfind('.') + 1:]
+            kind = _VCF_PROPERTIES.get(prop)
+            if kind is None:
+                continue
+        
+        if kind == _VCF_TEL:
+            if card is not None:
+                card.tels.append(line[colon + 1:].strip())
+        elif kind == _VCF_BEGIN:
+            if line[colon + 1:].strip().upper() == 'VCARD':
+                card = VCardRecord()
+        elif card is None:
+            continue
+        elif kind == _VCF_FN:
+            card.fn = line[colon + 1:].strip()
+        elif kind == _VCF_N:
+            if card.n is None:
+                family = line[colon + 1:].split(';', 1)[0].strip()
+                if family:
+                    card.n = family
+        elif line[colon + 1:].strip().upper() == 'VCARD':
+            # END:VCARD
+            yield card
+            card = None
+    
+    if card is not None:
+        yield card
+
+
+def vcf_to_contacts(content: str) -> ContactList:
+    """Parse VCF content ke ContactList (nama dibersihkan, nomor dinormalisasi)"""
+    try:
+        contacts = ContactList()
+        
+        for card in iter_vcards(content):
+            # Extract name (FN or N field) and phone (TEL terakhir)
+            name = card.name
+            phone = card.tels[-1] if card.tels else None
+                    
+            # Clean and validate data
+            if name and phone:
+                # Clean name
+                name = _NAME_CLEAN_RE.sub('', name).strip()
+                if not name:
+                    name = "Unknown"
+                    
+                # Clean phone  
+                phone = clean_phone_number(phone)
+                
+                if phone:
+                    contacts.append(phone, name)
+        
+        return contacts
+        
+    except Exception:
+        logger.exception("Error parsing VCF to TXT")
+        return ContactList()
+
+
+def _parse_vcf_file(data: bytes) -> ContactList:
+    """Dijalankan di worker process: parse 1 file VCF multi convert"""
+    return vcf_to_contacts(data.decode('utf-8'))
+
+
+def parse_vcf_uploads(uploads: Iterable[Tuple[Any, Optional[bytes]]]) -> Iterator[Tuple[Any, Optional[ContactList]]]:
+    """vcf_to_contacts untuk banyak file: yield (key, ContactList) sesuai urutan uploads, diparse paralel per file"""
+    return iter_parallel_uploads(_parse_vcf_file, uploads)
+
+
+def parse_vcf_to_txt(content: str, output_format: str = 'comma') -> List[str]:
+    """Parse VCF content dan convert ke TXT format"""
+    return list(vcf_to_contacts(content).iter_txt(output_format))
+
+
+def admin_navy_contacts(admin_numbers: str, navy_numbers: str,
+                        admin_name_prefix: str = 'Admin', navy_name_prefix: str = 'Navy',
+                        admin_start_number: int = 1, navy_start_number: int = 1) -> ContactList:
+    """Nomor admin lalu navy sebagai ContactList dengan penamaan berurutan per grup"""
+    try:
+        contacts = None
+        
+        for numbers, name_prefix, start_number in ((admin_numbers, admin_name_prefix, admin_start_number),
+                                                   (navy_numbers, navy_name_prefix, navy_start_number)):
+            if not numbers.strip():
+                continue
+            lines = [line.strip() for line in numbers.split('\n') if line.strip()]
+            # Calculate padding needed based on total number of contacts
+            max_number = start_number + len(lines) - 1
+            padding = max(2, len(str(max_number)))  # Minimal 2 digit
+            
+            group = ContactList(f"{name_prefix} ", padding)
+            for i, phone in enumerate(clean_phone_numbers(lines)):
+                if phone and len(phone.replace('+', '')) >= 8:
+                    group.append(phone, None, start_number + i)
+            if contacts is None:
+                contacts = group
+            else:
+                contacts.extend(group)
+        
+        return contacts if contacts is not None else ContactList()
+        
+    except Exception:
+        logger.exception("Error parsing admin/navy to VCF")
+        return ContactList()
+
+
+def parse_admin_navy_to_vcf(admin_numbers: str, navy_numbers: str, admin_contact_name: str = 'Admin', navy_contact_name: str = 'Navy') -> List[str]:
+    """Parse admin and navy phone numbers and convert to VCF format with sequential naming"""
+    return list(admin_navy_contacts(admin_numbers, navy_numbers, admin_contact_name, navy_contact_name).iter_vcf())
+
+def parse_admin_navy_to_vcf_with_start(admin_numbers: str, navy_numbers: str, 
+                                     admin_name_prefix: str = 'Admin', navy_name_prefix: str = 'Navy',
+                                     admin_start_number: int = 1, navy_start_number: int = 1) -> List[str]:
+    """Parse admin and navy phone numbers with custom start numbers and convert to VCF format"""
+    return list(admin_navy_contacts(admin_numbers, navy_numbers, admin_name_prefix, navy_name_prefix,
+                                    admin_start_number, navy_start_number).iter_vcf())
+
+class ExactDedupe:
+    """Dedupe nomor E.164 (int) dengan set di memori"""
+    mode = 'exact'
+
+    def __init__(self):
+        self._seen = set()
+
+    def add(self, key: int) -> bool:
+        """Catat key, return False kalau key sudah pernah dicatat (duplikat)"""
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def close(self) -> None:
+        self._seen = set()
+
+
+class BloomDedupe:
+    """Dedupe nomor E.164 (int) dengan memori terbatas.
+
+    Bloom filter di memori menjawab "pasti baru" tanpa akses disk; kalau jawabannya "mungkin sudah ada",
+    key dicek exact ke tabel SQLite sementara (file dihapus saat close). Key baru ditulis per batch.
+    """
+    mode = 'bloom'
+
+    def __init__(self, capacity: int, error_rate: float = DEDUPE_BLOOM_ERROR_RATE, batch_size: int = 10000):
+        capacity = max(1, capacity)
+        self.bit_count = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.batch_size = batch_size
+        self.disk_checks = 0
+        self._bits = bytearray((self.bit_count + 7) // 8)
+        self._pending = set()
+        # Nama file kosong = database sementara di disk milik koneksi ini
+        self._db = sqlite3.connect('')
+        self._db.execute('CREATE TABLE seen (key INTEGER PRIMARY KEY)')
+
+    def _positions(self, key: int) -> List[int]:
+        # Double hashing: posisi ke-i = h1 + i * h2 (mod jumlah bit)
+        h1 = (key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        h2 = ((key ^ (key >> 31)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF | 1
+        bit_count = self.bit_count
+        return [(h1 + i * h2) % bit_count for i in range(self.hash_count)]
+
+    def add(self, key: int) -> bool:
+        """Catat key, return False kalau key sudah pernah dicatat (duplikat)"""
+        bits = self._bits
+        positions = self._positions(key)
+        if all(bits[position >> 3] & (1 << (position & 7)) for position in positions):
+            if key in self._pending:
+                return False
+            self.disk_checks += 1
+            if self._db.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone():
+                return False
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        self._pending.add(key)
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        return True
+
+    def _flush(self) -> None:
+        self._db.executemany('INSERT INTO seen (key) VALUES (?)', ((key,) for key in self._pending))
+        self._pending.clear()
+
+    def close(self) -> None:
+        logger.debug("Bloom dedupe: %d bit, %d hash, %d cek ke disk", self.bit_count, self.hash_count,
+                     self.disk_checks)
+        self._db.close()
+        self._bits = bytearray()
+        self._pending = set()
+
+
+def create_dedupe(expected: int):
+    """Filter dedupe untuk maksimal expected nomor: ExactDedupe, atau BloomDedupe di atas DEDUPE_EXACT_LIMIT"""
+    if expected > DEDUPE_EXACT_LIMIT:
+        return BloomDedupe(expected)
+    return ExactDedupe()
+
+
+def dedupe_phones(normalized: List[Optional[str]], dedupe) -> List[bool]:
+    """Tandai tiap nomor hasil normalisasi E.164 (None kalau tidak valid): True kalau baru,
+    False kalau sudah ada di dedupe. Nomor yang tidak valid tidak pernah dianggap duplikat.
+    """
+    keep = []
+    for phone in normalized:
+        key = _pack_phone(phone) if phone else 0
+        keep.append(not key or dedupe.add(key))
+    return keep
+
+
+def dedupe_txt_content(content: str, dedupe) -> Tuple[str, int]:
+    """Buang baris TXT yang nomornya (E.164) sudah ada di dedupe, return (isi baru, jumlah baris dibuang)
+
+    Baris tanpa nomor valid (header, catatan, baris kosong) tidak pernah dibuang.
+    """
+    kept = []
+    dropped = 0
+    for line in content.split('\n'):
+        parsed = _split_txt_line(line.strip())
+        key = _pack_phone(parsed[1]) if parsed else 0
+        if key and not dedupe.add(key):
+            dropped += 1
+            continue
+        kept.append(line)
+    return ('\n'.join(kept) if dropped else content), dropped
+
+
+def _quick_clean_vcf_phone(phone: str) -> Optional[str]:
+    """Nomor TEL untuk hasil gabung VCF (pembersihan cepat tanpa phonenumbers), None kalau kurang dari 10 digit"""
+    # Quick clean phone number (simplified for speed)
+    cleaned_phone = ''.join(filter(str.isdigit, phone))
+    if len(cleaned_phone) < 10:  # Basic validation
+        return None
+    # Add + if not present and looks like international
+    if not phone.startswith('+') and len(cleaned_phone) > 10:
+        return '+' + cleaned_phone
+    elif phone.startswith('+'):
+        return '+' + cleaned_phone
+    return phone  # Keep original format
+
+
+def merge_vcf_phones(phones: List[str], phone_mode: str = MERGE_PHONE_MODE,
+                     normalize: bool = False) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Nomor TEL untuk hasil gabung VCF sesuai phone_mode (lihat MERGE_PHONE_MODES).
+
+    Return (nomor hasil atau None kalau dibuang, nomor E.164 atau None) per TEL, urutan sesuai input.
+    Normalisasi per batch lewat clean_phone_numbers (fast path + cache); mode 'quick' hanya
+    menormalisasi kalau normalize=True (dibutuhkan untuk dedupe / sort nomor).
+    """
+    if phone_mode == 'quick':
+        normalized = clean_phone_numbers(phones) if normalize else [None] * len(phones)
+        return list(zip(map(_quick_clean_vcf_phone, phones), normalized))
+    normalized = clean_phone_numbers(phones)
+    if phone_mode == 'strict':
+        # Validasi sekali per nomor unik; nomor yang tidak valid dibuang
+        valid = {phone: is_valid_e164(phone) for phone in set(normalized) if phone}
+        return [(phone, phone) if phone and valid[phone] else (None, None) for phone in normalized]
+    return [(phone or _quick_clean_vcf_phone(raw_phone), phone) for raw_phone, phone in zip(phones, normalized)]
+
+
+def merge_vcf_contacts(vcf_contents_list: List[str], contact_name_prefix: str = 'Gabung',
+                       phone_counts: Optional[List[int]] = None,
+                       duplicates: Optional[List[int]] = None,
+                       phone_mode: str = MERGE_PHONE_MODE) -> ContactList:
+    """Merge multiple VCF file contents into one ContactList with sequential naming
+
+    Nomor TEL diproses sesuai phone_mode (lihat merge_vcf_phones).
+    Kalau phone_counts diberikan, jumlah nomor (TEL) tiap file ditambahkan ke list itu.
+    Kalau duplicates diberikan, nomor yang sama (E.164) dengan kontak sebelumnya dibuang
+    dan jumlah yang dibuang per file ditambahkan ke list itu.
+    """
+    try:
+        contact_counter = 1
+        
+        # Satu kali tokenize: simpan TEL pertama tiap vCard per file, hitung total vCard untuk padding
+        total_contacts = 0
+        file_phone_lists = []
+        for vcf_content in vcf_contents_list:
+            file_phones = 0
+            phones = []
+            for card in iter_vcards(vcf_content):
+                total_contacts += 1
+                file_phones += len(card.tels)
+                if card.tels:
+                    phones.append(card.tels[0])
+            file_phone_lists.append(phones)
+            if phone_counts is not None:
+                phone_counts.append(file_phones)
+        
+        # Calculate padding
+        padding = max(2, len(str(total_contacts)))  # Minimal 2 digit
+        merged_contacts = ContactList(f"{contact_name_prefix} ", padding)
+        dedupe = create_dedupe(sum(map(len, file_phone_lists))) if duplicates is not None else None
+        
+        try:
+            for phones in file_phone_lists:
+                merged_phones = [(cleaned_phone, phone)
+                                 for cleaned_phone, phone in merge_vcf_phones(phones, phone_mode, dedupe is not None)
+                                 if cleaned_phone]
+                
+                if dedupe is not None:
+                    keep = dedupe_phones([phone for _, phone in merged_phones], dedupe)
+                    duplicates.append(keep.count(False))
+                    merged_phones = list(compress(merged_phones, keep))
+                
+                for cleaned_phone, _ in merged_phones:
+                    merged_contacts.append(cleaned_phone, None, contact_counter)
+                    contact_counter += 1
+        finally:
+            if dedupe is not None:
+                dedupe.close()
+        
+        return merged_contacts
+        
+    except Exception:
+        logger.exception("Error merging VCF files")
+        return ContactList()
+
+
+def merge_vcf_files(vcf_contents_list: List[str], contact_name_prefix: str = 'Gabung',
+                    phone_counts: Optional[List[int]] = None,
+                    duplicates: Optional[List[int]] = None,
+                    phone_mode: str = MERGE_PHONE_MODE) -> List[str]:
+    """Merge multiple VCF file contents into one with sequential naming - Optimized
+
+    Kalau phone_counts diberikan, jumlah nomor (TEL) tiap file ditambahkan ke list itu.
+    Kalau duplicates diberikan, nomor duplikat dibuang (lihat merge_vcf_contacts).
+    """
+    return list(merge_vcf_contacts(vcf_contents_list, contact_name_prefix, phone_counts, duplicates,
+                                   phone_mode).iter_vcf())
+
+# Urutan hasil gabung external sort: 'number' (E.164), 'name' (case-insensitive), selain itu urutan upload
+MERGE_SORT_KEYS = ('number', 'name')
+# Karakter yang tidak boleh ada di kunci sort (pemisah field / baris di file run)
+_SORT_KEY_CLEAN_RE = re.compile(r'[\x00-\x1f]')
+
+
+def _merge_sort_name(name: Optional[str]) -> str:
+    """Kunci sort nama: case-insensitive, tanpa karakter kontrol"""
+    return _SORT_KEY_CLEAN_RE.sub(' ', name).strip().casefold() if name else ''
+
+
+def _merge_record_key(sort_by: str, number: str, name: str) -> str:
+    # Item tanpa nomor / nama diletakkan setelah yang punya, urutan aslinya tetap
+    if sort_by == 'number':
+        return '0' + number if number else '1'
+    if sort_by == 'name':
+        return '0' + name if name else '1'
+    return ''
+
+
+def _iter_merge_records(sorter: ExternalSorter) -> Iterator[List[str]]:
+    for line in sorter.iter_sorted():
+        # key, seq, file, nomor, nama, payload (payload boleh berisi tab)
+        yield line[:-1].split('\t', 5)
+
+
+def external_merge(items: Iterable[Tuple[int, str, str, str]], sort_by: str = '',
+                   duplicates: Optional[List[int]] = None, directory: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+    """Urutkan item gabung (index file, nomor E.164 digit, kunci nama, payload) lewat external sort.
+
+    Yield (index file, payload) sesuai urutan sort_by (lihat MERGE_SORT_KEYS, urutan item untuk yang lain).
+    Kalau duplicates diberikan (1 angka per file), item dengan nomor yang sama dengan item sebelumnya
+    (urutan item) dibuang dan dihitung per file. Dedupe juga lewat sort (nomor sama jadi berurutan),
+    jadi memori tidak tergantung jumlah item. Payload tidak boleh berisi baris baru.
+    """
+    dedupe_pass = duplicates is not None and sort_by != 'number'
+    with ExternalSorter(directory) as output_sorter, ExternalSorter(directory) as dedupe_sorter:
+        sorter = dedupe_sorter if dedupe_pass else output_sorter
+        first_key = 'number' if dedupe_pass else sort_by
+        for seq, (file_index, number, name, payload) in enumerate(items):
+            sorter.add(f"{_merge_record_key(first_key, number, name)}\t{seq:012d}\t{file_index}\t"
+                       f"{number}\t{name}\t{payload}\n")
+
+        if dedupe_pass:
+            # Pass pertama urut nomor: buang duplikat, lalu urutkan ulang sesuai sort_by
+            previous = None
+            for _, seq, file_index, number, name, payload in _iter_merge_records(dedupe_sorter):
+                if number and number == previous:
+                    duplicates[int(file_index)] += 1
+                    continue
+                previous = number
+                output_sorter.add(f"{_merge_record_key(sort_by, number, name)}\t{seq}\t{file_index}\t"
+                                  f"{number}\t{name}\t{payload}\n")
+            dedupe_sorter.close()
+
+        previous = None
+        for _, _, file_index, number, _, payload in _iter_merge_records(output_sorter):
+            if duplicates is not None and not dedupe_pass:
+                if number and number == previous:
+                    duplicates[int(file_index)] += 1
+                    continue
+                previous = number
+            yield int(file_index), payload
+
+
+def txt_stream_encoding(stream: BinaryIO) -> str:
+    """Encoding isi stream TXT seperti decode isi file utuh: 'utf-8' kalau seluruh isi UTF-8 valid, selain itu 'latin-1'.
+
+    Stream (harus bisa di-seek) dibaca per blok lalu dikembalikan ke posisi awal.
+    """
+    start = stream.tell()
+    decoder = None
+    try:
+        while True:
+            block = stream.read(_SCAN_BLOCK_SIZE)
+            if not block:
+                break
+            if decoder is None:
+                # Sebelum byte non-ASCII pertama tidak ada sequence yang terpotong antar blok
+                if block.isascii():
+                    continue
+                decoder = codecs.getincrementaldecoder('utf-8')()
+            decoder.decode(block)
+        if decoder is not None:
+            decoder.decode(b'', final=True)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+    finally:
+        stream.seek(start)
+
+
+def iter_txt_stream_lines(stream: BinaryIO) -> Iterator[str]:
+    """Baris file TXT dari stream biner, sama dengan decode isi file lalu strip() dan split('\n').
+
+    Encoding ditentukan untuk seluruh file (utf-8, fallback latin-1 kalau ada byte yang tidak valid,
+    lihat txt_stream_encoding), lalu dibaca per baris tanpa menampung isi file.
+    """
+    encoding = txt_stream_encoding(stream)
+    previous = None
+    blanks = []
+    for raw_line in stream:
+        line = (raw_line[:-1] if raw_line.endswith(b'\n') else raw_line).decode(encoding)
+        if not line.strip():
+            # Baris kosong di awal / akhir file dibuang seperti strip()
+            if previous is not None:
+                blanks.append(line)
+            continue
+        if previous is None:
+            line = line.lstrip()
+        else:
+            yield previous
+            yield from blanks
+            blanks = []
+        previous = line
+    if previous is not None:
+        yield previous.rstrip()
+
+
+def _write_joined(output: BinaryIO, pieces: Iterable[str], separator: str) -> int:
+    """Tulis separator.join(pieces) ke output biner, return jumlah potongan"""
+    count = 0
+    separator = separator.encode('utf-8')
+    for piece in pieces:
+        if count:
+            output.write(separator)
+        output.write(piece.encode('utf-8'))
+        count += 1
+    return count
+
+
+def external_merge_txt(named_streams: List[Tuple[str, BinaryIO]], output: BinaryIO, total_files: int,
+                       sort_by: str = '', add_filename_headers: bool = False, separator_lines: Iterable[str] = (),
+                       duplicates: Optional[List[int]] = None, directory: Optional[str] = None) -> Tuple[int, int]:
+    """Gabung file TXT (stream biner, diproses satu per satu) lewat external sort, tulis hasil ke output.
+
+    Tanpa sort_by hasilnya sama dengan gabung di memori (header nama file dan separator antar file
+    disertakan); dengan sort_by baris kontak diurutkan, baris kosong / header / separator tidak dipakai.
+    Kalau duplicates diberikan, baris dengan nomor (E.164) yang sudah ada di baris / file sebelumnya
+    dibuang dan jumlahnya per file ditambahkan ke list itu. Return (jumlah file diproses, jumlah baris).
+    """
+    sorted_output = sort_by in MERGE_SORT_KEYS
+    dropped = [0] * len(named_streams) if duplicates is not None else None
+    processed_files = 0
+
+    def items():
+        nonlocal processed_files
+        for file_index, (filename, stream) in enumerate(named_streams):
+            lines = iter_txt_stream_lines(stream)
+            first_line = next(lines, None)
+            if first_line is None:
+                continue
+            processed_files += 1
+            if add_filename_headers and not sorted_output:
+                yield file_index, '', '', f"=== {filename} ==="
+            for line in chain((first_line,), lines):
+                stripped = line.strip()
+                if sorted_output and not stripped:
+                    continue
+                parsed = _split_txt_line(stripped) if dropped is not None or sorted_output else None
+                number = name = ''
+                if parsed:
+                    packed = _pack_phone(parsed[1])
+                    number = str(packed) if packed else ''
+                    if sort_by == 'name':
+                        name = _merge_sort_name(parsed[0])
+                yield file_index, number, name, line
+            if not sorted_output and processed_files < total_files:
+                for separator_line in separator_lines:
+                    yield file_index, '', '', separator_line
+
+    lines = _write_joined(output, (line for _, line in external_merge(items(), sort_by, dropped, directory)), '\n')
+    if duplicates is not None:
+        duplicates.extend(dropped)
+    return processed_files, lines
+
+
+def iter_vcf_stream(stream: BinaryIO, block_size: int = 1024 * 1024) -> Iterator[VCardRecord]:
+    """vCard dari stream biner per blok (dipotong setelah END:VCARD terakhir di blok), tanpa membaca seluruh file"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    overlap = len('END:VCARD') - 1
+    pending = ''
+    # Posisi di pending yang sudah dicari, supaya blok tanpa END:VCARD tidak membuat pencarian ulang dari awal
+    scan = 0
+    newline_scan = 0
+    last_end = -1
+    while True:
+        block = stream.read(block_size)
+        pending += decoder.decode(block, final=not block)
+        if not block:
+            yield from iter_vcards(pending)
+            return
+        for match in _VCARD_END_RE.finditer(pending, scan):
+            last_end = match.end()
+        # END:VCARD yang terpotong di ujung blok dicari lagi setelah blok berikutnya masuk
+        scan = max(scan, len(pending) - overlap)
+        cut = pending.find('\n', max(last_end, newline_scan)) if last_end >= 0 else -1
+        if cut < 0:
+            newline_scan = len(pending)
+            continue
+        yield from iter_vcards(pending[:cut + 1])
+        pending = pending[cut + 1:]
+        scan = max(0, len(pending) - overlap)
+        newline_scan = 0
+        last_end = -1
+
+
+def external_merge_vcf(streams: List[BinaryIO], output: BinaryIO, contact_name_prefix: str = 'Gabung',
+                       sort_by: str = '', phone_counts: Optional[List[int]] = None,
+                       duplicates: Optional[List[int]] = None, directory: Optional[str] = None,
+                       phone_mode: str = MERGE_PHONE_MODE, batch_size: int = 10000) -> int:
+    """Gabung file VCF (stream biner, diproses satu per satu) lewat external sort, tulis hasil ke output.
+
+    Tanpa sort_by hasilnya sama dengan merge_vcf_contacts; dengan sort_by kontak diurutkan per nomor
+    (E.164) atau nama asli (FN / N) sebelum diberi nama urut. phone_counts / duplicates / phone_mode
+    seperti merge_vcf_contacts. Return jumlah kontak yang ditulis.
+    """
+    dropped = [0] * len(streams) if duplicates is not None else None
+    total_contacts = 0
+
+    def items():
+        nonlocal total_contacts
+        for file_index, stream in enumerate(streams):
+            file_phones = 0
+            cards = iter_vcf_stream(stream)
+            while True:
+                batch_cards = list(islice(cards, batch_size))
+                if not batch_cards:
+                    break
+                cards_with_phone = []
+                for card in batch_cards:
+                    total_contacts += 1
+                    file_phones += len(card.tels)
+                    if card.tels:
+                        cards_with_phone.append(card)
+                merged_phones = merge_vcf_phones([card.tels[0] for card in cards_with_phone], phone_mode,
+                                                 dropped is not None or sort_by == 'number')
+                for card, (cleaned_phone, phone) in zip(cards_with_phone, merged_phones):
+                    if cleaned_phone:
+                        packed = _pack_phone(phone) if phone else 0
+                        yield (file_index, str(packed) if packed else '',
+                               _merge_sort_name(card.name) if sort_by == 'name' else '', cleaned_phone)
+            if phone_counts is not None:
+                phone_counts.append(file_phones)
+
+    def vcards():
+        padding = None
+        for counter, (_, phone) in enumerate(external_merge(items(), sort_by, dropped, directory), 1):
+            if padding is None:
+                # Semua file sudah dibaca sebelum item pertama keluar dari sort
+                padding = max(2, len(str(total_contacts)))  # Minimal 2 digit
+            yield render_vcard(f"{contact_name_prefix} {str(counter).zfill(padding)}", phone)
+
+    count = _write_joined(output, vcards(), '\n\n')
+    if duplicates is not None:
+        duplicates.extend(dropped)
+    return count
+
+
+def analyze_vcf_file(content: str) -> dict:
+    """Analyze VCF file and return statistics - Optimized"""
+    try:
+        vcard_count = 0
+        tel_count = 0
+        
+        # Quick preview without full parsing (first 5 only)
+        preview_contacts = []
+        for card in iter_vcards(content):
+            vcard_count += 1
+            for phone in card.tels:
+                if tel_count < 5:
+                    phone_clean = ''.join(filter(str.isdigit, phone))
+                    if len(phone_clean) >= 10:
+                        preview_contacts.append(phone)
+                tel_count += 1
+        
+        return {
+            'total_contacts': tel_count,
+            'total_vcards': vcard_count,
+            'preview': preview_contacts,
+            'has_valid_contacts': tel_count > 0
+        }
+        
+    except Exception:
+        logger.exception("Error analyzing VCF file")
+        return {
+            'total_contacts': 0,
+            'total_vcards': 0,
+            'preview': [],
+            'has_valid_contacts': False
+        }
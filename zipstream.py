@@ -0,0 +1,117 @@
+"""
+ZIP yang di-stream: entry ditulis dan dikirim saat isinya dihasilkan, tanpa menampung seluruh arsip
+"""
+import io
+import itertools
+import os
+import zipfile
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+# Level kompresi default: 0 = store saja (tanpa kompresi), 1-9 = deflate
+ZIP_COMPRESS_LEVEL = int(os.environ.get('ZIP_COMPRESS_LEVEL', 6))
+# Data yang dikumpulkan sebelum dikirim ke client
+ZIP_FLUSH_SIZE = 64 * 1024
+
+
+class _ZipSink(io.RawIOBase):
+    """Output tidak bisa di-seek untuk ZipFile: byte yang ditulis ditampung sampai diambil dengan drain()"""
+
+    def __init__(self):
+        self._chunks = []
+        self.pending = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        self.pending = 0
+        return data
+
+
+def parse_compress_level(value: Optional[str], default: int = ZIP_COMPRESS_LEVEL) -> int:
+    """Level kompresi dari input user: 'store' atau angka 0-9, selain itu default"""
+    if value is None:
+        return default
+    value = value.strip().lower()
+    if value == 'store':
+        return 0
+    if value.isdigit() and 0 <= int(value) <= 9:
+        return int(value)
+    return default
+
+
+def _unique_name(name: str, used: set) -> str:
+    """Nama entry yang belum dipakai di arsip ("nama (2).ext" kalau sudah ada)"""
+    candidate = name
+    base, dot, ext = name.rpartition('.')
+    if not dot:
+        base, ext = name, ''
+    number = 2
+    while candidate in used:
+        candidate = f"{base} ({number}){dot}{ext}"
+        number += 1
+    used.add(candidate)
+    return candidate
+
+
+def iter_zip(entries: Iterable[Tuple[str, Iterable[Union[str, bytes]]]],
+             compress_level: int = ZIP_COMPRESS_LEVEL) -> Iterator[bytes]:
+    """Generator byte ZIP untuk entries (nama file, iterable potongan isi str/bytes).
+
+    Entry diproses satu per satu dan isinya di-stream, jadi entries boleh berupa generator
+    yang baru membuat isi file saat dibutuhkan. compress_level 0 = store saja.
+    """
+    sink = _ZipSink()
+    if compress_level > 0:
+        archive = zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED, compresslevel=compress_level)
+    else:
+        archive = zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED)
+    used_names = set()
+    with archive:
+        for name, chunks in entries:
+            with archive.open(_unique_name(name, used_names), 'w') as entry:
+                for chunk in chunks:
+                    entry.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+                    if sink.pending >= ZIP_FLUSH_SIZE:
+                        yield sink.drain()
+            if sink.pending:
+                yield sink.drain()
+    # Central directory
+    yield sink.drain()
+
+
+def iter_groups(items: Iterable, size: int) -> Iterator[Iterator]:
+    """Bagi items ke kelompok berisi maksimal size item, tanpa menampung isinya.
+
+    Setiap kelompok harus dibaca habis sebelum kelompok berikutnya diambil.
+    """
+    items = iter(items)
+    for first in items:
+        yield itertools.chain((first,), itertools.islice(items, size - 1))
+
+
+def iter_joined(items: Iterable[str], separator: str = '\n') -> Iterator[str]:
+    """Sama dengan separator.join(items) tapi di-yield sepotong-sepotong"""
+    items = iter(items)
+    for first in items:
+        yield first
+        for item in items:
+            yield separator
+            yield item
+
+
+def iter_file(file, block_size: int = ZIP_FLUSH_SIZE) -> Iterator[bytes]:
+    """Baca file object biner per blok lalu tutup filenya"""
+    with file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            yield block